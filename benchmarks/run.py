@@ -0,0 +1,245 @@
+"""
+Benchmark every MCP tool against a synthetic NebulaBlock API.
+
+Launches ``python -m src.main`` over stdio or a network transport, calls each
+tool ``--iterations`` times with ``--concurrency`` calls in flight, and
+reports p50/p95/p99 latency, throughput, and the server's CPU and RSS. The
+report can be saved as a baseline and later runs compared against it:
+
+    python -m benchmarks.run --transport stdio --save-baseline
+    python -m benchmarks.run --transport stdio --compare
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import click
+from fastmcp.client import Client
+from fastmcp.client.transports import SSETransport, StdioTransport, StreamableHttpTransport
+
+from benchmarks.stats import (
+    child_pids,
+    load_baseline,
+    process_sample,
+    regressions,
+    save_baseline,
+    summarize,
+)
+from benchmarks.upstream import Profile, SyntheticNebulaBlock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES = os.path.join(ROOT, "benchmarks", "baselines")
+
+# Arguments for each tool; tools not listed are called without arguments.
+TOOL_ARGUMENTS: Dict[str, dict] = {
+    "get_user_instances": {"limit": 100, "offset": 0},
+    "get_user_instance_detail": {"id": "instances-0"},
+    "wait_for_instance_status": {"id": "instances-0", "statuses": ["Running"], "timeout": 10},
+    "list_user_invoices": {"limit": 100, "offset": 0},
+    "get_payment_history": {"limit": 100, "offset": 0},
+    "delete_gpu_instance": {"id": "instances-0"},
+    "start_gpu_instance": {"id": "instances-0"},
+    "stop_gpu_instance": {"id": "instances-0"},
+    "reboot_gpu_instance": {"id": "instances-0"},
+    "bulk_delete_gpu_instances": {"ids": ["instances-0", "instances-1", "instances-2", "instances-3"]},
+    "bulk_start_gpu_instances": {"ids": ["instances-0", "instances-1", "instances-2", "instances-3"]},
+    "bulk_stop_gpu_instances": {"ids": ["instances-0", "instances-1", "instances-2", "instances-3"]},
+    "bulk_reboot_gpu_instances": {"ids": ["instances-0", "instances-1", "instances-2", "instances-3"]},
+    "multi_call": {
+        "calls": [
+            {"tool": "get_user_instance_detail", "arguments": {"id": f"instances-{index % 2}"}}
+            for index in range(4)
+        ]
+    },
+    "create_gpu_instance": {
+        "instance_name": "bench",
+        "product_id": "product-0",
+        "image_id": "images-0",
+        "ssh_key_id": "ssh-keys-0",
+    },
+    "delete_ssh_key": {"id": "ssh-keys-0"},
+    "create_ssh_key": {"key_name": "bench", "key_data": "ssh-ed25519 AAAA bench"},
+    "search_docs": {"query": "reboot instance"},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_listening(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+async def _measure(client: Client, tool: str, iterations: int, concurrency: int, pid: Optional[int]) -> dict:
+    arguments = TOOL_ARGUMENTS.get(tool, {})
+    try:
+        await client.call_tool(tool, arguments)  # warm caches and connections
+    except Exception:
+        pass
+    latencies: List[float] = []
+    errors = 0
+    remaining = iterations
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await client.call_tool(tool, arguments)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    cpu_before, _ = process_sample(pid)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    cpu_after, rss = process_sample(pid)
+
+    result = summarize(latencies, errors, elapsed)
+    result["cpu_percent"] = (
+        round((cpu_after - cpu_before) / elapsed * 100, 1) if cpu_before is not None and cpu_after is not None else None
+    )
+    result["rss_mb"] = round(rss / 2**20, 1) if rss is not None else None
+    return result
+
+
+async def _run_tools(client: Client, tools: List[str], iterations: int, concurrency: int, pid_of) -> Dict[str, dict]:
+    results = {}
+    async with client:
+        available = [tool.name for tool in await client.list_tools()]
+        pid = pid_of()
+        for tool in tools or available:
+            if tool not in available:
+                raise click.BadParameter(f"unknown tool {tool!r}", param_hint="--tool")
+            results[tool] = await _measure(client, tool, iterations, concurrency, pid)
+    return results
+
+
+def _server_env(upstream_url: str) -> dict:
+    return dict(
+        os.environ,
+        NEBULA_BLOCK_API_URL=upstream_url,
+        NEBULA_BLOCK_API_KEY="bench",
+        NEBULA_BLOCK_RATE_LIMIT="0",
+        NEBULA_BLOCK_WATCH_MIN_INTERVAL="0.01",
+    )
+
+
+def run(transport: str, workers: int, tools: List[str], iterations: int, concurrency: int, profile: Profile) -> dict:
+    """
+    Benchmark ``tools`` (all tools if empty) and return the report.
+    """
+    with SyntheticNebulaBlock(profile) as upstream:
+        env = _server_env(upstream.url)
+        command = [sys.executable, "-m", "src.main", "--transport", transport]
+        if transport == "stdio":
+            client = Client(StdioTransport(command[0], command[1:], env=env, cwd=ROOT))
+            parent = os.getpid()
+            results = asyncio.run(
+                _run_tools(client, tools, iterations, concurrency, lambda: next(iter(child_pids(parent)), None))
+            )
+        else:
+            port = _free_port()
+            server = subprocess.Popen(
+                command + ["--port", str(port), "--workers", str(workers)],
+                env=env,
+                cwd=ROOT,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                asyncio.run(_wait_until_listening(port))
+                if transport == "streamable-http":
+                    client = Client(StreamableHttpTransport(f"http://127.0.0.1:{port}/mcp/"))
+                else:
+                    client = Client(SSETransport(f"http://127.0.0.1:{port}/sse/"))
+                results = asyncio.run(_run_tools(client, tools, iterations, concurrency, lambda: server.pid))
+            finally:
+                server.terminate()
+                server.wait()
+    return {
+        "config": {
+            "transport": transport,
+            "workers": workers,
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "latency": profile.latency,
+            "records": profile.records,
+            "record_bytes": profile.record_bytes,
+            "error_rate": profile.error_rate,
+        },
+        "tools": results,
+    }
+
+
+def _print_report(report: dict) -> None:
+    click.echo(f"{'tool':<28} {'calls':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>8} {'cpu %':>6} {'rss MB':>7}")
+    for tool, row in report["tools"].items():
+        cpu = "-" if row["cpu_percent"] is None else f"{row['cpu_percent']:.1f}"
+        rss = "-" if row["rss_mb"] is None else f"{row['rss_mb']:.1f}"
+        click.echo(
+            f"{tool:<28} {row['calls']:>6} {row['errors']:>4} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f}"
+            f" {row['p99_ms']:>8.2f} {row['rps']:>8.1f} {cpu:>6} {rss:>7}"
+        )
+
+
+@click.command()
+@click.option("--transport", type=click.Choice(("stdio", "sse", "streamable-http")), default="stdio")
+@click.option("--workers", type=int, default=1, help="uvicorn workers for network transports")
+@click.option("--tool", "tools", multiple=True, help="Benchmark only this tool (repeatable)")
+@click.option("--iterations", type=int, default=100, help="Calls per tool")
+@click.option("--concurrency", type=int, default=4, help="Calls in flight per tool")
+@click.option("--latency", type=float, default=0.005, help="Seconds the fake API waits per request")
+@click.option("--records", type=int, default=200, help="Records per list endpoint (sets pagination depth)")
+@click.option("--record-bytes", type=int, default=256, help="Approximate size of each record")
+@click.option("--error-rate", type=float, default=0.0, help="Fraction of upstream requests answered with 503")
+@click.option("--baseline", type=click.Path(dir_okay=False), help="Baseline file (default: benchmarks/baselines/<transport>.json)")
+@click.option("--save-baseline", "save", is_flag=True, help="Store this run as the baseline")
+@click.option("--compare", is_flag=True, help="Fail if this run regresses against the baseline")
+@click.option("--tolerance", type=float, default=0.5, help="Allowed relative regression")
+@click.option("--slack-ms", type=float, default=2.0, help="Allowed absolute p95 regression on top of --tolerance")
+def main(
+    transport, workers, tools, iterations, concurrency, latency, records, record_bytes, error_rate,
+    baseline, save, compare, tolerance, slack_ms,
+):
+    profile = Profile(latency=latency, records=records, record_bytes=record_bytes, error_rate=error_rate)
+    report = run(transport, workers, list(tools), iterations, concurrency, profile)
+    _print_report(report)
+
+    path = baseline or os.path.join(BASELINES, f"{transport}.json")
+    if compare:
+        stored = load_baseline(path)
+        if stored is None:
+            raise click.ClickException(f"no baseline at {path}; run with --save-baseline first")
+        found = regressions(report, stored, tolerance, slack_ms)
+        for line in found:
+            click.echo(f"REGRESSION {line}", err=True)
+        if found:
+            sys.exit(1)
+        click.echo(f"No regressions against {os.path.relpath(path, ROOT)}")
+    if save:
+        save_baseline(path, report)
+        click.echo(f"Saved baseline to {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Measure cold-start time of the stdio server.
+
+Spawns ``python -m src.main`` the way an editor does, speaks raw JSON-RPC
+over its pipes, and records the time from spawn to the ``initialize``
+response and to the first ``tools/list`` response:
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --compare
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import click
+
+from benchmarks.stats import load_baseline, percentile, save_baseline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "startup.json")
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def _send(process: subprocess.Popen, message: dict) -> None:
+    process.stdin.write(json.dumps(message).encode() + b"\n")
+    process.stdin.flush()
+
+
+def _read_response(process: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_once() -> Dict[str, float]:
+    """
+    Start one server and return seconds to ``initialize`` and to ``tools/list``.
+    """
+    env = dict(os.environ, NEBULA_BLOCK_API_KEY="startup")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.main"],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _send(process, INITIALIZE)
+        _read_response(process, 1)
+        initialized = time.perf_counter() - started
+        _send(process, INITIALIZED)
+        _send(process, LIST_TOOLS)
+        tools = _read_response(process, 2)["result"]["tools"]
+        listed = time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+    return {"initialize": initialized, "list_tools": listed, "tools": len(tools)}
+
+
+def summarize_runs(runs: List[Dict[str, float]]) -> dict:
+    report = {"runs": len(runs), "tools": runs[-1]["tools"]}
+    for phase in ("initialize", "list_tools"):
+        samples = [run[phase] for run in runs]
+        report[f"{phase}_p50_ms"] = round(statistics.median(samples) * 1000, 1)
+        report[f"{phase}_p95_ms"] = round(percentile(samples, 0.95) * 1000, 1)
+    return report
+
+
+@click.command()
+@click.option("--runs", type=int, default=10, help="Cold starts to measure")
+@click.option("--save-baseline", "save", is_flag=True, help="Store this run as the baseline")
+@click.option("--compare", is_flag=True, help="Fail if time-to-first-response regresses against the baseline")
+@click.option("--tolerance", type=float, default=0.25, help="Allowed relative regression of the p50")
+def main(runs, save, compare, tolerance):
+    measure_once()  # warm the OS page cache and bytecode cache
+    report = summarize_runs([measure_once() for _ in range(runs)])
+    click.echo(
+        f"{report['tools']} tools; initialize p50 {report['initialize_p50_ms']}ms p95 {report['initialize_p95_ms']}ms; "
+        f"tools/list p50 {report['list_tools_p50_ms']}ms p95 {report['list_tools_p95_ms']}ms"
+    )
+    if compare:
+        stored = load_baseline(BASELINE)
+        if stored is None:
+            raise click.ClickException(f"no baseline at {BASELINE}; run with --save-baseline first")
+        limit = stored["list_tools_p50_ms"] * (1 + tolerance)
+        if report["list_tools_p50_ms"] > limit:
+            click.echo(
+                f"REGRESSION tools/list p50 {report['list_tools_p50_ms']}ms > {limit:.1f}ms "
+                f"(baseline {stored['list_tools_p50_ms']}ms)",
+                err=True,
+            )
+            sys.exit(1)
+        click.echo("No regressions against benchmarks/baselines/startup.json")
+    if save:
+        save_baseline(BASELINE, report)
+        click.echo("Saved baseline to benchmarks/baselines/startup.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Latency summaries, server process sampling and baseline comparison.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - depends on the environment
+    psutil = None
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Return the ``fraction`` percentile of ``samples`` by linear interpolation.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    calls = len(latencies) + errors
+    return {
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "rps": round(calls / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def child_pids(parent: int) -> List[int]:
+    """
+    Return the PIDs of the direct children of ``parent``.
+    """
+    if psutil is not None:
+        return [child.pid for child in psutil.Process(parent).children()]
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else ():
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent:
+            children.append(int(entry))
+    return children
+
+
+def process_sample(pid: Optional[int]) -> Tuple[Optional[float], Optional[int]]:
+    """
+    Return ``(cpu_seconds, rss_bytes)`` for ``pid``, or Nones if it can't be read.
+    """
+    if pid is None:
+        return None, None
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            times = process.cpu_times()
+            return times.user + times.system, process.memory_info().rss
+        except psutil.Error:
+            return None, None
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None, None
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS, pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_baseline(path: str, report: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def regressions(report: dict, baseline: dict, tolerance: float, slack_ms: float) -> List[str]:
+    """
+    List the tools whose p95 latency or throughput got worse than ``baseline``.
+
+    A tool regresses when its p95 exceeds the baseline by more than
+    ``tolerance`` (a fraction) plus ``slack_ms``, or its throughput falls by
+    more than ``tolerance``, or it errors where the baseline did not. Tools
+    the baseline has never measured are reported too, so new tools can't go
+    unchecked until the baseline is refreshed.
+    """
+    found = [
+        f"{tool}: no baseline; run with --save-baseline"
+        for tool in report["tools"]
+        if tool not in baseline.get("tools", {})
+    ]
+    for tool, before in baseline.get("tools", {}).items():
+        after = report["tools"].get(tool)
+        if after is None:
+            continue
+        limit = before["p95_ms"] * (1 + tolerance) + slack_ms
+        if after["p95_ms"] > limit:
+            found.append(f"{tool}: p95 {after['p95_ms']:.1f}ms > {limit:.1f}ms (baseline {before['p95_ms']:.1f}ms)")
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            found.append(f"{tool}: {after['rps']:.1f} calls/s < baseline {before['rps']:.1f} calls/s")
+        if after["errors"] > before["errors"]:
+            found.append(f"{tool}: {after['errors']} errors (baseline {before['errors']})")
+    return found
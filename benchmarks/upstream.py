@@ -0,0 +1,153 @@
+"""
+A synthetic NebulaBlock API for benchmarks.
+
+Unlike the scripted ``tests.fake_server``, every endpoint the tools use is
+answered from generated data, shaped by a ``Profile``: per-request latency,
+record size, how many records (and therefore pages) list endpoints hold,
+and the fraction of requests that fail with a 503.
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+LIST_ENDPOINTS = (
+    "computing/instances",
+    "computing/deleted-instances",
+    "computing/products",
+    "computing/images",
+    "users/invoices",
+    "users/credits/history",
+    "keys",
+    "ssh-keys",
+)
+
+
+@dataclass
+class Profile:
+    latency: float = 0.005
+    records: int = 200
+    record_bytes: int = 256
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+def _record(endpoint: str, index: int, padding: str) -> Dict[str, Any]:
+    record = {"id": f"{endpoint.rsplit('/', 1)[-1]}-{index}", "name": f"bench-{index}", "region": ("us", "eu", "ap")[index % 3]}
+    if endpoint.startswith("computing/instances") or endpoint == "computing/deleted-instances":
+        record.update(status=("Running", "Stopped")[index % 2], product_id=f"product-{index % 5}")
+    elif endpoint.startswith("users/"):
+        record.update(amount=round(index * 1.25, 2), status=("paid", "due")[index % 2])
+    record["description"] = padding
+    return record
+
+
+class SyntheticNebulaBlock:
+    def __init__(self, profile: Optional[Profile] = None) -> None:
+        self.profile = profile or Profile()
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        padding = "x" * max(self.profile.record_bytes - 120, 0)
+        self._data = {
+            endpoint: [_record(endpoint, index, padding) for index in range(self.profile.records)]
+            for endpoint in LIST_ENDPOINTS
+        }
+        self._encoded: Dict[Tuple[str, int, Optional[int]], bytes] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _page(self, endpoint: str, query: Dict[str, List[str]]) -> bytes:
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query["limit"][0]) if "limit" in query else None
+        key = (endpoint, offset, limit)
+        body = self._encoded.get(key)
+        if body is None:
+            records = self._data[endpoint]
+            page = records[offset:] if limit is None else records[offset:offset + limit]
+            body = json.dumps({"data": page, "total": len(records)}).encode()
+            self._encoded[key] = body
+        return body
+
+    def respond(self, method: str, target: str) -> Tuple[int, bytes]:
+        """
+        Return the status and body for one request.
+        """
+        parts = urlsplit(target)
+        endpoint = parts.path.removeprefix("/api/v1/").strip("/")
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.profile.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            return 503, b'{"message": "Service Unavailable"}'
+        if method != "GET":
+            return 200, b'{"message": "ok"}'
+        if endpoint in self._data:
+            return 200, self._page(endpoint, parse_qs(parts.query))
+        if endpoint == "users/credits":
+            return 200, b'{"credit": 100}'
+        if endpoint.startswith("computing/instance/"):
+            instance_id, _, action = endpoint.removeprefix("computing/instance/").partition("/")
+            if action:
+                return 200, json.dumps({"message": f"{action} {instance_id}"}).encode()
+            return 200, json.dumps({"data": {"id": instance_id, "status": "Running"}}).encode()
+        return 404, b'{"message": "Not Found"}'
+
+    def _handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY the
+            # body waits on the client's delayed ACK and adds ~40ms per request.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def handle(self):
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, body = upstream.respond(self.command, self.path)
+                if upstream.profile.latency:
+                    time.sleep(upstream.profile.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+        return Handler
+
+    def __enter__(self) -> "SyntheticNebulaBlock":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
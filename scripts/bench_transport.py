@@ -0,0 +1,94 @@
+"""
+Measure tool-call throughput of the network transports.
+
+Starts a local fake NebulaBlock API, launches ``python -m src.main`` with the
+requested transport and worker count, then drives it with concurrent MCP
+clients that each call ``get_user_credit_balance`` in a loop.
+
+    python scripts/bench_transport.py --transport streamable-http --workers 4
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import click
+from fastmcp.client import Client
+from fastmcp.client.transports import SSETransport, StreamableHttpTransport
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fake_server import FakeNebulaBlockServer  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_listening(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+async def _drive(url: str, transport: str, clients: int, duration: float) -> int:
+    deadline = time.monotonic() + duration
+    completed = 0
+
+    async def worker() -> None:
+        nonlocal completed
+        client_transport = StreamableHttpTransport(url) if transport == "streamable-http" else SSETransport(url)
+        async with Client(client_transport) as client:
+            while time.monotonic() < deadline:
+                await client.call_tool("get_user_credit_balance", {})
+                completed += 1
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return completed
+
+
+@click.command()
+@click.option("--transport", type=click.Choice(("sse", "streamable-http")), default="streamable-http")
+@click.option("--workers", type=int, default=1)
+@click.option("--clients", type=int, default=16)
+@click.option("--duration", type=float, default=10.0)
+@click.option("--upstream-latency", type=float, default=0.02, help="Seconds the fake API waits per request")
+def main(transport, workers, clients, duration, upstream_latency):
+    port = _free_port()
+    with FakeNebulaBlockServer() as upstream:
+        upstream.default("users/credits", body={"credit": 100}, delay=upstream_latency)
+        env = dict(
+            os.environ,
+            NEBULA_BLOCK_API_URL=upstream.url,
+            NEBULA_BLOCK_API_KEY="bench",
+            NEBULA_BLOCK_RATE_LIMIT="0",
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.main", "--transport", transport, "--port", str(port), "--workers", str(workers)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_until_listening(port))
+            path = "mcp" if transport == "streamable-http" else "sse"
+            completed = asyncio.run(_drive(f"http://127.0.0.1:{port}/{path}/", transport, clients, duration))
+        finally:
+            server.terminate()
+            server.wait()
+    print(f"{transport} workers={workers} clients={clients}: {completed / duration:.1f} tool calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Columnar spend ledger over the billing listings.
+
+Invoice and payment-history records are ingested once into compact typed
+columns (``array`` buffers: timestamps, amounts, day numbers and
+dictionary-encoded product/instance labels) and aggregated from there, so a
+question like "what did I spend per product last month" never touches the
+raw JSON again. Aggregations use NumPy on the same buffers when it is
+installed.
+"""
+
+import math
+from array import array
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+DAY = 86400.0
+
+# Upstream keys to read each column from, first present wins.
+TIME_KEYS = ("created_at", "date", "time", "timestamp", "paid_at", "updated_at")
+AMOUNT_KEYS = ("amount", "cost", "total", "price")
+PRODUCT_KEYS = ("product_name", "product", "product_id", "description")
+INSTANCE_KEYS = ("instance_name", "instance_id", "instance")
+BALANCE_KEYS = ("credit", "credits", "balance", "amount")
+
+
+def _first(record: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def parse_time(value: Any) -> Optional[float]:
+    """
+    Return epoch seconds for an ISO 8601 string or an epoch number (seconds or milliseconds).
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+def parse_amount(value: Any) -> Optional[float]:
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount if math.isfinite(amount) else None
+
+
+def parse_balance(payload: Any) -> Optional[float]:
+    """
+    Read the credit balance from a ``users/credits`` payload.
+    """
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+    if isinstance(payload, dict):
+        return parse_amount(_first(payload, BALANCE_KEYS))
+    return parse_amount(payload)
+
+
+class Labels:
+    """
+    Dictionary encoding of a string column.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: Any) -> int:
+        value = "unknown" if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _group(keys: array, amounts: array, times: array, start: float) -> Dict[int, Tuple[float, int]]:
+    """
+    Sum and count ``amounts`` per key over the rows at or after ``start``.
+    """
+    if numpy is not None and len(keys):
+        selected = numpy.frombuffer(times, dtype=numpy.float64) >= start
+        codes, inverse = numpy.unique(numpy.frombuffer(keys, dtype=numpy.int64)[selected], return_inverse=True)
+        sums = numpy.bincount(inverse, weights=numpy.frombuffer(amounts, dtype=numpy.float64)[selected], minlength=len(codes))
+        counts = numpy.bincount(inverse, minlength=len(codes))
+        return {code: (total, count) for code, total, count in zip(codes.tolist(), sums.tolist(), counts.tolist())}
+    totals: Dict[int, List[float]] = defaultdict(lambda: [0.0, 0])
+    for key, amount, time in zip(keys, amounts, times):
+        if time >= start:
+            entry = totals[key]
+            entry[0] += amount
+            entry[1] += 1
+    return {key: (total, int(count)) for key, (total, count) in totals.items()}
+
+
+class Ledger:
+    """
+    Spend records of one billing listing, stored column-wise.
+    """
+
+    def __init__(self) -> None:
+        self.ids: Set[str] = set()
+        self.times = array("d")
+        self.amounts = array("d")
+        self.days = array("q")
+        self.products = array("q")
+        self.instances = array("q")
+        self.product_labels = Labels()
+        self.instance_labels = Labels()
+        self.skipped = 0
+        self.synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add(self, record: Any) -> bool:
+        """
+        Append ``record`` unless it was already ingested; returns whether it was new.
+
+        Records without a usable timestamp or amount are counted in ``skipped``.
+        """
+        if not isinstance(record, dict):
+            return False
+        id = record.get("id")
+        key = str(id) if id is not None else repr(sorted(record.items(), key=lambda item: item[0]))
+        if key in self.ids:
+            return False
+        self.ids.add(key)
+        time = parse_time(_first(record, TIME_KEYS))
+        amount = parse_amount(_first(record, AMOUNT_KEYS))
+        if time is None or amount is None:
+            self.skipped += 1
+            return True
+        self.times.append(time)
+        self.amounts.append(amount)
+        self.days.append(int(time // DAY))
+        self.products.append(self.product_labels.encode(_first(record, PRODUCT_KEYS)))
+        self.instances.append(self.instance_labels.encode(_first(record, INSTANCE_KEYS)))
+        return True
+
+    def aggregate(self, group_by: str, start: float) -> List[Dict[str, Any]]:
+        """
+        Spend per ``group_by`` ("product", "instance" or "day") since ``start``.
+
+        Days come in date order, other groups largest first.
+        """
+        if group_by == "day":
+            groups = _group(self.days, self.amounts, self.times, start)
+            return [
+                {
+                    "key": datetime.fromtimestamp(day * DAY, timezone.utc).date().isoformat(),
+                    "amount": round(total, 6),
+                    "count": count,
+                }
+                for day, (total, count) in sorted(groups.items())
+            ]
+        keys, labels = (self.products, self.product_labels) if group_by == "product" else (self.instances, self.instance_labels)
+        groups = _group(keys, self.amounts, self.times, start)
+        rows = [
+            {"key": labels.values[code], "amount": round(total, 6), "count": count}
+            for code, (total, count) in groups.items()
+        ]
+        return sorted(rows, key=lambda row: row["amount"], reverse=True)
+
+    def total(self, start: float) -> Tuple[float, int]:
+        """
+        Total spend and record count since ``start``.
+        """
+        groups = _group(self.days, self.amounts, self.times, start).values()
+        return sum(total for total, _ in groups), sum(count for _, count in groups)
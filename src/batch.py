@@ -0,0 +1,77 @@
+"""
+Batched tool execution.
+
+A batch runs several tool invocations concurrently in one MCP call. While a
+batch runs, identical upstream GETs made by its calls share one request,
+including ones issued after the first has already finished; any write in
+the batch forgets those shared reads so later calls see its effect.
+"""
+
+import asyncio
+import contextvars
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+_reads: ContextVar[Optional[Dict[Hashable, asyncio.Future]]] = ContextVar("batch_reads", default=None)
+
+
+async def batched_read(key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await ``factory()``, sharing its result with identical reads in the current batch.
+    """
+    reads = _reads.get()
+    if reads is None:
+        return await factory()
+    future = reads.get(key)
+    if future is None or (future.done() and (future.cancelled() or future.exception() is not None)):
+        future = reads[key] = asyncio.ensure_future(factory())
+    return await asyncio.shield(future)
+
+
+def outside_batch() -> contextvars.Context:
+    """
+    Return a copy of the current context that is not part of any batch.
+
+    Background tasks that outlive a call (watchers, pollers) are started in
+    it so they keep the request's tenant but never reuse the batch's reads.
+    """
+    context = contextvars.copy_context()
+    context.run(_reads.set, None)
+    return context
+
+
+def forget_batch_reads() -> None:
+    """
+    Drop the reads shared in the current batch, after a write.
+    """
+    reads = _reads.get()
+    if reads is not None:
+        reads.clear()
+
+
+async def run_batch(
+    call: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+    calls: List[Dict[str, Any]],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """
+    Run ``call(tool, arguments)`` for every entry with at most ``concurrency`` in flight.
+
+    Results come back in input order as ``{"tool", "ok", "result"}`` or
+    ``{"tool", "ok", "error"}`` entries; one failing call does not stop the others.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    token = _reads.set({})
+
+    async def _one(entry: Dict[str, Any]) -> Dict[str, Any]:
+        tool = entry.get("tool")
+        async with semaphore:
+            try:
+                return {"tool": tool, "ok": True, "result": await call(tool, entry.get("arguments") or {})}
+            except Exception as exc:
+                return {"tool": tool, "ok": False, "error": str(exc) or type(exc).__name__}
+
+    try:
+        return await asyncio.gather(*(_one(entry) for entry in calls))
+    finally:
+        _reads.reset(token)
@@ -0,0 +1,29 @@
+"""
+Bounded parallel fan-out for bulk instance operations.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+
+async def run_bulk(
+    action: Callable[[str], Awaitable[Any]],
+    ids: Iterable[str],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """
+    Run ``action(id)`` for every ID with at most ``concurrency`` calls in flight.
+
+    One failing ID does not stop the others. Results come back in input order
+    as ``{"id", "ok", "result"}`` or ``{"id", "ok", "error"}`` entries.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _one(id: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"id": id, "ok": True, "result": await action(id)}
+            except Exception as exc:
+                return {"id": id, "ok": False, "error": str(exc) or type(exc).__name__}
+
+    return await asyncio.gather(*(_one(id) for id in dict.fromkeys(ids)))
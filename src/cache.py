@@ -0,0 +1,140 @@
+"""
+In-process TTL response cache with LRU eviction.
+
+Entries are keyed by endpoint and query params. Each endpoint has its own TTL
+taken from ``Settings.NEBULA_BLOCK_CACHE_TTLS``; endpoints without a TTL are
+never cached. Entries may also carry a stale window, during which they can
+still be served by stale-while-revalidate reads.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Set, Tuple
+
+from src.config import settings
+
+CacheKey = Tuple[str, Hashable]
+
+MISSING = object()
+
+# Writes under one path also change listings served from a sibling path,
+# e.g. creating ``computing/instance`` adds a row to ``computing/instances``.
+RELATED_ENDPOINTS = {
+    "computing/instance": ("computing/instances", "computing/deleted-instances"),
+}
+
+
+def affected_endpoints(endpoint: str) -> Tuple[Set[str], str]:
+    """
+    Return the endpoints whose cached responses a write to ``endpoint`` makes stale.
+
+    That is ``endpoint`` itself, its ancestors and their related listings,
+    plus everything under the returned path prefix.
+    """
+    endpoint = endpoint.strip("/")
+    parts = endpoint.split("/")
+    ancestors = {"/".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    affected = set(ancestors)
+    for ancestor in ancestors:
+        affected.update(RELATED_ENDPOINTS.get(ancestor, ()))
+    return affected, endpoint + "/"
+
+
+def make_key(endpoint: str, params: Optional[dict] = None) -> CacheKey:
+    """
+    Build a hashable cache key from an endpoint and its query params.
+    """
+    return endpoint, tuple(sorted((params or {}).items()))
+
+
+class TTLCache:
+    """
+    A bounded mapping whose entries expire after a per-entry TTL.
+
+    The least recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, float, Any]]" = OrderedDict()
+        # Bumped on every invalidation so fetches that started before a write
+        # can tell their result is already out of date.
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        value, fresh = self.get_stale(key, default)
+        return value if fresh else default
+
+    def get_stale(self, key: CacheKey, default: Any = None) -> Tuple[Any, bool]:
+        """
+        Return ``(value, fresh)``, serving entries that are inside their stale window.
+
+        ``fresh`` is False when the TTL has passed but the entry may still be
+        served while it is revalidated.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default, False
+        fresh_until, stale_until, value = entry
+        now = self._clock()
+        if stale_until <= now:
+            del self._entries[key]
+            return default, False
+        self._entries.move_to_end(key)
+        return value, fresh_until > now
+
+    def set(self, key: CacheKey, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        now = self._clock()
+        self._entries[key] = (now + ttl, now + ttl + max(stale_ttl, 0.0), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str) -> int:
+        """
+        Drop entries affected by a write to ``endpoint``.
+
+        A write to ``ssh-keys/42`` invalidates ``ssh-keys/42``, anything below
+        it, and its parent collections such as ``ssh-keys``.
+        Returns the number of entries removed.
+        """
+        affected, prefix = affected_endpoints(endpoint)
+        stale = [
+            key for key in self._entries
+            if key[0] in affected or key[0].startswith(prefix)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.generation += 1
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+
+def ttl_for(endpoint: str) -> Optional[float]:
+    """
+    Return the configured TTL for ``endpoint``, or None if it is not cacheable.
+    """
+    if not settings.NEBULA_BLOCK_CACHE_ENABLED:
+        return None
+    return settings.NEBULA_BLOCK_CACHE_TTLS.get(endpoint)
+
+
+def swr_ttl_for(endpoint: str) -> Optional[float]:
+    """
+    Return the fresh TTL for stale-while-revalidate reads of ``endpoint``, if enabled.
+    """
+    if not settings.NEBULA_BLOCK_SWR_ENABLED:
+        return None
+    return settings.NEBULA_BLOCK_SWR_TTLS.get(endpoint)
@@ -0,0 +1,183 @@
+"""
+Record and replay of upstream NebulaBlock traffic.
+
+A cassette is a JSON Lines file (gzip-compressed when its name ends in
+``.gz``) holding one upstream exchange per line: method, path, query and
+request body, plus the response status, headers, body and how long it took.
+Credentials are never written. ``RecordingTransport`` appends the exchanges
+a real transport makes; ``ReplayTransport`` answers from a cassette without
+touching the network, optionally waiting the recorded time (or a fixed
+delay) so replays keep realistic timing.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+from typing import IO, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+# Response headers that describe the wire encoding rather than the body we
+# store (which is always the decoded content).
+SKIPPED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date"}
+)
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised when a replayed request has no recorded response.
+    """
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(method: str, path: str, query: str, body: str) -> Tuple[str, str, str, str]:
+    """
+    Identify a request independently of host, header order and query parameter order.
+    """
+    return method.upper(), path, urlencode(sorted(parse_qsl(query, keep_blank_values=True))), body
+
+
+def _key_of(request: httpx.Request) -> Tuple[str, str, str, str]:
+    body = request.content.decode("utf-8", "replace") if request.content else ""
+    return request_key(request.method, request.url.path, request.url.query.decode(), body)
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry: Dict[str, Any]) -> bytes:
+    if "body_base64" in entry:
+        return base64.b64decode(entry["body_base64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    Recorded exchanges of one cassette file.
+
+    Repeated requests are answered in the order they were recorded; once
+    they run out the last response keeps being served, so polling loops
+    replay like the recording and then settle.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._responses: Dict[Tuple[str, str, str, str], List[Dict[str, Any]]] = {}
+        self._positions: Dict[Tuple[str, str, str, str], int] = {}
+        self._lock = threading.Lock()
+        try:
+            with _open(path, "r") as file:
+                for line in file:
+                    if line.strip():
+                        self._add(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        key = request_key(entry["method"], entry["path"], entry.get("query", ""), entry.get("request_body", ""))
+        self._responses.setdefault(key, []).append(entry)
+
+    def record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        method, path, query, body = _key_of(request)
+        entry: Dict[str, Any] = {"method": method, "path": path}
+        if query:
+            entry["query"] = query
+        if body:
+            entry["request_body"] = body
+        entry["status"] = response.status_code
+        entry["headers"] = {
+            name: value for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS
+        }
+        entry.update(_encode_body(response.content))
+        entry["elapsed"] = round(elapsed, 6)
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            # Appending keeps a .gz cassette valid: readers handle multi-member gzip.
+            with _open(self.path, "a") as file:
+                file.write(line)
+            self._add(entry)
+
+    def next(self, request: httpx.Request) -> Dict[str, Any]:
+        """
+        Return the recorded exchange that answers ``request``.
+        """
+        key = _key_of(request)
+        responses = self._responses.get(key)
+        if not responses:
+            target = request.url.raw_path.decode()
+            raise CassetteMiss(f"No recorded response for {request.method} {target} in {self.path}")
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        return responses[min(position, len(responses) - 1)]
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._positions.clear()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Forward requests to ``transport`` and record every exchange in ``cassette``.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        self._transport = transport
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        # Hand the client an already-decoded body; the wire encoding is not kept.
+        headers = [
+            (name, value) for name, value in response.headers.multi_items() if name.lower() not in SKIPPED_HEADERS
+        ]
+        recorded = httpx.Response(response.status_code, headers=headers, content=content, request=request)
+        self.cassette.record(request, recorded, time.perf_counter() - started)
+        return recorded
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Answer requests from ``cassette`` without any network access.
+
+    Each response is delayed by its recorded duration, or by ``latency``
+    seconds when that is given (0 for no delay).
+    """
+
+    def __init__(self, cassette: Cassette, latency: Optional[float] = None) -> None:
+        self.cassette = cassette
+        self.latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.cassette.next(request)
+        delay = self.latency if self.latency is not None else entry.get("elapsed", 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers", {}), content=_decode_body(entry), request=request
+        )
@@ -0,0 +1,111 @@
+"""
+Pooled async HTTP client for the NebulaBlock API.
+
+A ``PooledClient`` keeps one ``httpx.AsyncClient`` per event loop so every
+tool call reuses keep-alive connections instead of opening a new TCP+TLS
+connection. Each tenant owns its own ``PooledClient``.
+"""
+
+import asyncio
+from typing import Optional, Set, Tuple
+
+import httpx
+
+from src.cassette import Cassette, RecordingTransport, ReplayTransport
+from src.config import settings
+
+_closing: Set[asyncio.Task] = set()
+_cassette: Optional[Cassette] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _shared_cassette() -> Optional[Cassette]:
+    global _cassette
+    path = settings.NEBULA_BLOCK_CASSETTE
+    if not path:
+        return None
+    if _cassette is None or _cassette.path != path:
+        _cassette = Cassette(path)
+    return _cassette
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.NEBULA_BLOCK_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.NEBULA_BLOCK_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.NEBULA_BLOCK_POOL_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.NEBULA_BLOCK_READ_TIMEOUT, connect=settings.NEBULA_BLOCK_CONNECT_TIMEOUT
+    )
+    http2 = settings.NEBULA_BLOCK_HTTP2 and _http2_available()
+    cassette = _shared_cassette()
+    if cassette is None:
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+    if settings.NEBULA_BLOCK_CASSETTE_MODE == "record":
+        transport = RecordingTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2), cassette)
+    else:
+        transport = ReplayTransport(cassette, settings.NEBULA_BLOCK_REPLAY_LATENCY)
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+class PooledClient:
+    """
+    Lazily created ``httpx.AsyncClient`` bound to the running event loop.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """
+        Return the client for the running event loop, creating it on first use.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = _build_client()
+            self._loop = loop
+        return self._client
+
+    def connection_counts(self) -> Tuple[int, int]:
+        """
+        Return ``(active, idle)`` connection counts of the open client's pool.
+        """
+        if self._client is None or self._client.is_closed:
+            return 0, 0
+        pool = getattr(self._client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", ()))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections) - idle, idle
+
+    async def aclose(self) -> None:
+        """
+        Close the client, if one is open on the running event loop.
+        """
+        client, loop = self._client, self._loop
+        self._client = self._loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    def close_soon(self) -> None:
+        """
+        Schedule ``aclose`` on the client's loop without waiting for it.
+        """
+        client, loop = self._client, self._loop
+        self._client = self._loop = None
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if client is not None and loop is running:
+            task = running.create_task(client.aclose())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
@@ -0,0 +1,59 @@
+"""
+In-flight request coalescing.
+
+Concurrent callers asking for the same key share one upstream future instead
+of each sending an identical request.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class Coalescer:
+    """
+    Deduplicate concurrent coroutines by key.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def _start(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            return future
+        future = asyncio.ensure_future(factory())
+        self._inflight[key] = future
+
+        def _done(f: asyncio.Future) -> None:
+            if self._inflight.get(key) is f:
+                del self._inflight[key]
+
+        future.add_done_callback(_done)
+        return future
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``factory()``, joining an in-flight call for ``key`` if there is one.
+
+        The shared future is shielded so one caller being cancelled does not
+        cancel the request for everyone else.
+        """
+        return await asyncio.shield(self._start(key, factory))
+
+    def refresh(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Start ``factory()`` in the background unless a call for ``key`` is in flight.
+        """
+        future = self._start(key, factory)
+
+        def _log_failure(f: asyncio.Future) -> None:
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning("Background refresh of %s failed: %s", key, f.exception())
+
+        future.add_done_callback(_log_failure)
@@ -0,0 +1,32 @@
+"""
+HTTP validators for conditional GETs.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` header are remembered
+together with their parsed body. The next read of the same endpoint sends
+``If-None-Match``/``If-Modified-Since``; a ``304 Not Modified`` answer then
+reuses the remembered object without downloading or decoding the body.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class Validated(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    value: Any
+
+
+def validators_of(response) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the response's ``(ETag, Last-Modified)`` headers, or Nones.
+    """
+    return response.headers.get("etag"), response.headers.get("last-modified")
+
+
+def conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
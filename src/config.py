@@ -1,11 +1,153 @@
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     NEBULA_BLOCK_API_URL: str = "https://api.nebulablock.com"
     NEBULA_BLOCK_API_KEY: Optional[str] = None
     NEBULA_BLOCK_DOCS_DIRECTORY: str = "docs"
+    # search_docs index file location (defaults to NEBULA_BLOCK_CACHE_DIR, or
+    # ~/.cache/nebulablock) and how often page mtimes are re-checked, in seconds.
+    NEBULA_BLOCK_DOCS_INDEX_DIR: Optional[str] = None
+    NEBULA_BLOCK_DOCS_RESCAN_INTERVAL: float = 5.0
+
+    # HTTP client pool
+    NEBULA_BLOCK_HTTP2: bool = True
+    NEBULA_BLOCK_POOL_MAX_CONNECTIONS: int = 100
+    NEBULA_BLOCK_POOL_MAX_KEEPALIVE: int = 20
+    NEBULA_BLOCK_POOL_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Response cache for read-only endpoints. Only endpoints listed in
+    # NEBULA_BLOCK_CACHE_TTLS are cached, each with its own TTL in seconds.
+    NEBULA_BLOCK_CACHE_ENABLED: bool = True
+    NEBULA_BLOCK_CACHE_MAX_ENTRIES: int = 256
+    NEBULA_BLOCK_CACHE_TTLS: Dict[str, float] = {
+        "computing/products": 300.0,
+        "computing/images": 300.0,
+        "ssh-keys": 60.0,
+        "keys": 60.0,
+    }
+
+    # Concurrent identical GETs share one upstream request.
+    NEBULA_BLOCK_COALESCE_REQUESTS: bool = True
+
+    # Stale-while-revalidate for hot endpoints: entries are fresh for the
+    # listed TTL, then served stale for up to NEBULA_BLOCK_SWR_MAX_STALE
+    # seconds while a background refresh runs.
+    NEBULA_BLOCK_SWR_ENABLED: bool = False
+    NEBULA_BLOCK_SWR_TTLS: Dict[str, float] = {
+        "computing/instances": 5.0,
+        "users/credits": 5.0,
+    }
+    NEBULA_BLOCK_SWR_MAX_STALE: float = 300.0
+
+    # Auto-pagination for the list endpoints
+    NEBULA_BLOCK_PAGE_SIZE: int = 100
+    NEBULA_BLOCK_PAGE_PREFETCH: int = 4
+    NEBULA_BLOCK_PAGINATION_MAX_RECORDS: int = 5000
+
+    # Bulk instance lifecycle operations
+    NEBULA_BLOCK_BULK_CONCURRENCY: int = 8
+
+    # multi_call batches
+    NEBULA_BLOCK_BATCH_CONCURRENCY: int = 8
+    NEBULA_BLOCK_BATCH_MAX_CALLS: int = 50
+
+    # Instance status watcher polling (seconds)
+    NEBULA_BLOCK_WATCH_MIN_INTERVAL: float = 1.0
+    NEBULA_BLOCK_WATCH_MAX_INTERVAL: float = 15.0
+    NEBULA_BLOCK_WATCH_BACKOFF: float = 1.5
+    NEBULA_BLOCK_WATCH_JITTER: float = 0.2
+    NEBULA_BLOCK_WATCH_TIMEOUT: float = 600.0
+
+    # Upstream timeouts (seconds). NEBULA_BLOCK_ENDPOINT_TIMEOUTS overrides
+    # them per endpoint prefix, e.g. {"users/invoices": {"read": 60}}.
+    NEBULA_BLOCK_CONNECT_TIMEOUT: float = 5.0
+    NEBULA_BLOCK_READ_TIMEOUT: float = 30.0
+    NEBULA_BLOCK_ENDPOINT_TIMEOUTS: Dict[str, Dict[str, float]] = {}
+
+    # Retries with exponential backoff and jitter
+    NEBULA_BLOCK_RETRIES: int = 3
+    NEBULA_BLOCK_RETRY_BACKOFF: float = 0.5
+    NEBULA_BLOCK_RETRY_MAX_BACKOFF: float = 10.0
+    NEBULA_BLOCK_RETRY_STATUSES: List[int] = [429, 502, 503, 504]
+
+    # Circuit breaker
+    NEBULA_BLOCK_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    NEBULA_BLOCK_CIRCUIT_RESET_TIMEOUT: float = 30.0
+
+    # Client-side rate limit and concurrency cap per API key.
+    # NEBULA_BLOCK_RATE_LIMIT is in requests per second; 0 disables it.
+    NEBULA_BLOCK_RATE_LIMIT: float = 10.0
+    NEBULA_BLOCK_RATE_BURST: int = 20
+    NEBULA_BLOCK_MAX_CONCURRENCY: int = 16
+
+    # Server transport. Network transports are served by uvicorn.
+    NEBULA_BLOCK_TRANSPORT: str = "stdio"
+    NEBULA_BLOCK_HOST: str = "127.0.0.1"
+    NEBULA_BLOCK_PORT: int = 8000
+    NEBULA_BLOCK_WORKERS: int = 1
+
+    # Multi-tenant serving. A request may carry its own NebulaBlock API key in
+    # the X-NebulaBlock-Api-Key header (or Authorization: Bearer); each key
+    # gets an isolated pool, cache and rate limiter. Idle tenants are evicted.
+    NEBULA_BLOCK_MAX_TENANTS: int = 1000
+    NEBULA_BLOCK_TENANT_IDLE_TIMEOUT: float = 900.0
+
+    # Resource subscriptions. Subscribed resources are polled between these
+    # intervals (seconds): more often the more they change and the more
+    # sessions subscribe to them.
+    NEBULA_BLOCK_SUBSCRIPTION_MIN_INTERVAL: float = 2.0
+    NEBULA_BLOCK_SUBSCRIPTION_MAX_INTERVAL: float = 60.0
+
+    # Local inventory index. Queries re-sync from upstream once the inventory
+    # is older than the TTL; set NEBULA_BLOCK_INVENTORY_DB to a file path to
+    # keep it in SQLite across restarts.
+    NEBULA_BLOCK_INVENTORY_TTL: float = 30.0
+    NEBULA_BLOCK_INVENTORY_DB: Optional[str] = None
+
+    # Spend analytics. The billing history is re-synced (new records only)
+    # once the local ledger is older than the TTL.
+    NEBULA_BLOCK_ANALYTICS_TTL: float = 60.0
+
+    # JSON backend: orjson when installed ("auto"), or force "orjson"/"json".
+    # Uncached upstream bodies that need no reshaping are passed through to
+    # the client as-is instead of being decoded and re-encoded.
+    NEBULA_BLOCK_JSON_BACKEND: Literal["auto", "orjson", "json"] = "auto"
+    NEBULA_BLOCK_RAW_PASSTHROUGH: bool = True
+
+    # Observability. Metrics are served at NEBULA_BLOCK_METRICS_PATH by the
+    # network transports; setting NEBULA_BLOCK_OTLP_ENDPOINT (e.g.
+    # http://collector:4318/v1/traces) exports OpenTelemetry traces.
+    NEBULA_BLOCK_METRICS_ENABLED: bool = False
+    NEBULA_BLOCK_METRICS_PATH: str = "/metrics"
+    NEBULA_BLOCK_OTLP_ENDPOINT: Optional[str] = None
+    NEBULA_BLOCK_SERVICE_NAME: str = "nebulablock-mcp-server"
+
+    # Register tools from the prebuilt schemas in src/registry.json instead of
+    # generating them at startup (regenerate with `python -m src.registry`).
+    NEBULA_BLOCK_PREBUILT_REGISTRY: bool = True
+
+    # On-disk response cache shared by every server process on the machine.
+    # When set, responses of the endpoints in NEBULA_BLOCK_CACHE_TTLS are also
+    # kept in a SQLite database in this directory, so a new process serves
+    # them without a network call, e.g. "~/.cache/nebulablock-mcp".
+    NEBULA_BLOCK_CACHE_DIR: Optional[str] = None
+
+    # Conditional GETs. ETag/Last-Modified validators of recent responses are
+    # kept (with the parsed body) so a repeat read that gets 304 Not Modified
+    # reuses the object instead of downloading and decoding it again.
+    NEBULA_BLOCK_CONDITIONAL_REQUESTS: bool = True
+    NEBULA_BLOCK_VALIDATOR_MAX_ENTRIES: int = 256
+    NEBULA_BLOCK_VALIDATOR_TTL: float = 3600.0
+
+    # Record/replay of upstream traffic. With NEBULA_BLOCK_CASSETTE set to a
+    # file path, "record" appends every upstream exchange to it (gzipped if
+    # the name ends in .gz) and "replay" answers from it with no network
+    # access, waiting the recorded time or NEBULA_BLOCK_REPLAY_LATENCY seconds.
+    NEBULA_BLOCK_CASSETTE: Optional[str] = None
+    NEBULA_BLOCK_CASSETTE_MODE: Literal["record", "replay"] = "replay"
+    NEBULA_BLOCK_REPLAY_LATENCY: Optional[float] = None
 
     model_config = SettingsConfigDict(env_file=".env")
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
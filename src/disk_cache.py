@@ -0,0 +1,123 @@
+"""
+On-disk response cache shared by every server process on one machine.
+
+Each editor window runs its own stdio server, so the in-process cache starts
+empty on every launch. When ``NEBULA_BLOCK_CACHE_DIR`` is set, responses of
+cached endpoints are also written to a SQLite database (WAL mode) in that
+directory, together with their TTL and ``ETag``/``Last-Modified`` validators.
+A new process serves fresh entries from it without a network call. Every
+write is a single transaction, so concurrent readers and writers in other
+processes only ever see whole entries.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, NamedTuple, Optional
+
+from src.cache import CacheKey, affected_endpoints
+
+# Expired entries are kept this long for their validators before being purged.
+RETENTION = 7 * 24 * 3600
+
+
+class DiskEntry(NamedTuple):
+    body: bytes
+    fresh_until: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def _key_text(key: CacheKey) -> str:
+    endpoint, params = key
+    return json.dumps([endpoint, [[name, value] for name, value in params]], default=str, separators=(",", ":"))
+
+
+class DiskCache:
+    """
+    SQLite-backed response bodies, partitioned by tenant scope.
+    """
+
+    def __init__(self, directory: str, clock: Callable[[], float] = time.time) -> None:
+        self.directory = directory
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self._clock = clock
+        self._db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " scope TEXT NOT NULL, key TEXT NOT NULL, endpoint TEXT NOT NULL, body BLOB NOT NULL,"
+                " fresh_until REAL NOT NULL, etag TEXT, last_modified TEXT,"
+                " PRIMARY KEY (scope, key))"
+            )
+            self._db.execute("DELETE FROM responses WHERE fresh_until < ?", (self._clock() - RETENTION,))
+
+    def get(self, scope: str, key: CacheKey) -> Optional[DiskEntry]:
+        """
+        Return the stored entry for ``key``, fresh or not.
+        """
+        row = self._db.execute(
+            "SELECT body, fresh_until, etag, last_modified FROM responses WHERE scope = ? AND key = ?",
+            (scope, _key_text(key)),
+        ).fetchone()
+        return DiskEntry(*row) if row else None
+
+    def remaining(self, entry: DiskEntry) -> float:
+        """
+        Seconds until ``entry`` expires; zero or less once it has.
+        """
+        return entry.fresh_until - self._clock()
+
+    def set(
+        self,
+        scope: str,
+        key: CacheKey,
+        body: bytes,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (scope, key, endpoint, body, fresh_until, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (scope, _key_text(key), key[0], body, self._clock() + ttl, etag, last_modified),
+            )
+
+    def touch(self, scope: str, key: CacheKey, ttl: float) -> None:
+        """
+        Mark an entry fresh again for ``ttl`` seconds, e.g. after a 304.
+        """
+        with self._db:
+            self._db.execute(
+                "UPDATE responses SET fresh_until = ? WHERE scope = ? AND key = ?",
+                (self._clock() + ttl, scope, _key_text(key)),
+            )
+
+    def invalidate(self, scope: str, endpoint: str) -> int:
+        """
+        Drop ``scope``'s entries affected by a write to ``endpoint``.
+        """
+        affected, prefix = affected_endpoints(endpoint)
+        placeholders = ",".join("?" * len(affected))
+        with self._db:
+            cursor = self._db.execute(
+                f"DELETE FROM responses WHERE scope = ? AND (endpoint IN ({placeholders}) OR endpoint LIKE ? ESCAPE '\\')",
+                (scope, *affected, prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"),
+            )
+        return cursor.rowcount
+
+    def clear(self, scope: Optional[str] = None) -> None:
+        with self._db:
+            if scope is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute("DELETE FROM responses WHERE scope = ?", (scope,))
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,384 @@
+"""
+Full-text search over the Markdown and HTML pages in the docs directory.
+
+Pages are indexed into one on-disk file: a JSON header (pages and the term
+lexicon) followed by three parallel postings columns, the page IDs and term
+frequencies (unsigned 32-bit) and the precomputed BM25 weights (float32).
+Each term's postings are a contiguous run sorted by page ID. The file is
+memory-mapped when first needed, so a query only touches the postings of its
+own terms. Ranking uses MaxScore: once the terms left cannot lift an unseen
+page into the top results, they are only looked up (by binary search) for
+the pages still in contention instead of being scanned.
+
+When page mtimes or sizes change the index is rebuilt incrementally:
+postings of unchanged pages are carried over from the old file and only new
+or modified pages are read and tokenized again.
+
+The index file lives in a per-user directory created with mode 0700, and a
+loaded index listing any page outside the docs directory is discarded, so
+only files under that directory can ever be served.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"NBDOCS01"
+EXTENSIONS = (".md", ".markdown", ".html", ".htm")
+K1 = 1.2
+B = 0.75
+SUMMARY_LENGTH = 200
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_HEADER = struct.Struct("<8sQ")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class _HTMLText(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.parts: List[str] = []
+        self.title: Optional[str] = None
+        self._skip = 0
+        self._in_title = False
+        self._heading: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and self.title is None:
+            self._heading = []
+
+    def handle_endtag(self, tag) -> None:
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "h1" and self._heading is not None:
+            self.title = self.title or " ".join(self._heading).strip() or None
+            self._heading = None
+
+    def handle_data(self, data) -> None:
+        if self._skip:
+            return
+        if self._in_title:
+            self.title = (self.title or "") + data.strip()
+            return
+        if self._heading is not None:
+            self._heading.append(data.strip())
+        self.parts.append(data)
+
+
+def extract_text(path: str, source: str) -> Tuple[str, str]:
+    """
+    Return the title and plain text of a Markdown or HTML page.
+    """
+    if path.lower().endswith((".html", ".htm")):
+        parser = _HTMLText()
+        parser.feed(source)
+        text = " ".join(" ".join(parser.parts).split())
+        return parser.title or os.path.basename(path), text
+    title = None
+    for line in source.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip()
+            break
+    return title or os.path.basename(path), source
+
+
+DEFAULT_INDEX_DIR = "~/.cache/nebulablock"
+
+
+def default_index_path(directory: str, index_dir: Optional[str] = None) -> str:
+    """
+    Where the index of ``directory`` is stored: ``index_dir`` or ``~/.cache/nebulablock``.
+    """
+    name = hashlib.sha256(os.path.abspath(directory).encode()).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(index_dir or DEFAULT_INDEX_DIR), f"nebulablock-docs-{name}.idx")
+
+
+def contains(directory: str, path: str) -> bool:
+    """
+    Whether ``path``, relative to ``directory``, resolves to a file inside it.
+    """
+    root = os.path.realpath(directory)
+    return os.path.realpath(os.path.join(root, path)).startswith(root + os.sep)
+
+
+def scan(directory: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Map each page under ``directory`` (relative POSIX path) to its ``(mtime_ns, size)``.
+    """
+    pages = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+        for name in files:
+            if name.startswith(".") or not name.lower().endswith(EXTENSIONS):
+                continue
+            full = os.path.join(root, name)
+            if not contains(directory, os.path.relpath(full, directory)):
+                continue
+            stat = os.stat(full)
+            pages[os.path.relpath(full, directory).replace(os.sep, "/")] = (stat.st_mtime_ns, stat.st_size)
+    return pages
+
+
+class _Loaded(NamedTuple):
+    pages: List[Dict[str, Any]]
+    lexicon: Dict[str, List[Any]]
+    ids: memoryview
+    frequencies: memoryview
+    weights: memoryview
+    by_path: Dict[str, int]
+
+
+class DocsIndex:
+    """
+    BM25 search over a docs directory, backed by a memory-mapped index file.
+
+    Queries read an immutable snapshot of the loaded index, so a rebuild in
+    another thread swaps the snapshot without blocking or breaking them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        index_path: Optional[str] = None,
+        rescan_interval: float = 5.0,
+        clock=time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.index_path = index_path or default_index_path(directory)
+        self.rescan_interval = rescan_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._loaded_stat: Optional[Tuple[int, int]] = None
+        self._state: Optional[_Loaded] = None
+
+    @property
+    def pages(self) -> List[Dict[str, Any]]:
+        return self._state.pages if self._state is not None else []
+
+    def due(self) -> bool:
+        """
+        Whether the next query should check the directory for changes first.
+        """
+        return self._checked_at is None or self._clock() - self._checked_at >= self.rescan_interval
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Load the index, rebuilding it if pages changed; returns whether it was rebuilt.
+        """
+        with self._lock:
+            if not force and not self.due():
+                return False
+            self._checked_at = self._clock()
+            self._load()
+            current = scan(self.directory) if os.path.isdir(self.directory) else {}
+            held = {page["path"]: (page["mtime_ns"], page["size"]) for page in self.pages}
+            if current == held and self._state is not None:
+                return False
+            self._rebuild(current)
+            self._load()
+            return True
+
+    def _index_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    def _load(self) -> None:
+        stat = self._index_stat()
+        if stat is None or stat == self._loaded_stat:
+            return
+        with open(self.index_path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_length = _HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.index_path} is not a docs index")
+            header = json.loads(mapped[_HEADER.size:_HEADER.size + header_length])
+            if not all(contains(self.directory, page["path"]) for page in header["pages"]):
+                raise ValueError(f"{self.index_path} lists pages outside {self.directory}")
+        except (ValueError, KeyError, TypeError, struct.error):
+            mapped.close()
+            self._state = None
+            return
+        start = _HEADER.size + header_length
+        start += -start % 4
+        size = 4 * header["postings"]
+        view = memoryview(mapped)
+        pages = header["pages"]
+        # The previous snapshot's map is closed when its last reader drops it.
+        self._state = _Loaded(
+            pages,
+            header["lexicon"],
+            view[start:start + size].cast("I"),
+            view[start + size:start + 2 * size].cast("I"),
+            view[start + 2 * size:start + 3 * size].cast("f"),
+            {page["path"]: id for id, page in enumerate(pages)},
+        )
+        self._loaded_stat = stat
+
+    def _rebuild(self, current: Dict[str, Tuple[int, int]]) -> None:
+        state = self._state
+        pages: List[Dict[str, Any]] = []
+        kept: Dict[int, int] = {}
+        for old_id, page in enumerate(self.pages):
+            if current.get(page["path"]) == (page["mtime_ns"], page["size"]):
+                kept[old_id] = len(pages)
+                pages.append(page)
+
+        # term -> [page IDs], [frequencies], in page ID order
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        if kept:
+            for term, (offset, count, _) in state.lexicon.items():
+                ids, frequencies = [], []
+                for id, frequency in zip(state.ids[offset:offset + count], state.frequencies[offset:offset + count]):
+                    new_id = kept.get(id)
+                    if new_id is not None:
+                        ids.append(new_id)
+                        frequencies.append(frequency)
+                if ids:
+                    postings[term] = (ids, frequencies)
+
+        held = {page["path"] for page in pages}
+        for path in sorted(set(current) - held):
+            try:
+                with open(os.path.join(self.directory, path), encoding="utf-8", errors="replace") as handle:
+                    title, text = extract_text(path, handle.read())
+            except OSError:
+                continue
+            terms = tokenize(text)
+            id = len(pages)
+            pages.append(
+                {
+                    "path": path,
+                    "title": title,
+                    "mtime_ns": current[path][0],
+                    "size": current[path][1],
+                    "length": len(terms),
+                    "summary": " ".join(text.split())[:SUMMARY_LENGTH],
+                }
+            )
+            for term, frequency in Counter(terms).items():
+                ids, frequencies = postings.setdefault(term, ([], []))
+                ids.append(id)
+                frequencies.append(frequency)
+
+        total = len(pages)
+        average = sum(page["length"] for page in pages) / total if total else 1.0
+        norms = [K1 * (1 - B + B * page["length"] / (average or 1.0)) for page in pages]
+        lexicon = {}
+        all_ids, all_frequencies, all_weights = array("I"), array("I"), array("f")
+        for term in sorted(postings):
+            ids, frequencies = postings[term]
+            idf = math.log(1 + (total - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = array("f", (idf * f * (K1 + 1) / (f + norms[id]) for id, f in zip(ids, frequencies)))
+            lexicon[term] = [len(all_ids), len(ids), max(weights)]
+            all_ids.extend(ids)
+            all_frequencies.extend(frequencies)
+            all_weights.extend(weights)
+        self._write({"pages": pages, "lexicon": lexicon, "postings": len(all_ids)}, (all_ids, all_frequencies, all_weights))
+
+    def _write(self, header: Dict[str, Any], columns: Tuple[array, ...]) -> None:
+        encoded = json.dumps(header, separators=(",", ":")).encode()
+        directory = os.path.dirname(self.index_path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(_HEADER.pack(MAGIC, len(encoded)))
+                handle.write(encoded)
+                handle.write(b"\0" * (-(_HEADER.size + len(encoded)) % 4))
+                for column in columns:
+                    column.tofile(handle)
+            os.replace(temporary, self.index_path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the ``limit`` pages ranking highest for ``query`` under BM25.
+        """
+        state = self._state
+        if state is None or limit <= 0:
+            return []
+        entries = sorted(
+            (state.lexicon[term] for term in set(tokenize(query)) if term in state.lexicon),
+            key=lambda entry: entry[1],
+        )
+        if not entries:
+            return []
+        # bounds[i]: the most the terms from i on can add to any page's score.
+        bounds = list(accumulate(entry[2] for entry in reversed(entries)))[::-1]
+        scores = [0.0] * len(state.pages)
+        threshold = 0.0
+        scanned = len(entries)
+        for index, (offset, count, _) in enumerate(entries):
+            if bounds[index] < threshold:
+                scanned = index
+                break
+            for id, weight in zip(state.ids[offset:offset + count], state.weights[offset:offset + count]):
+                scores[id] += weight
+            threshold = heapq.nlargest(limit, scores)[-1]
+
+        if scanned < len(entries):
+            rest = entries[scanned:]
+            bound = bounds[scanned]
+            for id, score in enumerate(scores):
+                if not score or score + bound < threshold:
+                    continue
+                for offset, count, _ in rest:
+                    at = bisect_left(state.ids, id, offset, offset + count)
+                    if at < offset + count and state.ids[at] == id:
+                        score += state.weights[at]
+                scores[id] = score
+
+        best = heapq.nlargest(limit, (id for id, score in enumerate(scores) if score), key=scores.__getitem__)
+        return [
+            {
+                "path": state.pages[id]["path"],
+                "title": state.pages[id]["title"],
+                "score": round(scores[id], 4),
+                "summary": state.pages[id]["summary"],
+                "uri": f"mcp://docs/{state.pages[id]['path']}",
+            }
+            for id in best
+        ]
+
+    def read(self, path: str) -> str:
+        """
+        Return the source of an indexed page. Only indexed paths can be read.
+        """
+        if self._state is None or path not in self._state.by_path or not contains(self.directory, path):
+            raise ValueError(f"Unknown docs page: {path}")
+        with open(os.path.join(self.directory, path), encoding="utf-8", errors="replace") as handle:
+            return handle.read()
+
+    def close(self) -> None:
+        self._state = None
+        self._loaded_stat = None
@@ -0,0 +1,344 @@
+"""
+Declarative table of the NebulaBlock API endpoints exposed as MCP tools.
+
+Each ``Endpoint`` names its tool, HTTP method, path template and parameters
+(path, query or JSON body), the MCP resources that read it, whether its
+responses may be passed through raw or reshaped with ``fields``/``match``,
+and whether it has a paginated "all records" companion tool.
+``register_endpoints`` turns every entry into tool functions with real
+signatures (so FastMCP and the prebuilt registry see ordinary functions) that
+all hand their arguments to one request pipeline. Adding an endpoint is one
+table entry; caching, coalescing, conditional requests, retries, rate
+limiting, metrics and tracing are applied by that pipeline.
+
+Cache TTLs stay in ``NEBULA_BLOCK_CACHE_TTLS``/``NEBULA_BLOCK_SWR_TTLS``,
+keyed by the endpoint path, so they remain configurable per deployment.
+"""
+
+import inspect
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
+from urllib.parse import quote
+
+from fastmcp import Context
+
+REQUIRED = inspect.Parameter.empty
+
+SHAPING_DOC = (
+    "`fields` keeps only the given (dotted) fields of each record, and `match` keeps only records whose fields "
+    "equal the given values."
+)
+PAGINATION_DOC = (
+    "Pages are fetched server-side and concurrently. At most `max_records` rows are returned; pass the returned "
+    "`next_offset` as `offset` to continue."
+)
+
+
+@dataclass(frozen=True)
+class Param:
+    name: str
+    annotation: Any = str
+    default: Any = REQUIRED
+    location: Literal["path", "query", "body"] = "query"
+
+
+@dataclass(frozen=True)
+class Pagination:
+    """
+    A companion tool that follows ``limit``/``offset`` pages server-side.
+    """
+
+    name: str
+    summary: str
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: Literal["GET", "POST", "PUT", "DELETE"]
+    path: str
+    params: Tuple[Param, ...] = ()
+    description: Optional[str] = None
+    # Templates are matched in order, so list longer URIs before their prefixes.
+    resources: Tuple[str, ...] = ()
+    # Pass the upstream body through undecoded when nothing reshapes it.
+    raw: bool = False
+    # Accept ``fields``/``match`` and reshape the response with them.
+    shaped: bool = False
+    # A GET with side effects: never cached, and invalidates what it touches.
+    mutates: bool = False
+    # Whether a failed request may be retried; None follows the HTTP method.
+    idempotent: Optional[bool] = None
+    pagination: Optional[Pagination] = None
+
+    def url_path(self, arguments: Dict[str, Any]) -> str:
+        return re.sub(r"{(\w+)}", lambda m: quote(str(arguments[m.group(1)]), safe=""), self.path)
+
+    def query(self, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Query parameters that were given, or None if the endpoint takes none.
+        """
+        names = [param.name for param in self.params if param.location == "query"]
+        if not names:
+            return None
+        return {name: arguments[name] for name in names if arguments.get(name) is not None}
+
+    def body(self, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        names = [param.name for param in self.params if param.location == "body"]
+        if not names:
+            return None
+        return {name: arguments[name] for name in names}
+
+
+PAGE_PARAMS = (Param("limit", int, None), Param("offset", int, None))
+ID = Param("id", str, location="path")
+
+ENDPOINTS: Tuple[Endpoint, ...] = (
+    Endpoint(
+        "get_computing_products",
+        "GET",
+        "computing/products",
+        description="List the available computing products.\n\n"
+        "`fields` keeps only the given (dotted) fields of each product, and `match` keeps only products whose "
+        "fields equal the given values.",
+        resources=("mcp://computing_products", "mcp://computing_products?fields={fields}"),
+        shaped=True,
+    ),
+    Endpoint(
+        "get_user_instances",
+        "GET",
+        "computing/instances",
+        PAGE_PARAMS,
+        description=SHAPING_DOC,
+        resources=(
+            "mcp://user_instances",
+            "mcp://user_instances?limit={limit}&offset={offset}&fields={fields}",
+            "mcp://user_instances?limit={limit}&offset={offset}",
+        ),
+        raw=True,
+        shaped=True,
+        pagination=Pagination("get_all_user_instances", "List all of the user's instances in one call."),
+    ),
+    Endpoint(
+        "get_user_instance_detail",
+        "GET",
+        "computing/instance/{id}",
+        (ID,),
+        resources=("mcp://user_instance_detail/{id}",),
+    ),
+    Endpoint(
+        "list_deleted_user_instances",
+        "GET",
+        "computing/deleted-instances",
+        resources=("mcp://deleted_user_instances",),
+        raw=True,
+    ),
+    Endpoint(
+        "get_user_credit_balance",
+        "GET",
+        "users/credits",
+        resources=("mcp://billing_user_credit_balance",),
+    ),
+    Endpoint(
+        "list_user_invoices",
+        "GET",
+        "users/invoices",
+        PAGE_PARAMS,
+        description=SHAPING_DOC,
+        resources=(
+            "mcp://billing_user_invoices?limit={limit}&offset={offset}&fields={fields}",
+            "mcp://billing_user_invoices?limit={limit}&offset={offset}",
+        ),
+        raw=True,
+        shaped=True,
+        pagination=Pagination("list_all_user_invoices", "List all of the user's invoices in one call."),
+    ),
+    Endpoint("list_api_keys", "GET", "keys", resources=("mcp://api_keys",)),
+    Endpoint("list_ssh_keys", "GET", "ssh-keys", resources=("mcp://ssh_keys",)),
+    Endpoint(
+        "delete_gpu_instance",
+        "DELETE",
+        "computing/instance/{id}",
+        (ID,),
+        description="Delete GPU Instances.\n\n"
+        "Permanently delete an instance by specifying the instance ID in the path to delete the selected instance.",
+    ),
+    Endpoint(
+        "start_gpu_instance",
+        "GET",
+        "computing/instance/{id}/start",
+        (ID,),
+        description="Start GPU Instances.\n\n"
+        "Initiate the startup of an instance. Provide the instance ID in the path to start the specified instance.",
+        mutates=True,
+    ),
+    Endpoint(
+        "stop_gpu_instance",
+        "GET",
+        "computing/instance/{id}/stop",
+        (ID,),
+        description="Stop GPU Instances.\n\n"
+        "Shut down an instance. Provide the instance ID in the path to initiate the shutdown process for that instance.",
+        mutates=True,
+    ),
+    Endpoint(
+        "reboot_gpu_instance",
+        "GET",
+        "computing/instance/{id}/reboot",
+        (ID,),
+        description="Reboot GPU Instances.\n\n"
+        "Initiate a reboot of an instance. Provide the instance ID in the path to reboot the specified instance.",
+        mutates=True,
+        # A re-sent reboot restarts the instance again.
+        idempotent=False,
+    ),
+    Endpoint(
+        "create_gpu_instance",
+        "POST",
+        "computing/instance",
+        (
+            Param("instance_name", location="body"),
+            Param("product_id", location="body"),
+            Param("image_id", location="body"),
+            Param("ssh_key_id", location="body"),
+        ),
+        description="Create GPU Instances.\n\n"
+        "Create an instance with the specified custom configuration and features provided in the request body.",
+    ),
+    # NOTE: seems this api does not exist
+    # Endpoint(
+    #     "rename_ssh_key",
+    #     "PUT",
+    #     "ssh-keys/{id}",
+    #     (Param("id", int, location="path"), Param("key_name", location="body")),
+    #     description="Rename SSH Key.\n\nUpdates the name of a specified SSH key. Include the ID of the SSH key "
+    #     "in the endpoint path and the new name in the body of the request.",
+    # ),
+    Endpoint(
+        "delete_ssh_key",
+        "DELETE",
+        "ssh-keys/{id}",
+        (ID,),
+        description="Deletes a specified SSH key by including the ID of the SSH key in the endpoint path.",
+    ),
+    # NOTE: seems this api does not exist
+    # Endpoint(
+    #     "delete_api_key",
+    #     "DELETE",
+    #     "api_keys/{id}",
+    #     (Param("id", int, location="path"),),
+    #     description="Deletes a specified API key by including the ID of the API key in the endpoint path.",
+    # ),
+    Endpoint(
+        "list_available_os_images",
+        "GET",
+        "computing/images",
+        description="List Available OS Images.\n\n"
+        "Return a list of all available operating system images, including details about each image's version "
+        "and driver, if applicable.",
+        resources=("mcp://available_os_images",),
+    ),
+    Endpoint(
+        "create_ssh_key",
+        "POST",
+        "ssh-keys",
+        (Param("key_name", location="body"), Param("key_data", location="body")),
+        description="Creates an SSH key for use in your instances.",
+    ),
+    Endpoint(
+        "get_payment_history",
+        "GET",
+        "users/credits/history",
+        PAGE_PARAMS,
+        description="Retrieve the user's transaction history.\n\n"
+        "Retrieve your credit payment history for different products.",
+        resources=("mcp://payment_history?limit={limit}&offset={offset}",),
+        raw=True,
+        pagination=Pagination("get_all_payment_history", "Retrieve the user's full transaction history in one call."),
+    ),
+)
+
+CallEndpoint = Callable[[Endpoint, Dict[str, Any]], Awaitable[Any]]
+Paginate = Callable[[Endpoint, Optional[int], Optional[int], int, Optional[Context]], Awaitable[Any]]
+
+
+def _function(name: str, doc: Optional[str], parameters: List[inspect.Parameter], run, module: str):
+    signature = inspect.Signature(parameters)
+
+    async def endpoint_tool(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return await run(bound.arguments)
+
+    endpoint_tool.__name__ = endpoint_tool.__qualname__ = name
+    endpoint_tool.__module__ = module
+    endpoint_tool.__doc__ = doc
+    endpoint_tool.__signature__ = signature
+    endpoint_tool.__annotations__ = {parameter.name: parameter.annotation for parameter in parameters}
+    return endpoint_tool
+
+
+def _parameter(name: str, annotation: Any, default: Any = REQUIRED) -> inspect.Parameter:
+    return inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default, annotation=annotation)
+
+
+def endpoint_functions(endpoint: Endpoint, call: CallEndpoint, paginate: Paginate, module: str) -> Dict[str, Callable]:
+    """
+    Build the tool function for ``endpoint`` and, if it has one, its pagination companion.
+    """
+    parameters = [_parameter(param.name, param.annotation, param.default) for param in endpoint.params]
+    if endpoint.shaped:
+        parameters += [_parameter("fields", Union[List[str], str], None), _parameter("match", Dict[str, str], None)]
+
+    async def _call(arguments):
+        return await call(endpoint, arguments)
+
+    functions = {endpoint.name: _function(endpoint.name, endpoint.description, parameters, _call, module)}
+    if endpoint.pagination is not None:
+        page_parameters = [
+            _parameter("page_size", int, None),
+            _parameter("max_records", int, None),
+            _parameter("offset", int, 0),
+            _parameter("ctx", Optional[Context], None),
+        ]
+
+        async def _paginate(arguments):
+            return await paginate(
+                endpoint, arguments["page_size"], arguments["max_records"], arguments["offset"], arguments["ctx"]
+            )
+
+        name = endpoint.pagination.name
+        doc = f"{endpoint.pagination.summary}\n\n{PAGINATION_DOC}"
+        functions[name] = _function(name, doc, page_parameters, _paginate, module)
+    return functions
+
+
+def _defaults(tool: Callable):
+    async def _run(arguments):
+        return await tool()
+    return _run
+
+
+def register_endpoints(
+    server, endpoints: Tuple[Endpoint, ...], call: CallEndpoint, paginate: Paginate, module: str
+) -> Dict[str, Callable]:
+    """
+    Register a tool (plus resources and pagination companion) for every endpoint.
+
+    Returns the generated functions by tool name.
+    """
+    registered: Dict[str, Callable] = {}
+    for endpoint in endpoints:
+        functions = endpoint_functions(endpoint, call, paginate, module)
+        tool = functions[endpoint.name]
+        for name, fn in functions.items():
+            server.tool(name)(fn)
+        for uri in endpoint.resources:
+            if "{" in uri:
+                server.resource(uri)(tool)
+            else:
+                # Resources without URI parameters read the tool with its defaults.
+                server.resource(uri, name=endpoint.name)(_function(endpoint.name, None, [], _defaults(tool), module))
+        registered.update(functions)
+    return registered
@@ -0,0 +1,255 @@
+"""
+Local inventory of instances, products and OS images.
+
+Rows are kept in memory with hash indexes on the fields agents filter by,
+so queries touch only matching rows instead of the full upstream listing.
+Syncs diff the upstream listing against what is held and only re-index rows
+that changed. An optional SQLite file keeps the inventory across restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Indexed field -> upstream keys to read it from; every present key is indexed.
+INSTANCE_FIELDS = {
+    "status": ("status",),
+    "product": ("product_id", "product_name", "product"),
+    "region": ("region",),
+    "name": ("instance_name", "host_name", "name"),
+}
+CATALOG_FIELDS = {
+    "region": ("region",),
+    "name": ("name", "product_name", "image_name"),
+}
+
+
+def _field_values(row: Dict[str, Any], keys: Tuple[str, ...]) -> Set[str]:
+    return {str(row[key]).lower() for key in keys if row.get(key) is not None}
+
+
+class Table:
+    """
+    Rows keyed by ``id`` with one hash index per field.
+    """
+
+    def __init__(self, fields: Dict[str, Tuple[str, ...]]) -> None:
+        self.fields = fields
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {
+            field: defaultdict(set) for field in fields
+        }
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _index(self, id: str, row: Dict[str, Any]) -> None:
+        for field, keys in self.fields.items():
+            for value in _field_values(row, keys):
+                self._indexes[field][value].add(id)
+
+    def _unindex(self, id: str, row: Dict[str, Any]) -> None:
+        for field, keys in self.fields.items():
+            for value in _field_values(row, keys):
+                ids = self._indexes[field].get(value)
+                if ids is not None:
+                    ids.discard(id)
+                    if not ids:
+                        del self._indexes[field][value]
+
+    def upsert(self, row: Dict[str, Any]) -> bool:
+        """
+        Insert or update ``row``; returns False if it was already stored unchanged.
+        """
+        id = str(row["id"])
+        old = self.rows.get(id)
+        if old == row:
+            return False
+        if old is not None:
+            self._unindex(id, old)
+        self.rows[id] = row
+        self._index(id, row)
+        return True
+
+    def remove(self, id: str) -> bool:
+        row = self.rows.pop(id, None)
+        if row is None:
+            return False
+        self._unindex(id, row)
+        return True
+
+    def sync(self, rows: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """
+        Make the table match ``rows``; returns the changed and removed IDs.
+        """
+        seen = set()
+        changed = []
+        for row in rows:
+            if not isinstance(row, dict) or row.get("id") is None:
+                continue
+            id = str(row["id"])
+            seen.add(id)
+            if self.upsert(row):
+                changed.append(id)
+        removed = [id for id in list(self.rows) if id not in seen]
+        for id in removed:
+            self.remove(id)
+        return changed, removed
+
+    def query(
+        self,
+        filters: Dict[str, Union[None, str, Iterable[str]]],
+        name_contains: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return rows whose indexed fields equal every non-None filter (case-insensitive).
+
+        A filter given as a collection matches any of its values.
+        """
+        candidates: Optional[Set[str]] = None
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field not in self._indexes:
+                raise ValueError(f"Unknown filter field: {field}")
+            index = self._indexes[field]
+            values = [value] if isinstance(value, str) else value
+            ids = set().union(*(index.get(str(value).lower(), set()) for value in values))
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        ids = candidates if candidates is not None else self.rows.keys()
+        needle = name_contains.lower() if name_contains else None
+        results = []
+        for id in ids:
+            row = self.rows[id]
+            if needle is not None and not any(needle in name for name in _field_values(row, self.fields.get("name", ()))):
+                continue
+            results.append(row)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+
+class InventoryStore:
+    """
+    SQLite persistence for inventory rows, shared by every tenant in one file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS inventory ("
+            " scope TEXT NOT NULL, kind TEXT NOT NULL, id TEXT NOT NULL, row TEXT NOT NULL,"
+            " PRIMARY KEY (scope, kind, id))"
+        )
+        self._db.commit()
+
+    def load(self, scope: str, kind: str) -> List[Dict[str, Any]]:
+        cursor = self._db.execute(
+            "SELECT row FROM inventory WHERE scope = ? AND kind = ?", (scope, kind)
+        )
+        return [json.loads(row) for (row,) in cursor]
+
+    def save(self, scope: str, kind: str, rows: Dict[str, Dict[str, Any]], changed: List[str], removed: List[str]) -> None:
+        if not changed and not removed:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO inventory (scope, kind, id, row) VALUES (?, ?, ?, ?)",
+                [(scope, kind, id, json.dumps(rows[id])) for id in changed],
+            )
+            self._db.executemany(
+                "DELETE FROM inventory WHERE scope = ? AND kind = ? AND id = ?",
+                [(scope, kind, id) for id in removed],
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class Inventory:
+    """
+    Instances, products and images for one tenant.
+    """
+
+    KINDS = ("instances", "products", "images")
+
+    def __init__(
+        self,
+        scope: Optional[str] = None,
+        store: Optional[InventoryStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # The scope names this tenant's rows in a shared store without
+        # writing its API key to disk.
+        self.scope = hashlib.sha256((scope or "").encode()).hexdigest()[:16]
+        self.store = store
+        self._clock = clock
+        self.tables = {
+            "instances": Table(INSTANCE_FIELDS),
+            "products": Table(CATALOG_FIELDS),
+            "images": Table(CATALOG_FIELDS),
+        }
+        self.synced_at: Optional[float] = None
+        if store is not None:
+            for kind, table in self.tables.items():
+                for row in store.load(self.scope, kind):
+                    table.upsert(row)
+
+    def age(self) -> Optional[float]:
+        """
+        Seconds since the last sync, or None if this process has not synced yet.
+        """
+        return None if self.synced_at is None else self._clock() - self.synced_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        age = self.age()
+        return age is not None and age < ttl
+
+    def mark_stale(self) -> None:
+        self.synced_at = None
+
+    def apply(
+        self,
+        kind: str,
+        rows: Iterable[Dict[str, Any]],
+        deleted_ids: Iterable[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Sync one table to an upstream listing, dropping any ``deleted_ids`` too.
+        """
+        table = self.tables[kind]
+        changed, removed = table.sync(rows)
+        for id in deleted_ids:
+            if table.remove(str(id)):
+                removed.append(str(id))
+        changed = [id for id in changed if id in table.rows]
+        if self.store is not None:
+            self.store.save(self.scope, kind, table.rows, changed, removed)
+        return {"changed": len(changed), "removed": len(removed), "total": len(table)}
+
+    def query(
+        self,
+        kind: str,
+        filters: Dict[str, Optional[str]],
+        name_contains: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query one table; an instance ``product`` filter also matches product names.
+        """
+        product = filters.get("product")
+        if kind == "instances" and product is not None:
+            # Instance listings usually carry only the opaque product ID.
+            named = self.tables["products"].query({"name": product})
+            filters = dict(filters, product=[product, *(str(row["id"]) for row in named)])
+        return self.tables[kind].query(filters, name_contains, limit)
+
+    def finish_sync(self) -> None:
+        self.synced_at = self._clock()
@@ -1,19 +1,92 @@
+import os
+
 import click
-from tools import mcp
+import uvicorn
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from src import metrics
+from src.tools import mcp
 from src.config import settings
 
+NETWORK_TRANSPORTS = ("sse", "streamable-http")
+
+
+@mcp.custom_route(settings.NEBULA_BLOCK_METRICS_PATH, methods=["GET"], include_in_schema=False)
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint for the network transports.
+    """
+    if not metrics.enabled:
+        return PlainTextResponse("Metrics are disabled; set NEBULA_BLOCK_METRICS_ENABLED=true.\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def create_app():
+    """
+    Build the ASGI app for the configured network transport.
+
+    Used as a uvicorn factory so every worker process builds its own app.
+    Streamable HTTP runs stateless so any worker can answer any request,
+    which rules out resource subscriptions and server notifications.
+    """
+    transport = settings.NEBULA_BLOCK_TRANSPORT
+    if transport == "streamable-http":
+        mcp.settings.stateless_http = settings.NEBULA_BLOCK_WORKERS > 1
+    return mcp.http_app(transport=transport)
+
+
 @click.command()
 @click.option("--api-key", type=str, help="API key for NebulaBlock")
-def main(api_key):
+@click.option(
+    "--transport",
+    type=click.Choice(("stdio",) + NETWORK_TRANSPORTS),
+    default=settings.NEBULA_BLOCK_TRANSPORT,
+    show_default=True,
+    help="MCP transport to serve",
+)
+@click.option("--host", type=str, default=settings.NEBULA_BLOCK_HOST, show_default=True, help="Bind address for network transports")
+@click.option("--port", type=int, default=settings.NEBULA_BLOCK_PORT, show_default=True, help="Port for network transports")
+@click.option("--workers", type=click.IntRange(min=1), default=settings.NEBULA_BLOCK_WORKERS, show_default=True, help="Worker processes for network transports")
+def main(api_key, transport, host, port, workers):
     """
     NebulaBlock MCP Server
     """
     if api_key:
         settings.NEBULA_BLOCK_API_KEY = api_key
+        # Worker processes build their own Settings from the environment.
+        os.environ["NEBULA_BLOCK_API_KEY"] = api_key
         print("NEBULA_BLOCK_API_KEY updated from command line argument.")
 
-    # mcp.run(transport="sse", host="192.168.2.98", port=8000)
-    mcp.run()
+    if transport == "stdio":
+        mcp.run()
+        return
+
+    if transport == "sse" and workers > 1:
+        raise click.BadParameter(
+            "SSE sessions are bound to one process; use --transport streamable-http for multiple workers.",
+            param_hint="--workers",
+        )
+
+    if transport == "streamable-http" and workers > 1:
+        click.echo(
+            "Running stateless with multiple workers: resources/subscribe is disabled and "
+            "wait_for_instance_status sends no progress or resource-updated notifications.",
+            err=True,
+        )
+
+    settings.NEBULA_BLOCK_TRANSPORT = transport
+    settings.NEBULA_BLOCK_WORKERS = workers
+    os.environ["NEBULA_BLOCK_TRANSPORT"] = transport
+    os.environ["NEBULA_BLOCK_WORKERS"] = str(workers)
+    uvicorn.run(
+        "src.main:create_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        lifespan="on",
+        timeout_graceful_shutdown=0,
+    )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,211 @@
+"""
+Prometheus metrics for tool calls and upstream requests.
+
+Metrics are kept in-process and rendered in the Prometheus text format by
+the ``/metrics`` route of the network transports. Recording is skipped
+entirely unless ``NEBULA_BLOCK_METRICS_ENABLED`` is set, so call sites guard
+on ``metrics.enabled`` before doing any work.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Labels = Tuple[str, ...]
+
+enabled = settings.NEBULA_BLOCK_METRICS_ENABLED
+
+_STATIC_SEGMENT = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Collapse IDs in ``endpoint`` so that labels stay low-cardinality.
+
+    ``computing/instance/8f3a/start`` becomes ``computing/instance/{id}/start``.
+    """
+    return "/".join(
+        part if _STATIC_SEGMENT.fullmatch(part) else "{id}" for part in endpoint.strip("/").split("/")
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterable[str]:
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+            suffix = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {_format_value(total[0])}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Gauge(_Metric):
+    """
+    A gauge whose samples are collected from a callback at render time.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, description, labelnames)
+        self._collect: Optional[Callable[[], Iterable[Tuple[Labels, float]]]] = None
+
+    def set_function(self, collect: Callable[[], Iterable[Tuple[Labels, float]]]) -> None:
+        self._collect = collect
+
+    def samples(self) -> Iterable[str]:
+        if self._collect is None:
+            return
+        for labels, value in self._collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def clear(self) -> None:
+        pass
+
+
+tool_duration = Histogram(
+    "nebula_block_tool_duration_seconds", "MCP tool call latency.", ("tool", "status")
+)
+upstream_duration = Histogram(
+    "nebula_block_upstream_duration_seconds",
+    "NebulaBlock API request latency, including retries.",
+    ("method", "endpoint", "status"),
+)
+upstream_response_bytes = Histogram(
+    "nebula_block_upstream_response_bytes",
+    "NebulaBlock API response body size.",
+    ("method", "endpoint"),
+    buckets=SIZE_BUCKETS,
+)
+upstream_retries = Counter(
+    "nebula_block_upstream_retries_total", "NebulaBlock API requests retried.", ("method", "endpoint")
+)
+cache_requests = Counter(
+    "nebula_block_cache_requests_total",
+    "Response cache lookups by result (hit, stale, miss or revalidated).",
+    ("endpoint", "result"),
+)
+pool_connections = Gauge(
+    "nebula_block_pool_connections", "Upstream HTTP connections by state.", ("state",)
+)
+
+REGISTRY = (tool_duration, upstream_duration, upstream_response_bytes, upstream_retries, cache_requests, pool_connections)
+
+
+def record_upstream(
+    method: str, endpoint: str, status: str, seconds: float, retries: int, size: Optional[int]
+) -> None:
+    label = endpoint_label(endpoint)
+    upstream_duration.observe(seconds, method, label, status)
+    if retries:
+        upstream_retries.inc(method, label, amount=retries)
+    if size is not None:
+        upstream_response_bytes.observe(size, method, label)
+
+
+def record_cache(endpoint: str, result: str) -> None:
+    cache_requests.inc(endpoint_label(endpoint), result)
+
+
+def render() -> str:
+    """
+    Return all metrics in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    for metric in REGISTRY:
+        metric.clear()
@@ -0,0 +1,107 @@
+"""
+Compact account summary joined from several upstream listings.
+
+Agents typically read the credit balance, instances, SSH keys, products and
+OS images before doing anything else. ``build_overview`` joins those
+payloads into one small document: instances are annotated with the name and
+price of their product, and catalog entries keep only the fields needed to
+pick them.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.pagination import extract_records
+from src.serialization import decode
+
+SECTIONS = ("credits", "instances", "ssh_keys", "products", "images")
+
+# Upstream keys to read each summary field from, first present wins.
+INSTANCE_KEYS = {
+    "id": ("id",),
+    "name": ("instance_name", "host_name", "name"),
+    "status": ("status",),
+    "region": ("region",),
+    "product_id": ("product_id", "product"),
+}
+PRODUCT_KEYS = {
+    "id": ("id", "product_id"),
+    "name": ("name", "product_name"),
+    "region": ("region",),
+    "price": ("price", "price_per_hour", "hourly_price"),
+}
+IMAGE_KEYS = {
+    "id": ("id",),
+    "name": ("name", "image_name"),
+    "version": ("version",),
+}
+SSH_KEY_KEYS = {
+    "id": ("id",),
+    "name": ("key_name", "name"),
+}
+
+
+def _pick(record: Dict[str, Any], keys: Dict[str, Tuple[str, ...]]) -> Dict[str, Any]:
+    picked = {}
+    for field, candidates in keys.items():
+        for key in candidates:
+            if record.get(key) is not None:
+                picked[field] = record[key]
+                break
+    return picked
+
+
+def _records(payload: Any) -> List[Dict[str, Any]]:
+    try:
+        records = extract_records(decode(payload))
+    except ValueError:
+        return []
+    return [record for record in records if isinstance(record, dict)]
+
+
+def _price(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_overview(payloads: Dict[str, Any], errors: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Join the upstream ``payloads`` (keyed by section) into an account summary.
+
+    Sections that failed are listed in ``errors`` and left out of the summary.
+    """
+    products = [_pick(record, PRODUCT_KEYS) for record in _records(payloads.get("products"))]
+    by_id = {str(product["id"]): product for product in products if "id" in product}
+
+    instances = []
+    hourly_cost = 0.0
+    for record in _records(payloads.get("instances")):
+        instance = _pick(record, INSTANCE_KEYS)
+        product = by_id.get(str(instance.get("product_id")))
+        if product is not None:
+            instance["product"] = {key: product[key] for key in ("name", "price") if key in product}
+            price = _price(product.get("price"))
+            if price is not None and str(instance.get("status", "")).lower() == "running":
+                hourly_cost += price
+        instances.append(instance)
+
+    overview: Dict[str, Any] = {}
+    if "credits" in payloads:
+        overview["credits"] = decode(payloads["credits"])
+    if "instances" in payloads:
+        overview["instances"] = {
+            "count": len(instances),
+            "by_status": dict(Counter(str(instance.get("status")) for instance in instances)),
+            "running_hourly_cost": round(hourly_cost, 6),
+            "data": instances,
+        }
+    if "ssh_keys" in payloads:
+        overview["ssh_keys"] = [_pick(record, SSH_KEY_KEYS) for record in _records(payloads["ssh_keys"])]
+    if "products" in payloads:
+        overview["products"] = products
+    if "images" in payloads:
+        overview["images"] = [_pick(record, IMAGE_KEYS) for record in _records(payloads["images"])]
+    overview["errors"] = errors
+    return overview
@@ -0,0 +1,78 @@
+"""
+Auto-pagination over the NebulaBlock ``limit``/``offset`` list endpoints.
+
+Pages are fetched concurrently inside a bounded prefetch window and records
+are streamed out in order, so at most ``prefetch`` pages are held in memory.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List
+
+FetchPage = Callable[[int, int], Awaitable[Any]]
+
+
+def extract_records(payload: Any) -> List[Any]:
+    """
+    Return the list of records in a page payload.
+
+    List endpoints answer either with a bare JSON array or with an object
+    holding the array under ``data``.
+    """
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict) and isinstance(payload.get("data"), list):
+        return payload["data"]
+    raise ValueError(f"Unrecognised page payload: expected a list or an object with 'data', got {type(payload).__name__}")
+
+
+async def iter_pages(
+    fetch_page: FetchPage,
+    page_size: int,
+    prefetch: int = 1,
+    start_offset: int = 0,
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield pages of records in order until a short or empty page is returned.
+
+    Up to ``prefetch`` pages are requested ahead of the consumer. Speculative
+    requests past the last page are cancelled as soon as the end is seen.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    prefetch = max(prefetch, 1)
+    pending: Deque[asyncio.Future] = deque()
+    next_offset = start_offset
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < prefetch:
+                pending.append(asyncio.ensure_future(fetch_page(next_offset, page_size)))
+                next_offset += page_size
+            if not pending:
+                return
+            records = extract_records(await pending.popleft())
+            if len(records) < page_size:
+                exhausted = True
+                for future in pending:
+                    future.cancel()
+                pending.clear()
+            if records:
+                yield records
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def iter_records(
+    fetch_page: FetchPage,
+    page_size: int,
+    prefetch: int = 1,
+    start_offset: int = 0,
+) -> AsyncIterator[Any]:
+    """
+    Yield individual records across all pages; see ``iter_pages``.
+    """
+    async for page in iter_pages(fetch_page, page_size, prefetch, start_offset):
+        for record in page:
+            yield record
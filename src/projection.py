@@ -0,0 +1,99 @@
+"""
+Field projection and filtering for list payloads.
+
+Tools can ask for only the fields they need (``fields``, dotted paths such as
+``"billing.amount"``) and only the records they care about (``match``,
+dotted path to expected value). Records are shaped as soon as the payload is
+decoded, so only the reduced structure is serialized and sent to the client.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from src.serialization import decode
+
+Fields = Union[str, Sequence[str], None]
+
+_MISSING = object()
+
+
+def parse_fields(fields: Fields) -> Optional[List[List[str]]]:
+    """
+    Turn ``"id,status"`` or ``["id", "billing.amount"]`` into split dotted paths.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    paths = [field.strip().split(".") for field in fields if field and field.strip()]
+    return paths or None
+
+
+def _get(value: Any, path: Sequence[str]) -> Any:
+    for part in path:
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _project(value: Any, paths: List[List[str]]) -> Any:
+    if isinstance(value, list):
+        return [_project(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+    children: Dict[str, List[List[str]]] = {}
+    for path in paths:
+        children.setdefault(path[0], []).append(path[1:])
+    result = {}
+    for key, rests in children.items():
+        if key not in value:
+            continue
+        if any(not rest for rest in rests):
+            result[key] = value[key]
+        else:
+            result[key] = _project(value[key], rests)
+    return result
+
+
+def matches(record: Any, match: Optional[Dict[str, Any]]) -> bool:
+    """
+    Return True if every dotted path in ``match`` equals its value (compared as strings, case-insensitive).
+    """
+    if not match:
+        return True
+    for path, expected in match.items():
+        actual = _get(record, path.split("."))
+        if actual is _MISSING or str(actual).lower() != str(expected).lower():
+            return False
+    return True
+
+
+def shape(payload: Any, fields: Fields = None, match: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Filter and project the records of ``payload``, keeping its envelope.
+
+    Lists and ``{"data": [...]}`` objects are treated as record lists; any
+    other object is projected as a single record. ``RawJSON`` payloads are
+    only decoded when there is something to apply.
+    """
+    paths = parse_fields(fields)
+    if paths is None and not match:
+        return payload
+    payload = decode(payload)
+
+    def _records(records: List[Any]) -> List[Any]:
+        kept = (record for record in records if matches(record, match))
+        return [_project(record, paths) for record in kept] if paths else list(kept)
+
+    if isinstance(payload, list):
+        return _records(payload)
+    if isinstance(payload, dict) and isinstance(payload.get("data"), list):
+        return dict(payload, data=_records(payload["data"]))
+    if isinstance(payload, dict):
+        if not matches(payload, match):
+            return None
+        return _project(payload, paths) if paths else payload
+    return payload
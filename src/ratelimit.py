@@ -0,0 +1,149 @@
+"""
+Client-side rate limiting and concurrency control, per API key.
+
+Each tenant (API key) gets a ``Governor`` that combines a token bucket
+(requests per second with a burst allowance) and a cap on in-flight
+requests. Waiting requests are admitted by priority, so interactive reads
+are not stuck behind a queue of bulk lifecycle operations.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """
+    Admission priority; lower values are admitted first.
+    """
+
+    READ = 0
+    WRITE = 1
+    BULK = 2
+
+
+# Overrides the method-based default priority for requests sent from the
+# current context, e.g. everything issued by a bulk tool.
+request_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar(
+    "request_priority", default=None
+)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``burst``.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def wait_time(self) -> float:
+        """
+        Return the seconds until a token can be taken (0 if one is available now).
+        """
+        now = self._refill()
+        wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        return max(wait, self._paused_until - now)
+
+    def take(self) -> None:
+        self._refill()
+        self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for ``seconds``, e.g. after upstream answered 429.
+        """
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class Governor:
+    """
+    Priority admission under a token bucket and a concurrency limit.
+    """
+
+    def __init__(self, rate: float, burst: int, concurrency: int) -> None:
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.concurrency = max(concurrency, 1)
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def pending(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.active >= self.concurrency:
+                return
+            if self.bucket is not None:
+                wait = self.bucket.wait_time()
+                if wait > 0:
+                    self._schedule(wait)
+                    return
+                self.bucket.take()
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and self._timer_loop is loop and not self._timer.cancelled():
+            return
+        self._timer = loop.call_later(delay, self._dispatch)
+        self._timer_loop = loop
+
+    async def acquire(self, priority: int = Priority.READ) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+                self._dispatch()
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    def throttle(self, seconds: float) -> None:
+        """
+        Hold back every request for this key after upstream rate-limited one.
+        """
+        if self.bucket is not None and seconds > 0:
+            self.bucket.pause(seconds)
+
+    @asynccontextmanager
+    async def admit(self, priority: int = Priority.READ) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,107 @@
+"""
+Prebuilt tool and resource-template metadata.
+
+Registering a FastMCP tool or resource template generates a pydantic
+validator and JSON schema for the function's signature, which dominates the
+import time of ``src.tools`` and so delays the MCP handshake of every new
+stdio server. ``registry.json`` stores those schemas, keyed by a fingerprint
+of each function's signature and docstring. Functions that still match are
+registered straight from it and their validators are built on first call;
+anything else falls back to FastMCP's normal path.
+
+Regenerate the file after changing a tool's signature or docstring:
+
+    python -m src.registry
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+MANIFEST_PATH = Path(__file__).with_name("registry.json")
+
+_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def fingerprint(fn: Callable[..., Any]) -> str:
+    """
+    Hash what the generated schema depends on: the function's signature and docstring.
+    """
+    source = f"{fn.__module__}.{fn.__qualname__}{inspect.signature(fn)}\n{fn.__doc__ or ''}"
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def _load() -> Dict[str, Dict[str, Any]]:
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH) as handle:
+                _manifest = json.load(handle)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def cached_parameters(kind: str, key: str, fn: Callable[..., Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored parameter schema for ``key`` if it was built from this exact ``fn``.
+    """
+    entry = _load().get(kind, {}).get(key)
+    if entry is None or entry["fingerprint"] != fingerprint(fn):
+        return None
+    return entry["parameters"]
+
+
+def lazy_validate_call(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Like ``pydantic.validate_call`` but builds the validator on the first call.
+    """
+    validated = None
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal validated
+        if validated is None:
+            from pydantic import validate_call
+
+            validated = validate_call(fn)
+        return validated(*args, **kwargs)
+
+    return wrapper
+
+
+def build(server) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate the manifest for every tool and resource template of ``server``.
+    """
+    from fastmcp.resources import ResourceTemplate
+    from fastmcp.tools import Tool
+
+    tools = {}
+    for name, tool in sorted(server._tool_manager.get_tools().items()):
+        fn = inspect.unwrap(tool.fn)
+        fresh = Tool.from_function(fn, name=name)
+        tools[name] = {"fingerprint": fingerprint(fn), "parameters": fresh.parameters}
+    templates = {}
+    for uri, template in sorted(server._resource_manager.get_templates().items()):
+        fn = inspect.unwrap(template.fn)
+        fresh = ResourceTemplate.from_function(fn, uri_template=uri)
+        templates[uri] = {"fingerprint": fingerprint(fn), "parameters": fresh.parameters}
+    return {"tools": tools, "templates": templates}
+
+
+def main() -> None:
+    from src.tools import mcp
+
+    manifest = build(mcp)
+    with open(MANIFEST_PATH, "w") as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+        handle.write("\n")
+    print(f"Wrote {len(manifest['tools'])} tools and {len(manifest['templates'])} templates to {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Timeouts, retries and circuit breaking for upstream NebulaBlock calls.
+
+Idempotent requests are retried on transport errors and on the statuses in
+``Settings.NEBULA_BLOCK_RETRY_STATUSES`` with exponential backoff and full
+jitter, honouring ``Retry-After``. A circuit breaker fails fast while the
+upstream keeps returning server errors; each tenant has its own (see
+``src.tenancy``), so one API key's failures never block another's calls.
+"""
+
+import asyncio
+import email.utils
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from src.config import settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling upstream while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast. Once ``reset_timeout`` has passed a single trial
+    request is let through; its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def before_request(self) -> bool:
+        """
+        Admit a request, or raise ``CircuitOpenError``; returns whether it is the trial request.
+        """
+        if self.state == self.CLOSED:
+            return False
+        if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            return True
+        raise CircuitOpenError(
+            "NebulaBlock API circuit is open after repeated failures; "
+            f"retrying in at most {self.reset_timeout:g}s"
+        )
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def release_trial(self) -> None:
+        """
+        Give up a trial request that ended without an outcome (e.g. it was cancelled).
+
+        The circuit goes back to open with its reset timeout already elapsed,
+        so the next request becomes the new trial.
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+
+def timeout_for(endpoint: str) -> Optional[httpx.Timeout]:
+    """
+    Return a per-endpoint timeout override, or None to use the client default.
+
+    The longest matching prefix in ``NEBULA_BLOCK_ENDPOINT_TIMEOUTS`` wins.
+    """
+    overrides = settings.NEBULA_BLOCK_ENDPOINT_TIMEOUTS
+    matches = [prefix for prefix in overrides if endpoint == prefix or endpoint.startswith(prefix + "/")]
+    if not matches:
+        return None
+    override = overrides[max(matches, key=len)]
+    return httpx.Timeout(
+        override.get("read", settings.NEBULA_BLOCK_READ_TIMEOUT),
+        connect=override.get("connect", settings.NEBULA_BLOCK_CONNECT_TIMEOUT),
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Return a full-jitter exponential backoff delay for retry number ``attempt`` (0-based).
+    """
+    ceiling = min(settings.NEBULA_BLOCK_RETRY_MAX_BACKOFF, settings.NEBULA_BLOCK_RETRY_BACKOFF * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header given either in seconds or as an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def _is_idempotent(method: str, idempotent: Optional[bool]) -> bool:
+    return method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+
+
+def _can_retry_error(exc: httpx.TransportError, method: str, idempotent: Optional[bool] = None) -> bool:
+    # A connect failure means the request never reached upstream, so even
+    # non-idempotent methods are safe to send again.
+    return _is_idempotent(method, idempotent) or isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def _can_retry_status(status: int, method: str, idempotent: Optional[bool] = None) -> bool:
+    if status not in settings.NEBULA_BLOCK_RETRY_STATUSES:
+        return False
+    # 429 means the request was rejected before it was processed.
+    return status == 429 or _is_idempotent(method, idempotent)
+
+
+async def send_with_retries(
+    send: Callable[[], Awaitable[httpx.Response]],
+    method: str,
+    circuit_breaker: CircuitBreaker,
+    idempotent: Optional[bool] = None,
+) -> httpx.Response:
+    """
+    Call ``send()`` under the retry policy and ``circuit_breaker``.
+
+    ``idempotent`` overrides whether the request may be repeated, which
+    otherwise follows the HTTP method. The final response is returned even
+    if it is an error; callers still decide how to surface it.
+    """
+    retries = max(settings.NEBULA_BLOCK_RETRIES, 0)
+    attempt = 0
+    while True:
+        trial = circuit_breaker.before_request()
+        try:
+            response = await send()
+        except httpx.TransportError as exc:
+            circuit_breaker.record_failure()
+            if attempt >= retries or not _can_retry_error(exc, method, idempotent):
+                raise
+            delay = backoff_delay(attempt)
+        except BaseException:
+            # Cancelled or failed without an upstream outcome: free the trial slot.
+            if trial:
+                circuit_breaker.release_trial()
+            raise
+        else:
+            status = response.status_code
+            if status >= 500:
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+            if attempt >= retries or not _can_retry_status(status, method, idempotent):
+                return response
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            elif delay > settings.NEBULA_BLOCK_RETRY_MAX_BACKOFF:
+                return response
+        attempt += 1
+        await asyncio.sleep(delay)
+
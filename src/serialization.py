@@ -0,0 +1,92 @@
+"""
+JSON encoding and decoding for upstream responses and tool results.
+
+``loads``/``dumps`` use orjson when it is installed and the stdlib ``json``
+module otherwise (``NEBULA_BLOCK_JSON_BACKEND`` forces one or the other).
+Responses that the server returns unchanged can skip the decode/re-encode
+round trip entirely as ``RawJSON``.
+"""
+
+import json
+from typing import Any, Union
+
+from pydantic import BaseModel
+
+from src.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _backend() -> str:
+    requested = settings.NEBULA_BLOCK_JSON_BACKEND
+    if requested == "orjson" and orjson is None:
+        raise RuntimeError("NEBULA_BLOCK_JSON_BACKEND=orjson but orjson is not installed")
+    if requested == "auto":
+        return "orjson" if orjson is not None else "json"
+    return requested
+
+
+backend = _backend()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Decode a JSON document straight from the response bytes.
+    """
+    if backend == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """
+    Encode ``value`` as compact JSON text. Used as the FastMCP tool serializer.
+    """
+    if isinstance(value, str):
+        return value
+    if backend == "orjson":
+        return orjson.dumps(value, default=_default).decode()
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+class RawJSON(str):
+    """
+    Upstream JSON text handed to the client as-is.
+
+    FastMCP passes ``str`` results through untouched, so returning the body
+    this way avoids decoding it only to encode it again. ``data()`` decodes
+    it when a caller does need the structure.
+    """
+
+    __slots__ = ()
+
+    def data(self) -> Any:
+        return loads(str(self))
+
+
+def decode(value: Any) -> Any:
+    """
+    Return the decoded structure for ``value``, which may be ``RawJSON``.
+    """
+    return value.data() if isinstance(value, RawJSON) else value
+
+
+def read_json(response, raw: bool = False) -> Any:
+    """
+    Decode an ``httpx.Response`` body, or wrap it as ``RawJSON`` when ``raw`` is set.
+    """
+    body = response.content
+    if raw:
+        return RawJSON(body.decode(response.encoding or "utf-8"))
+    return loads(body)
@@ -0,0 +1,115 @@
+"""
+The FastMCP server class used by ``src.tools``.
+
+Adds tool-call metrics and tracing around dispatch, registers tools and
+resource templates from the prebuilt registry (see ``src.registry``) so the
+server can answer the MCP handshake without building every validator first,
+and serves ``resources/subscribe`` from shared pollers (see
+``src.subscriptions``).
+"""
+
+import time
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import NotFoundError, ResourceError
+from fastmcp.resources import ResourceTemplate
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.tools import Tool
+
+from src import metrics, registry, tracing
+from src.config import settings
+from src.subscriptions import Subscriptions
+from src.tenancy import request_api_key
+
+
+class NebulaBlockMCP(FastMCP):
+    """
+    FastMCP with prebuilt registry metadata, tool-call metrics and tracing,
+    and resource subscriptions.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.subscriptions = Subscriptions(
+            self._resource_manager.read_resource,
+            min_interval=settings.NEBULA_BLOCK_SUBSCRIPTION_MIN_INTERVAL,
+            max_interval=settings.NEBULA_BLOCK_SUBSCRIPTION_MAX_INTERVAL,
+        )
+
+    def _setup_handlers(self) -> None:
+        super()._setup_handlers()
+        self._mcp_server.subscribe_resource()(self._mcp_subscribe_resource)
+        self._mcp_server.unsubscribe_resource()(self._mcp_unsubscribe_resource)
+        get_capabilities = self._mcp_server.get_capabilities
+
+        def _get_capabilities(*args, **kwargs):
+            # The low-level server always advertises subscribe=False. Stateless
+            # sessions end with their request, so they cannot hold a subscription.
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = not self.settings.stateless_http
+            return capabilities
+
+        self._mcp_server.get_capabilities = _get_capabilities
+
+    async def _mcp_subscribe_resource(self, uri) -> None:
+        uri = str(uri)
+        if self.settings.stateless_http:
+            raise ResourceError("Resource subscriptions need a stateful session; run with a single worker.")
+        if not self._resource_manager.has_resource(uri):
+            raise NotFoundError(f"Unknown resource: {uri}")
+        session = self._mcp_server.request_context.session
+        self.subscriptions.subscribe(uri, session, scope=request_api_key())
+
+    async def _mcp_unsubscribe_resource(self, uri) -> None:
+        session = self._mcp_server.request_context.session
+        self.subscriptions.unsubscribe(str(uri), session, scope=request_api_key())
+
+    def add_tool(self, fn, name=None, description=None, tags=None, annotations=None) -> None:
+        name = name or fn.__name__
+        parameters = registry.cached_parameters("tools", name, fn) if settings.NEBULA_BLOCK_PREBUILT_REGISTRY else None
+        if parameters is None or annotations is not None:
+            return super().add_tool(fn, name=name, description=description, tags=tags, annotations=annotations)
+        # The argument validator is built by FastMCP on the first call.
+        tool = Tool(
+            fn=fn,
+            name=name,
+            description=description or fn.__doc__ or "",
+            parameters=parameters,
+            tags=tags or set(),
+            serializer=self._tool_manager._serializer,
+        )
+        self._tool_manager.add_tool(tool)
+        self._cache.clear()
+
+    def add_resource_fn(self, fn, uri, name=None, description=None, mime_type=None, tags=None) -> None:
+        parameters = None
+        if "{" in uri and settings.NEBULA_BLOCK_PREBUILT_REGISTRY:
+            parameters = registry.cached_parameters("templates", uri, fn)
+        if parameters is None:
+            return super().add_resource_fn(fn, uri, name=name, description=description, mime_type=mime_type, tags=tags)
+        template = ResourceTemplate(
+            uri_template=uri,
+            name=name or fn.__name__,
+            description=description or fn.__doc__ or "",
+            mime_type=mime_type or "text/plain",
+            fn=registry.lazy_validate_call(fn),
+            parameters=parameters,
+            tags=tags or set(),
+        )
+        self._resource_manager.add_template(template)
+        self._cache.clear()
+
+    async def _mcp_call_tool(self, key: str, arguments: dict):
+        if not (metrics.enabled or tracing.enabled):
+            return await super()._mcp_call_tool(key, arguments)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            with tracing.span(f"tool {key}", "server", {"mcp.tool": key}, carrier=get_http_headers()):
+                result = await super()._mcp_call_tool(key, arguments)
+            status = "ok"
+            return result
+        finally:
+            if metrics.enabled:
+                metrics.tool_duration.observe(time.perf_counter() - started, key, status)
@@ -0,0 +1,151 @@
+"""
+Resource subscriptions driven by shared background pollers.
+
+One poller runs per subscribed resource (and API key) however many sessions
+subscribe to it. Each poll hashes the resource contents and only a changed
+digest sends ``notifications/resources/updated`` to the subscribers. The
+poll interval shrinks as more sessions subscribe and as the resource turns
+out to change often, and grows back while it stays the same.
+
+Sessions are held weakly: once a client disconnects its session is released
+and drops out of every poller, and a poller left without sessions stops.
+Sessions whose notification fails are dropped as well.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import weakref
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Union
+
+from mcp.server.lowlevel.server import request_ctx
+from pydantic import AnyUrl
+
+from src.batch import outside_batch
+
+ReadResource = Callable[[str], Awaitable[Union[str, bytes]]]
+
+logger = logging.getLogger(__name__)
+
+
+def digest(content: Union[str, bytes]) -> bytes:
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class _Poller:
+    def __init__(self, key: Hashable, uri: str) -> None:
+        self.key = key
+        self.uri = uri
+        self.sessions: weakref.WeakSet = weakref.WeakSet()
+        self.digest: Optional[bytes] = None
+        self.volatility = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+
+class Subscriptions:
+    """
+    Poll subscribed resources and notify sessions when their contents change.
+    """
+
+    def __init__(
+        self,
+        read: ReadResource,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        smoothing: float = 0.3,
+        jitter: float = 0.2,
+    ) -> None:
+        self._read = read
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.jitter = jitter
+        self._pollers: Dict[Hashable, _Poller] = {}
+
+    def active(self) -> int:
+        """
+        Return the number of resources currently being polled.
+        """
+        return len(self._pollers)
+
+    def subscribers(self, uri: str, scope: Hashable = None) -> int:
+        poller = self._pollers.get((scope, uri))
+        return 0 if poller is None else len(poller.sessions)
+
+    def subscribe(self, uri: str, session, scope: Hashable = None) -> None:
+        """
+        Notify ``session`` whenever ``uri`` changes. Pollers are shared within ``scope``.
+        """
+        key = (scope, uri)
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = self._pollers[key] = _Poller(key, uri)
+        poller.sessions.add(session)
+        if poller.task is None or poller.task.done():
+            context = outside_batch()
+            # The subscribe request's context holds the session; a poller
+            # keeping it would keep a disconnected session alive.
+            context.run(request_ctx.set, None)
+            poller.task = asyncio.create_task(self._run(poller), context=context)
+
+    def unsubscribe(self, uri: str, session, scope: Hashable = None) -> None:
+        poller = self._pollers.get((scope, uri))
+        if poller is not None:
+            poller.sessions.discard(session)
+            self._release(poller)
+
+    def close(self) -> None:
+        for poller in list(self._pollers.values()):
+            poller.sessions.clear()
+            self._release(poller)
+
+    def _release(self, poller: _Poller) -> None:
+        if poller.sessions:
+            return
+        if poller.task is not None and not poller.task.done() and poller.task is not asyncio.current_task():
+            poller.task.cancel()
+        if self._pollers.get(poller.key) is poller:
+            del self._pollers[poller.key]
+
+    def interval(self, volatility: float, subscribers: int) -> float:
+        """
+        Seconds until the next poll of a resource.
+
+        Fully volatile resources are polled every ``min_interval``, stable
+        ones every ``max_interval``; four times as many subscribers halve the
+        wait, down to ``min_interval``.
+        """
+        interval = self.max_interval - (self.max_interval - self.min_interval) * volatility
+        interval /= math.sqrt(max(subscribers, 1))
+        return max(interval, self.min_interval)
+
+    async def _notify(self, poller: _Poller) -> None:
+        uri = AnyUrl(poller.uri)
+        for session in list(poller.sessions):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as exc:
+                logger.info("Dropping subscriber of %s: %s", poller.uri, exc)
+                poller.sessions.discard(session)
+
+    async def _run(self, poller: _Poller) -> None:
+        while poller.sessions:
+            try:
+                current = digest(await self._read(poller.uri))
+            except Exception as exc:
+                logger.warning("Polling %s failed: %s", poller.uri, exc)
+                current = poller.digest
+            changed = poller.digest is not None and current != poller.digest
+            poller.digest = current
+            poller.volatility += self.smoothing * ((1.0 if changed else 0.0) - poller.volatility)
+            if changed:
+                await self._notify(poller)
+            if not poller.sessions:
+                break
+            interval = self.interval(poller.volatility, len(poller.sessions))
+            await asyncio.sleep(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+        self._release(poller)
@@ -0,0 +1,200 @@
+"""
+Per-tenant state for serving many NebulaBlock accounts from one process.
+
+The API key for a call comes from the HTTP request that opened the MCP
+session (``X-NebulaBlock-Api-Key`` or ``Authorization: Bearer``), falling
+back to ``Settings.NEBULA_BLOCK_API_KEY``. Every key gets its own connection
+pool, response cache, in-flight coalescer, rate-limit governor and circuit
+breaker, so one tenant can never see another's responses or trip its circuit. Tenants are kept in LRU order and
+idle ones are evicted to keep memory bounded.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional
+
+from fastmcp.server.dependencies import get_http_headers
+
+from src import metrics
+from src.analytics import Ledger
+from src.batch import forget_batch_reads
+from src.cache import TTLCache
+from src.client import PooledClient
+from src.coalesce import Coalescer
+from src.config import settings
+from src.disk_cache import DiskCache
+from src.inventory import Inventory, InventoryStore
+from src.ratelimit import Governor
+from src.resilience import CircuitBreaker
+
+API_KEY_HEADER = "x-nebulablock-api-key"
+
+_inventory_store: Optional[InventoryStore] = None
+_disk_cache: Optional[DiskCache] = None
+
+
+def _shared_inventory_store() -> Optional[InventoryStore]:
+    global _inventory_store
+    if settings.NEBULA_BLOCK_INVENTORY_DB and _inventory_store is None:
+        _inventory_store = InventoryStore(settings.NEBULA_BLOCK_INVENTORY_DB)
+    return _inventory_store
+
+
+def _shared_disk_cache() -> Optional[DiskCache]:
+    global _disk_cache
+    directory = settings.NEBULA_BLOCK_CACHE_DIR
+    if not directory:
+        return None
+    if _disk_cache is None or _disk_cache.directory != directory:
+        _disk_cache = DiskCache(directory)
+    return _disk_cache
+
+
+class Tenant:
+    """
+    Isolated request-layer state for one API key.
+    """
+
+    def __init__(self, api_key: Optional[str]) -> None:
+        self.api_key = api_key
+        # Names this tenant's rows in shared on-disk state without storing the key.
+        self.scope = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        self.client = PooledClient()
+        self.cache = TTLCache(settings.NEBULA_BLOCK_CACHE_MAX_ENTRIES)
+        self.disk_cache = _shared_disk_cache()
+        # ETag/Last-Modified of recent responses, for conditional GETs.
+        self.validators = TTLCache(settings.NEBULA_BLOCK_VALIDATOR_MAX_ENTRIES)
+        self.inflight = Coalescer()
+        self.governor = Governor(
+            settings.NEBULA_BLOCK_RATE_LIMIT,
+            settings.NEBULA_BLOCK_RATE_BURST,
+            settings.NEBULA_BLOCK_MAX_CONCURRENCY,
+        )
+        self.breaker = CircuitBreaker(
+            settings.NEBULA_BLOCK_CIRCUIT_FAILURE_THRESHOLD,
+            settings.NEBULA_BLOCK_CIRCUIT_RESET_TIMEOUT,
+        )
+        self.last_used = 0.0
+        self._inventory: Optional[Inventory] = None
+        self.ledgers: Dict[str, Ledger] = {}
+
+    @property
+    def inventory(self) -> Inventory:
+        if self._inventory is None:
+            self._inventory = Inventory(self.api_key, _shared_inventory_store())
+        return self._inventory
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Forget cached state made stale by a write to ``endpoint``.
+        """
+        self.cache.invalidate(endpoint)
+        self.validators.invalidate(endpoint)
+        forget_batch_reads()
+        if self.disk_cache is not None:
+            self.disk_cache.invalidate(self.scope, endpoint)
+        if self._inventory is not None:
+            self._inventory.mark_stale()
+
+    def busy(self) -> bool:
+        return self.governor.active > 0 or self.governor.pending() > 0 or len(self.inflight) > 0
+
+    def close(self) -> None:
+        self.client.close_soon()
+        self.cache.clear()
+        self.validators.clear()
+
+
+class TenantRegistry:
+    """
+    LRU map of API key to ``Tenant`` with idle eviction.
+    """
+
+    def __init__(
+        self,
+        max_tenants: int,
+        idle_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_tenants = max(max_tenants, 1)
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._tenants: "OrderedDict[Optional[str], Tenant]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, api_key: Optional[str]) -> bool:
+        return api_key in self._tenants
+
+    def __iter__(self) -> Iterator[Tenant]:
+        return iter(list(self._tenants.values()))
+
+    def get(self, api_key: Optional[str]) -> Tenant:
+        """
+        Return the tenant for ``api_key``, creating it and evicting idle tenants as needed.
+        """
+        now = self._clock()
+        tenant = self._tenants.get(api_key)
+        if tenant is None:
+            tenant = self._tenants[api_key] = Tenant(api_key)
+        self._tenants.move_to_end(api_key)
+        tenant.last_used = now
+        self._evict(now, keep=tenant)
+        return tenant
+
+    def _evict(self, now: float, keep: Tenant) -> None:
+        for api_key, tenant in list(self._tenants.items()):
+            if tenant is keep:
+                break
+            over_capacity = len(self._tenants) > self.max_tenants
+            idle = now - tenant.last_used >= self.idle_timeout
+            if not (over_capacity or idle):
+                # Entries are in LRU order, so everything after this is newer.
+                break
+            if tenant.busy():
+                continue
+            del self._tenants[api_key]
+            tenant.close()
+
+    def clear(self) -> None:
+        for tenant in self._tenants.values():
+            tenant.close()
+        self._tenants.clear()
+
+
+def request_api_key() -> Optional[str]:
+    """
+    Return the NebulaBlock API key for the current MCP request.
+    """
+    headers = get_http_headers()
+    api_key = headers.get(API_KEY_HEADER)
+    if api_key:
+        return api_key
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token.strip()
+    return settings.NEBULA_BLOCK_API_KEY
+
+
+def current_tenant() -> Tenant:
+    """
+    Return the tenant serving the current MCP request.
+    """
+    return tenants.get(request_api_key())
+
+
+tenants = TenantRegistry(settings.NEBULA_BLOCK_MAX_TENANTS, settings.NEBULA_BLOCK_TENANT_IDLE_TIMEOUT)
+
+
+def _pool_usage():
+    active = idle = 0
+    for tenant in tenants:
+        tenant_active, tenant_idle = tenant.client.connection_counts()
+        active += tenant_active
+        idle += tenant_idle
+    return [(("active",), active), (("idle",), idle)]
+
+
+metrics.pool_connections.set_function(_pool_usage)
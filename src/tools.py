@@ -1,236 +1,704 @@
-from fastmcp import FastMCP
-import requests
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, Dict, List, Literal, Optional
+
+from fastmcp import Context
+from fastmcp.utilities.types import find_kwarg_by_type, get_cached_typeadapter
+from pydantic import AnyUrl
+from src import metrics, tracing
+from src.analytics import DAY, Ledger, parse_balance
+from src.batch import batched_read, run_batch
+from src.bulk import run_bulk
+from src.cache import MISSING, make_key, swr_ttl_for, ttl_for
+from src.conditional import Validated, conditional_headers, validators_of
 from src.config import settings
-
-mcp = FastMCP()
-
-def _make_api_request(endpoint: str, params: dict = None):
-    api_url = settings.NEBULA_BLOCK_API_URL
-    api_key = settings.NEBULA_BLOCK_API_KEY
-    headers = {
+from src.docs import DocsIndex, default_index_path
+from src.endpoints import ENDPOINTS, Endpoint, register_endpoints
+from src.overview import SECTIONS, build_overview
+from src.pagination import extract_records, iter_pages, iter_records
+from src.projection import matches, shape
+from src.ratelimit import Priority, request_priority
+from src.resilience import backoff_delay, retry_after_seconds, send_with_retries, timeout_for
+from src.serialization import decode, dumps, loads, read_json
+from src.server import NebulaBlockMCP
+from src.tenancy import Tenant, current_tenant
+from src.watch import InstanceWatcher, WatchTimeout
+
+mcp = NebulaBlockMCP(tool_serializer=dumps)
+
+def _headers(api_key: Optional[str]) -> dict:
+    return {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
-    response = requests.get(f"{api_url}/api/v1/{endpoint}", headers=headers, params=params)
-    response.raise_for_status()
-    return response.json()
 
 
-def _make_api_put_request(endpoint: str, json_data: dict):
-    api_url = settings.NEBULA_BLOCK_API_URL
-    api_key = settings.NEBULA_BLOCK_API_KEY
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    response = requests.put(f"{api_url}/api/v1/{endpoint}", headers=headers, json=json_data)
-    response.raise_for_status()
-    return response.json()
+async def _send_observed(method: str, endpoint: str, attempt, breaker, idempotent: Optional[bool] = None):
+    """
+    ``send_with_retries`` wrapped in a client span and upstream metrics.
+    """
+    attempts = 0
+
+    async def _counted():
+        nonlocal attempts
+        attempts += 1
+        return await attempt()
+
+    started = time.perf_counter()
+    response = None
+    try:
+        with tracing.span(f"{method} {metrics.endpoint_label(endpoint)}", attributes={"http.method": method}):
+            response = await send_with_retries(_counted, method, breaker, idempotent)
+        return response
+    finally:
+        if metrics.enabled:
+            metrics.record_upstream(
+                method,
+                endpoint,
+                str(response.status_code) if response is not None else "error",
+                time.perf_counter() - started,
+                max(attempts - 1, 0),
+                len(response.content) if response is not None else None,
+            )
+
+
+async def _request(
+    tenant: Tenant,
+    method: str,
+    endpoint: str,
+    extra_headers: dict = None,
+    idempotent: Optional[bool] = None,
+    **kwargs,
+):
+    url = f"{settings.NEBULA_BLOCK_API_URL}/api/v1/{endpoint}"
+    timeout = timeout_for(endpoint)
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    client = tenant.client.get()
+    governor = tenant.governor
+    priority = request_priority.get()
+    if priority is None:
+        priority = Priority.READ if method == "GET" else Priority.WRITE
+
+    async def _attempt():
+        headers = _headers(tenant.api_key)
+        if extra_headers:
+            headers.update(extra_headers)
+        if tracing.enabled:
+            tracing.inject(headers)
+        async with governor.admit(priority):
+            response = await client.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 429:
+            governor.throttle(retry_after_seconds(response) or backoff_delay(0))
+        return response
+
+    if metrics.enabled or tracing.enabled:
+        response = await _send_observed(method, endpoint, _attempt, tenant.breaker, idempotent)
+    else:
+        response = await send_with_retries(_attempt, method, tenant.breaker, idempotent)
+    if response.status_code != 304:
+        response.raise_for_status()
+    if method != "GET":
+        tenant.invalidate(endpoint)
+    return response
+
+
+async def _send(tenant: Tenant, method: str, endpoint: str, raw: bool = False, **kwargs):
+    return read_json(await _request(tenant, method, endpoint, **kwargs), raw)
+
+
+async def _conditional_get(
+    tenant: Tenant, endpoint: str, params: Optional[dict], ttl: Optional[float], raw: bool, generation: int
+):
+    """
+    GET ``endpoint``, revalidating whatever copy the tenant already holds.
 
+    A fresh on-disk entry is served without a request. Otherwise the stored
+    validators are sent and a 304 reuses the held object. Returns the data
+    and how long it stays fresh.
+    """
+    key = make_key(endpoint, params)
+    disk = tenant.disk_cache if ttl is not None else None
+    entry = disk.get(tenant.scope, key) if disk is not None else None
+    if entry is not None and disk.remaining(entry) > 0:
+        return loads(entry.body), disk.remaining(entry)
+
+    known = tenant.validators.get(key) if settings.NEBULA_BLOCK_CONDITIONAL_REQUESTS else None
+    if known is not None:
+        etag, last_modified = known.etag, known.last_modified
+    elif entry is not None and settings.NEBULA_BLOCK_CONDITIONAL_REQUESTS:
+        etag, last_modified = entry.etag, entry.last_modified
+    else:
+        etag = last_modified = None
+    response = await _request(
+        tenant, "GET", endpoint, extra_headers=conditional_headers(etag, last_modified), params=params
+    )
+    if response.status_code == 304 and (known is not None or entry is not None):
+        if metrics.enabled:
+            metrics.record_cache(endpoint, "revalidated")
+        if entry is not None:
+            disk.touch(tenant.scope, key, ttl)
+        if known is not None:
+            return (known.value if raw else decode(known.value)), ttl
+        return loads(entry.body), ttl
+
+    data = read_json(response, raw)
+    etag, last_modified = validators_of(response)
+    if tenant.cache.generation == generation:
+        if (etag or last_modified) and settings.NEBULA_BLOCK_CONDITIONAL_REQUESTS:
+            tenant.validators.set(key, Validated(etag, last_modified, data), settings.NEBULA_BLOCK_VALIDATOR_TTL)
+        if disk is not None:
+            disk.set(tenant.scope, key, response.content, ttl, etag, last_modified)
+    return data, ttl
+
+
+def _loader(
+    tenant: Tenant,
+    endpoint: str,
+    params: dict = None,
+    ttl: float = None,
+    stale_ttl: float = 0.0,
+    raw: bool = False,
+):
+    async def _load():
+        generation = tenant.cache.generation
+        data, fresh_for = await _conditional_get(tenant, endpoint, params, ttl, raw, generation)
+        if ttl is not None and tenant.cache.generation == generation:
+            tenant.cache.set(make_key(endpoint, params), data, fresh_for, stale_ttl)
+        return data
+    return _load
+
+
+def _inflight_key(endpoint: str, params: Optional[dict], raw: bool):
+    """
+    Key under which identical loads are coalesced, in the foreground or as background refreshes.
+    """
+    return make_key(endpoint, params), raw
+
+
+async def _fetch(
+    tenant: Tenant,
+    endpoint: str,
+    params: dict = None,
+    ttl: float = None,
+    stale_ttl: float = 0.0,
+    raw: bool = False,
+):
+    key = _inflight_key(endpoint, params, raw)
+    load = _loader(tenant, endpoint, params, ttl, stale_ttl, raw)
+    if not settings.NEBULA_BLOCK_COALESCE_REQUESTS:
+        return await batched_read(key, load)
+    return await batched_read(key, lambda: tenant.inflight.run(key, load))
+
+
+async def _make_api_request(
+    endpoint: str,
+    params: dict = None,
+    mutates: bool = False,
+    raw: bool = False,
+    idempotent: Optional[bool] = None,
+):
+    """
+    GET ``endpoint`` through the tenant's cache and coalescer.
 
-def _make_api_post_request(endpoint: str, json_data: dict):
-    api_url = settings.NEBULA_BLOCK_API_URL
-    api_key = settings.NEBULA_BLOCK_API_KEY
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    response = requests.post(f"{api_url}/api/v1/{endpoint}", headers=headers, json=json_data)
-    response.raise_for_status()
-    return response.json()
+    With ``raw`` the body is returned as ``RawJSON`` text instead of being
+    decoded, unless the endpoint is cached (the cache keeps decoded values).
+    """
+    tenant = current_tenant()
+    raw = raw and settings.NEBULA_BLOCK_RAW_PASSTHROUGH
+    if mutates:
+        data = await _send(tenant, "GET", endpoint, raw=raw, idempotent=idempotent, params=params)
+        tenant.invalidate(endpoint)
+        return data
+
+    key = make_key(endpoint, params)
+    swr_ttl = swr_ttl_for(endpoint)
+    if swr_ttl is not None:
+        stale_ttl = settings.NEBULA_BLOCK_SWR_MAX_STALE
+        cached, fresh = tenant.cache.get_stale(key, MISSING)
+        if metrics.enabled:
+            metrics.record_cache(endpoint, "miss" if cached is MISSING else "hit" if fresh else "stale")
+        if cached is MISSING:
+            return await _fetch(tenant, endpoint, params, swr_ttl, stale_ttl)
+        if not fresh:
+            tenant.inflight.refresh(
+                _inflight_key(endpoint, params, False), _loader(tenant, endpoint, params, swr_ttl, stale_ttl)
+            )
+        return cached
+
+    ttl = ttl_for(endpoint)
+    if ttl is not None:
+        cached = tenant.cache.get(key, MISSING)
+        if metrics.enabled:
+            metrics.record_cache(endpoint, "miss" if cached is MISSING else "hit")
+        if cached is not MISSING:
+            return cached
+        raw = False
+    return await _fetch(tenant, endpoint, params, ttl, raw=raw)
+
+
+def _page_fetcher(endpoint: str):
+    async def fetch_page(page_offset: int, limit: int):
+        return await _make_api_request(endpoint, {"limit": limit, "offset": page_offset})
+    return fetch_page
+
+
+async def _make_paginated_request(
+    endpoint: str,
+    page_size: Optional[int] = None,
+    max_records: Optional[int] = None,
+    offset: int = 0,
+    ctx: Optional[Context] = None,
+):
+    """
+    Fetch up to ``max_records`` records from a list endpoint, following pages server-side.
 
+    Returns the records plus ``next_offset`` to resume from, or None once the
+    listing is exhausted.
+    """
+    page_size = page_size or settings.NEBULA_BLOCK_PAGE_SIZE
+    max_records = max_records or settings.NEBULA_BLOCK_PAGINATION_MAX_RECORDS
+
+    records = []
+    next_offset = None
+    token = request_priority.set(Priority.BULK)
+    try:
+        pages = iter_pages(_page_fetcher(endpoint), page_size, settings.NEBULA_BLOCK_PAGE_PREFETCH, offset)
+        async with aclosing(pages):
+            async for page in pages:
+                room = max_records - len(records)
+                records.extend(page[:room])
+                if ctx is not None:
+                    await ctx.report_progress(len(records), max_records)
+                if len(records) >= max_records:
+                    if len(page) > room or len(page) == page_size:
+                        next_offset = offset + len(records)
+                    break
+    finally:
+        request_priority.reset(token)
+    return {"data": records, "count": len(records), "next_offset": next_offset}
+
+
+async def _select_instance_ids(
+    ids: Optional[List[str]], match: Optional[Dict[str, str]], guarded: bool = False
+) -> List[str]:
+    """
+    Resolve bulk targets from explicit IDs and/or a field filter over the user's instances.
 
-def _make_api_delete_request(endpoint: str):
-    api_url = settings.NEBULA_BLOCK_API_URL
-    api_key = settings.NEBULA_BLOCK_API_KEY
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
+    With ``guarded``, a ``match`` that selects none or all of the instances is
+    refused, since it is more likely a mistyped filter than the intent.
+    """
+    selected = list(ids or [])
+    if match:
+        records = iter_records(
+            _page_fetcher("computing/instances"),
+            settings.NEBULA_BLOCK_PAGE_SIZE,
+            settings.NEBULA_BLOCK_PAGE_PREFETCH,
+        )
+        total = 0
+        matched = []
+        async with aclosing(records):
+            async for instance in records:
+                total += 1
+                if matches(instance, match):
+                    matched.append(str(instance["id"]))
+        if guarded and (not matched or len(matched) == total):
+            which = "none" if not matched else "all"
+            raise ValueError(
+                f"`match` selects {which} of your {total} instances; check the filter or pass `confirm` to proceed."
+            )
+        selected.extend(matched)
+    return selected
+
+
+async def _make_bulk_request(
+    action,
+    ids: Optional[List[str]],
+    match: Optional[Dict[str, str]],
+    concurrency: Optional[int],
+    guarded: bool = False,
+):
+    if not ids and not match:
+        raise ValueError("Provide instance `ids`, a `match` filter, or both.")
+    token = request_priority.set(Priority.BULK)
+    try:
+        targets = await _select_instance_ids(ids, match, guarded)
+        results = await run_bulk(action, targets, concurrency or settings.NEBULA_BLOCK_BULK_CONCURRENCY)
+    finally:
+        request_priority.reset(token)
+    return {
+        "results": results,
+        "succeeded": sum(1 for result in results if result["ok"]),
+        "failed": sum(1 for result in results if not result["ok"]),
     }
-    response = requests.delete(f"{api_url}/api/v1/{endpoint}", headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-
-@mcp.tool("get_computing_products")
-@mcp.resource("mcp://computing_products")
-def get_computing_products():
-    return _make_api_request("computing/products")
-
-
-@mcp.tool("get_user_instances")
-@mcp.resource("mcp://user_instances?limit={limit}&offset={offset}")
-def get_user_instances(limit: int = None, offset: int = None):
-    params = {}
-    if limit is not None:
-        params["limit"] = limit
-    if offset is not None:
-        params["offset"] = offset
-    return _make_api_request("computing/instances", params)
-
-
-@mcp.tool("get_user_instance_detail")
-@mcp.resource("mcp://user_instance_detail/{id}")
-def get_user_instance_detail(id: str):
-    return _make_api_request(f"computing/instance/{id}")
-
-
-@mcp.tool("list_deleted_user_instances")
-@mcp.resource("mcp://deleted_user_instances")
-def list_deleted_user_instances():
-    return _make_api_request("computing/deleted-instances")
 
 
-@mcp.tool("get_user_credit_balance")
-@mcp.resource("mcp://billing_user_credit_balance")
-def get_user_credit_balance():
-    return _make_api_request("users/credits")
-
-
-@mcp.tool("list_user_invoices")
-@mcp.resource("mcp://billing_user_invoices?limit={limit}&offset={offset}")
-def list_user_invoices(limit: int = None, offset: int = None):
-    params = {}
-    if limit is not None:
-        params["limit"] = limit
-    if offset is not None:
-        params["offset"] = offset
-    return _make_api_request("users/invoices", params)
+async def _sync_inventory(tenant: Tenant, force: bool = False):
+    """
+    Bring the tenant's inventory up to date unless it was synced within the TTL.
+    """
+    inventory = tenant.inventory
+    if not force and inventory.is_fresh(settings.NEBULA_BLOCK_INVENTORY_TTL):
+        return
+
+    async def _sync():
+        token = request_priority.set(Priority.BULK)
+        try:
+            pages = iter_records(
+                _page_fetcher("computing/instances"),
+                settings.NEBULA_BLOCK_PAGE_SIZE,
+                settings.NEBULA_BLOCK_PAGE_PREFETCH,
+            )
+            instances = [row async for row in pages]
+            deleted, products, images = await asyncio.gather(
+                _make_api_request("computing/deleted-instances"),
+                _make_api_request("computing/products"),
+                _make_api_request("computing/images"),
+            )
+        finally:
+            request_priority.reset(token)
+        deleted_ids = [row["id"] for row in extract_records(deleted) if isinstance(row, dict) and "id" in row]
+        inventory.apply("instances", instances, deleted_ids)
+        inventory.apply("products", extract_records(products))
+        inventory.apply("images", extract_records(images))
+        inventory.finish_sync()
+
+    await tenant.inflight.run(("inventory-sync",), _sync)
+
+
+BILLING_ENDPOINTS = {"payments": "users/credits/history", "invoices": "users/invoices"}
+
+
+async def _sync_ledger(tenant: Tenant, source: str, force: bool = False) -> Ledger:
+    """
+    Ingest billing records the tenant's ledger has not seen yet.
 
+    Pages are read from the start of the listing until one holds nothing new,
+    then from the end of what is already held, so only new records are
+    fetched whichever way the listing is ordered.
+    """
+    ledger = tenant.ledgers.setdefault(source, Ledger())
+    if (
+        not force
+        and ledger.synced_at is not None
+        and time.monotonic() - ledger.synced_at < settings.NEBULA_BLOCK_ANALYTICS_TTL
+    ):
+        return ledger
+
+    async def _sync():
+        endpoint = BILLING_ENDPOINTS[source]
+        page_size = settings.NEBULA_BLOCK_PAGE_SIZE
+        fetch_page = _page_fetcher(endpoint)
+        token = request_priority.set(Priority.BULK)
+        try:
+            offset = 0
+            while True:
+                page = extract_records(await fetch_page(offset, page_size))
+                added = sum(ledger.add(record) for record in page)
+                offset += len(page)
+                if len(page) < page_size or not added:
+                    break
+            if len(page) == page_size:
+                offset = len(ledger.ids)
+                while True:
+                    page = extract_records(await fetch_page(offset, page_size))
+                    for record in page:
+                        ledger.add(record)
+                    offset += len(page)
+                    if len(page) < page_size:
+                        break
+        finally:
+            request_priority.reset(token)
+        ledger.synced_at = time.monotonic()
+
+    await tenant.inflight.run(("ledger-sync", source), _sync)
+    return ledger
+
+
+async def _fetch_instance_detail(id: str):
+    return await _make_api_request(f"computing/instance/{id}")
+
+
+docs_index = DocsIndex(
+    settings.NEBULA_BLOCK_DOCS_DIRECTORY,
+    default_index_path(
+        settings.NEBULA_BLOCK_DOCS_DIRECTORY, settings.NEBULA_BLOCK_DOCS_INDEX_DIR or settings.NEBULA_BLOCK_CACHE_DIR
+    ),
+    settings.NEBULA_BLOCK_DOCS_RESCAN_INTERVAL,
+)
+
+
+async def _docs() -> DocsIndex:
+    """
+    Return the docs index, first picking up changed pages if a re-check is due.
+    """
+    if docs_index.due():
+        await asyncio.to_thread(docs_index.refresh)
+    return docs_index
 
-@mcp.resource("mcp://api_keys")
-@mcp.tool("list_api_keys")
-def list_api_keys():
-    return _make_api_request("keys")
 
+instance_watcher = InstanceWatcher(
+    _fetch_instance_detail,
+    min_interval=settings.NEBULA_BLOCK_WATCH_MIN_INTERVAL,
+    max_interval=settings.NEBULA_BLOCK_WATCH_MAX_INTERVAL,
+    backoff=settings.NEBULA_BLOCK_WATCH_BACKOFF,
+    jitter=settings.NEBULA_BLOCK_WATCH_JITTER,
+)
 
-@mcp.tool("list_ssh_keys")
-@mcp.resource("mcp://ssh_keys")
-def list_ssh_keys():
-    return _make_api_request("ssh-keys")
 
+async def _call_endpoint(endpoint: Endpoint, arguments: dict):
+    """
+    Send one call of a table endpoint through the request pipeline.
 
-@mcp.tool("delete_gpu_instance")
-def delete_gpu_instance(id: str):
+    GETs go through the cache, coalescer and conditional requests; other
+    methods are sent once (retried only if idempotent) and invalidate what
+    they touch.
+    """
+    path = endpoint.url_path(arguments)
+    if endpoint.method != "GET":
+        body = endpoint.body(arguments)
+        kwargs = {"json": body} if body is not None else {}
+        return await _send(current_tenant(), endpoint.method, path, idempotent=endpoint.idempotent, **kwargs)
+
+    fields, match = arguments.get("fields"), arguments.get("match")
+    data = await _make_api_request(
+        path,
+        endpoint.query(arguments),
+        mutates=endpoint.mutates,
+        raw=endpoint.raw and not (fields or match),
+        idempotent=endpoint.idempotent,
+    )
+    return shape(data, fields, match) if endpoint.shaped else data
+
+
+async def _paginate_endpoint(
+    endpoint: Endpoint, page_size: Optional[int], max_records: Optional[int], offset: int, ctx: Optional[Context]
+):
+    return await _make_paginated_request(endpoint.path, page_size, max_records, offset, ctx)
+
+
+# The plain API tools (and their resources) are generated from the endpoint
+# table; their functions are kept here by tool name.
+TOOLS = register_endpoints(mcp, ENDPOINTS, _call_endpoint, _paginate_endpoint, __name__)
+
+
+@mcp.tool("query_inventory")
+async def query_inventory(
+    kind: Literal["instances", "products", "images"] = "instances",
+    status: str = None,
+    product: str = None,
+    region: str = None,
+    name: str = None,
+    name_contains: str = None,
+    limit: int = 100,
+    refresh: bool = False,
+):
     """
-    Delete GPU Instances.
+    Query the local inventory of instances, products and OS images.
 
-    Permanently delete an instance by specifying the instance ID in the path to delete the selected instance.
+    Returns only the rows matching every given filter (case-insensitive), from an index kept in sync with NebulaBlock. `status` and `product` apply to instances; `region`, `name` and `name_contains` apply to every kind. The inventory re-syncs when it is older than NEBULA_BLOCK_INVENTORY_TTL seconds, or immediately with `refresh`.
     """
-    return _make_api_delete_request(f"computing/instance/{id}")
+    tenant = current_tenant()
+    await _sync_inventory(tenant, force=refresh)
+    inventory = tenant.inventory
+    filters = {"status": status, "product": product, "region": region, "name": name}
+    rows = inventory.query(kind, filters, name_contains, limit)
+    return {
+        "kind": kind,
+        "count": len(rows),
+        "data": rows,
+        "synced_seconds_ago": round(inventory.age() or 0.0, 3),
+    }
 
 
-@mcp.tool("start_gpu_instance")
-def start_gpu_instance(id: str):
+@mcp.tool("get_account_overview")
+@mcp.resource("mcp://account_overview")
+async def get_account_overview():
     """
-    Start GPU Instances.
+    Summarize the account in one call.
 
-    Initiate the startup of an instance. Provide the instance ID in the path to start the specified instance.
+    Returns the credit balance, instances (with their product's name and price, counts by status and the hourly cost of running ones), SSH keys, products and OS images. The upstream requests run concurrently; sections that fail are reported under `errors`.
     """
-    return _make_api_request(f"computing/instance/{id}/start")
-
-
-@mcp.tool("stop_gpu_instance")
-def stop_gpu_instance(id: str):
+    results = await asyncio.gather(
+        _make_api_request("users/credits"),
+        _make_api_request("computing/instances"),
+        _make_api_request("ssh-keys"),
+        _make_api_request("computing/products"),
+        _make_api_request("computing/images"),
+        return_exceptions=True,
+    )
+    payloads, errors = {}, {}
+    for section, result in zip(SECTIONS, results):
+        if isinstance(result, BaseException):
+            errors[section] = str(result) or type(result).__name__
+        else:
+            payloads[section] = result
+    return build_overview(payloads, errors)
+
+
+async def _call_tool(name: str, arguments: dict, ctx: Optional[Context]):
+    """
+    Invoke a registered tool's function directly, returning its unserialized result.
+    """
+    if name == "multi_call":
+        raise ValueError("multi_call cannot be nested")
+    tool = mcp._tool_manager.get_tool(name)
+    arguments = dict(arguments)
+    context_kwarg = find_kwarg_by_type(tool.fn, kwarg_type=Context)
+    if context_kwarg:
+        arguments[context_kwarg] = ctx
+    return decode(await get_cached_typeadapter(tool.fn).validate_python(arguments))
+
+
+@mcp.tool("multi_call")
+async def multi_call(calls: List[Dict[str, Any]], concurrency: int = None, ctx: Optional[Context] = None):
     """
-    Stop GPU Instances.
+    Run several tool calls in one request.
 
-    Shut down an instance. Provide the instance ID in the path to initiate the shutdown process for that instance.
+    Each entry of `calls` is `{"tool": name, "arguments": {...}}`. Calls run concurrently (at most `concurrency` at a time) and results come back in the same order as `{"tool", "ok", "result"}` or `{"tool", "ok", "error"}`. Identical upstream reads within the batch are made only once.
     """
-    return _make_api_request(f"computing/instance/{id}/stop")
+    if len(calls) > settings.NEBULA_BLOCK_BATCH_MAX_CALLS:
+        raise ValueError(f"At most {settings.NEBULA_BLOCK_BATCH_MAX_CALLS} calls are allowed per batch.")
 
+    async def _call(name: str, arguments: dict):
+        return await _call_tool(name, arguments, ctx)
 
-@mcp.tool("reboot_gpu_instance")
-def reboot_gpu_instance(id: str):
-    """
-    Reboot GPU Instances.
+    results = await run_batch(_call, calls, concurrency or settings.NEBULA_BLOCK_BATCH_CONCURRENCY)
+    return {
+        "results": results,
+        "succeeded": sum(1 for result in results if result["ok"]),
+        "failed": sum(1 for result in results if not result["ok"]),
+    }
 
-    Initiate a reboot of an instance. Provide the instance ID in the path to reboot the specified instance.
-    """
-    return _make_api_request(f"computing/instance/{id}/reboot")
 
+@mcp.tool("wait_for_instance_status")
+async def wait_for_instance_status(
+    id: str, statuses: List[str] = None, timeout: float = None, ctx: Optional[Context] = None
+):
+    """
+    Wait for GPU Instance Status.
 
-@mcp.tool("create_gpu_instance")
-def create_gpu_instance(instance_name: str, product_id: str, image_id: str, ssh_key_id: str):
+    Block until the instance reaches one of `statuses` (default ["Running"]) or `timeout` seconds pass. Polling happens on the server with backoff, so there is no need to call get_user_instance_detail in a loop. Progress and resource-updated notifications for mcp://user_instance_detail/{id} are sent whenever the status changes.
     """
-    Create GPU Instances.
+    statuses = statuses or ["Running"]
+    timeout = timeout or settings.NEBULA_BLOCK_WATCH_TIMEOUT
+    on_change = None
+    # A stateless session is gone before any notification could reach it.
+    if ctx is not None and not mcp.settings.stateless_http:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        uri = AnyUrl(f"mcp://user_instance_detail/{id}")
+
+        async def on_change(status, payload):
+            await ctx.report_progress(loop.time() - started, timeout, message=f"status: {status}")
+            await ctx.session.send_resource_updated(uri)
+
+    try:
+        instance = await instance_watcher.wait_for(
+            id, statuses, timeout, on_change, scope=current_tenant().api_key
+        )
+    except WatchTimeout as exc:
+        return {"reached": False, "instance": exc.payload}
+    return {"reached": True, "instance": instance}
+
+
+@mcp.tool("analyze_spend")
+async def analyze_spend(
+    group_by: Literal["product", "day", "instance"] = "product",
+    days: float = 30,
+    source: Literal["payments", "invoices"] = "payments",
+    refresh: bool = False,
+):
+    """
+    Analyze spending over the last `days` days.
 
-    Create an instance with the specified custom configuration and features provided in the request body.
+    Totals the payment history (or invoices with `source="invoices"`) per product, day or instance, and reports the daily burn rate and the runway the current credit balance gives at that rate. The history is kept server-side and only new records are fetched on later calls, or immediately with `refresh`.
     """
-    json_data = {
-        "instance_name": instance_name,
-        "product_id": product_id,
-        "image_id": image_id,
-        "ssh_key_id": ssh_key_id
+    tenant = current_tenant()
+    ledger, credits = await asyncio.gather(
+        _sync_ledger(tenant, source, force=refresh), _make_api_request("users/credits")
+    )
+    start = time.time() - days * DAY
+    total, count = ledger.total(start)
+    burn_rate = total / days if days > 0 else None
+    balance = parse_balance(decode(credits))
+    runway = balance / burn_rate if balance is not None and burn_rate and burn_rate > 0 else None
+    return {
+        "source": source,
+        "group_by": group_by,
+        "days": days,
+        "total": round(total, 6),
+        "count": count,
+        "groups": ledger.aggregate(group_by, start),
+        "burn_rate_per_day": None if burn_rate is None else round(burn_rate, 6),
+        "balance": balance,
+        "runway_days": None if runway is None else round(runway, 2),
+        "records": len(ledger),
+        "skipped": ledger.skipped,
     }
-    return _make_api_post_request("computing/instance", json_data)
 
 
-# NOTE: seems this api does not exist
-# @mcp.tool("rename_ssh_key")
-# def rename_ssh_key(id: int, key_name: str):
-#     """
-#     Rename SSH Key.
+@mcp.tool("bulk_delete_gpu_instances")
+async def bulk_delete_gpu_instances(
+    ids: List[str] = None, match: Dict[str, str] = None, concurrency: int = None, confirm: bool = False
+):
+    """
+    Delete several GPU Instances at once.
 
-#     Updates the name of a specified SSH key. Include the ID of the SSH key in the endpoint path and the new name in the body of the request.
-#     """
-#     json_data = {
-#         "key_name": key_name
-#     }
-#     return _make_api_put_request(f"ssh-keys/{id}", json_data)
+    Targets are the given instance `ids` plus any instance whose fields equal every value in `match` (e.g. {"status": "Stopped"}, compared case-insensitively; instances without the field never match). A `match` that selects none or all of the instances is refused unless `confirm` is true. Operations run in parallel, at most `concurrency` at a time, and a per-ID result or error is returned.
+    """
+    return await _make_bulk_request(TOOLS["delete_gpu_instance"], ids, match, concurrency, guarded=not confirm)
 
 
-@mcp.tool("delete_ssh_key")
-def delete_ssh_key(id: str):
+@mcp.tool("bulk_start_gpu_instances")
+async def bulk_start_gpu_instances(
+    ids: List[str] = None, match: Dict[str, str] = None, concurrency: int = None
+):
     """
-    Deletes a specified SSH key by including the ID of the SSH key in the endpoint path.
-    """
-    return _make_api_delete_request(f"ssh-keys/{id}")
-
+    Start several GPU Instances at once.
 
-# NOTE: seems this api does not exist
-# @mcp.tool("delete_api_key")
-# def delete_api_key(id: int):
-#     """
-#     Deletes a specified API key by including the ID of the API key in the endpoint path.
-#     """
-#     return _make_api_delete_request(f"api_keys/{id}")
+    Targets are the given instance `ids` plus any instance whose fields equal every value in `match`. Operations run in parallel, at most `concurrency` at a time, and a per-ID result or error is returned.
+    """
+    return await _make_bulk_request(TOOLS["start_gpu_instance"], ids, match, concurrency)
 
 
-@mcp.tool("list_available_os_images")
-@mcp.resource("mcp://available_os_images")
-def list_available_os_images():
+@mcp.tool("bulk_stop_gpu_instances")
+async def bulk_stop_gpu_instances(
+    ids: List[str] = None, match: Dict[str, str] = None, concurrency: int = None
+):
     """
-    List Available OS Images.
+    Stop several GPU Instances at once.
 
-    Return a list of all available operating system images, including details about each image's version and driver, if applicable.
+    Targets are the given instance `ids` plus any instance whose fields equal every value in `match`. Operations run in parallel, at most `concurrency` at a time, and a per-ID result or error is returned.
     """
-    return _make_api_request("computing/images")
+    return await _make_bulk_request(TOOLS["stop_gpu_instance"], ids, match, concurrency)
 
 
-@mcp.tool("create_ssh_key")
-def create_ssh_key(key_name: str, key_data: str):
+@mcp.tool("bulk_reboot_gpu_instances")
+async def bulk_reboot_gpu_instances(
+    ids: List[str] = None, match: Dict[str, str] = None, concurrency: int = None
+):
     """
-    Creates an SSH key for use in your instances.
+    Reboot several GPU Instances at once.
+
+    Targets are the given instance `ids` plus any instance whose fields equal every value in `match`. Operations run in parallel, at most `concurrency` at a time, and a per-ID result or error is returned.
     """
-    json_data = {
-        "key_name": key_name,
-        "key_data": key_data
-    }
-    return _make_api_post_request("ssh-keys", json_data)
+    return await _make_bulk_request(TOOLS["reboot_gpu_instance"], ids, match, concurrency)
 
 
-@mcp.tool("get_payment_history")
-@mcp.resource("mcp://payment_history?limit={limit}&offset={offset}")
-def get_payment_history(limit: int = None, offset: int = None):
+@mcp.tool("search_docs")
+async def search_docs(query: str, limit: int = 10):
     """
-    Retrieve the user's transaction history.
+    Search the NebulaBlock documentation.
 
-    Retrieve your credit payment history for different products.
+    Returns the best matching pages (BM25 ranking) with a short summary and the `mcp://docs/{path}` resource to read each page in full.
     """
-    params = {}
-    if limit is not None:
-        params["limit"] = limit
-    if offset is not None:
-        params["offset"] = offset
-    return _make_api_request("users/credits/history", params)
+    index = await _docs()
+    return {"query": query, "results": index.search(query, limit)}
+
+
+@mcp.resource("mcp://docs/{path*}")
+async def read_docs_page(path: str):
+    index = await _docs()
+    return index.read(path)
@@ -0,0 +1,73 @@
+"""
+Optional OpenTelemetry tracing.
+
+When ``NEBULA_BLOCK_OTLP_ENDPOINT`` is set (and the ``otlp`` extra is
+installed), every tool call and upstream request gets a span exported over
+OTLP/HTTP. Tool spans continue the caller's W3C trace context from the HTTP
+headers of network transports, and upstream requests carry the context on
+to NebulaBlock. Otherwise ``span`` is a shared no-op context manager.
+"""
+
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional
+
+from src.config import settings
+
+_NOOP = nullcontext()
+
+tracer = None
+
+
+def _setup():
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as exc:
+        raise RuntimeError(
+            "NEBULA_BLOCK_OTLP_ENDPOINT is set but OpenTelemetry is not installed; "
+            'install the "otlp" extra'
+        ) from exc
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.NEBULA_BLOCK_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.NEBULA_BLOCK_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer("nebulablock-mcp-server")
+
+
+if settings.NEBULA_BLOCK_OTLP_ENDPOINT:
+    tracer = _setup()
+
+enabled = tracer is not None
+
+
+@contextmanager
+def _span(name: str, kind: str, attributes: Dict[str, str], carrier: Optional[Dict[str, str]]) -> Iterator[None]:
+    from opentelemetry import propagate
+    from opentelemetry.trace import SpanKind
+
+    context = propagate.extract(carrier) if carrier else None
+    span_kind = SpanKind.SERVER if kind == "server" else SpanKind.CLIENT
+    with tracer.start_as_current_span(name, context=context, kind=span_kind, attributes=attributes):
+        yield
+
+
+def span(name: str, kind: str = "client", attributes: Dict[str, str] = None, carrier: Dict[str, str] = None):
+    """
+    Start a span for the enclosed block, continuing the trace in ``carrier`` headers if given.
+    """
+    if tracer is None:
+        return _NOOP
+    return _span(name, kind, attributes or {}, carrier)
+
+
+def inject(headers: Dict[str, str]) -> Dict[str, str]:
+    """
+    Add the current trace context (``traceparent``) to outgoing ``headers``.
+    """
+    if tracer is not None:
+        from opentelemetry import propagate
+
+        propagate.inject(headers)
+    return headers
@@ -0,0 +1,166 @@
+"""
+Server-side instance status watcher.
+
+One poller runs per watched instance no matter how many callers are waiting
+on it. The poll interval starts short, backs off while the status stays the
+same, resets when it changes, and is jittered so pollers do not line up.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.batch import outside_batch
+
+FetchDetail = Callable[[str], Awaitable[Any]]
+StatusListener = Callable[[str, Any], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+def instance_status(payload: Any) -> Optional[str]:
+    """
+    Return the ``status`` of an instance detail payload, unwrapping ``data`` if present.
+    """
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+    if isinstance(payload, dict) and payload.get("status") is not None:
+        return str(payload["status"])
+    return None
+
+
+class WatchTimeout(asyncio.TimeoutError):
+    """
+    Raised when a watched instance does not reach its target status in time.
+
+    ``payload`` holds the last instance detail that was polled, if any.
+    """
+
+    def __init__(self, id: str, payload: Any) -> None:
+        super().__init__(f"Instance {id} did not reach the requested status in time")
+        self.payload = payload
+
+
+class _Poller:
+    def __init__(self, key: Hashable, id: str) -> None:
+        self.key = key
+        self.id = id
+        self.waiters: List[Tuple[Set[str], asyncio.Future]] = []
+        self.listeners: List[StatusListener] = []
+        self.payload: Any = None
+        self.status: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class InstanceWatcher:
+    """
+    Wait for instances to reach a target status with one shared poller per instance.
+    """
+
+    def __init__(
+        self,
+        fetch: FetchDetail,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        backoff: float = 1.5,
+        jitter: float = 0.2,
+    ) -> None:
+        self._fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self._pollers: Dict[Hashable, _Poller] = {}
+
+    def active(self) -> int:
+        """
+        Return the number of instances currently being polled.
+        """
+        return len(self._pollers)
+
+    async def wait_for(
+        self,
+        id: str,
+        statuses: Iterable[str],
+        timeout: Optional[float] = None,
+        on_change: Optional[StatusListener] = None,
+        scope: Hashable = None,
+    ) -> Any:
+        """
+        Return the instance detail once its status is one of ``statuses``.
+
+        ``on_change(status, payload)`` is awaited whenever the polled status
+        changes. Raises ``WatchTimeout`` after ``timeout`` seconds. Waiters
+        only share a poller within the same ``scope`` (e.g. the API key).
+        """
+        targets = {status.lower() for status in statuses}
+        key = (scope, id)
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = self._pollers[key] = _Poller(key, id)
+        future = asyncio.get_running_loop().create_future()
+        waiter = (targets, future)
+        poller.waiters.append(waiter)
+        if on_change is not None:
+            poller.listeners.append(on_change)
+        if poller.task is None or poller.task.done():
+            poller.task = asyncio.create_task(self._run(poller), context=outside_batch())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise WatchTimeout(id, poller.payload) from None
+        finally:
+            if waiter in poller.waiters:
+                poller.waiters.remove(waiter)
+            if on_change is not None and on_change in poller.listeners:
+                poller.listeners.remove(on_change)
+            self._release(poller)
+
+    def _release(self, poller: _Poller) -> None:
+        if poller.waiters:
+            return
+        if poller.task is not None and not poller.task.done() and poller.task is not asyncio.current_task():
+            poller.task.cancel()
+        if self._pollers.get(poller.key) is poller:
+            del self._pollers[poller.key]
+
+    def _next_interval(self, interval: float, changed: bool) -> float:
+        if changed:
+            return self.min_interval
+        return min(interval * self.backoff, self.max_interval)
+
+    async def _run(self, poller: _Poller) -> None:
+        interval = self.min_interval
+        first = True
+        while poller.waiters:
+            try:
+                payload = await self._fetch(poller.id)
+            except Exception as exc:
+                for _, future in poller.waiters:
+                    if not future.done():
+                        future.set_exception(exc)
+                poller.waiters.clear()
+                break
+
+            status = instance_status(payload)
+            changed = first or status != poller.status
+            first = False
+            poller.payload, poller.status = payload, status
+            if changed:
+                for listener in list(poller.listeners):
+                    try:
+                        await listener(status, payload)
+                    except Exception as exc:
+                        logger.warning("Status listener for instance %s failed: %s", poller.id, exc)
+
+            for targets, future in list(poller.waiters):
+                if status is not None and status.lower() in targets and not future.done():
+                    future.set_result(payload)
+            poller.waiters = [waiter for waiter in poller.waiters if not waiter[1].done()]
+            if not poller.waiters:
+                break
+
+            interval = self._next_interval(interval, changed)
+            await asyncio.sleep(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+        self._release(poller)
@@ -0,0 +1,45 @@
+import pytest
+
+from src.config import settings
+from src.tenancy import tenants
+from tests.fake_server import FakeNebulaBlockServer
+
+
+@pytest.fixture(autouse=True)
+def reset_tenants():
+    """
+    Start every test with no tenant state: empty caches, fresh rate limiters, pools and circuits.
+    """
+    tenants.clear()
+    yield
+    tenants.clear()
+
+
+class FakeClock:
+    """
+    A settable stand-in for the ``clock`` callables the caches, limiters and breaker take.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """
+    A fake clock starting at 0 that tests advance by setting ``clock.now``.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch):
+    """
+    Run a local fake NebulaBlock API and point the tools at it.
+    """
+    with FakeNebulaBlockServer() as server:
+        monkeypatch.setattr(settings, "NEBULA_BLOCK_API_URL", server.url)
+        yield server
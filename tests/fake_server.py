@@ -0,0 +1,115 @@
+"""
+A local fake NebulaBlock API server for tests.
+
+Responses are scripted per path; each request pops the next scripted reply
+for its path, or falls back to the path's default reply. ``json_response``
+builds a real ``httpx.Response`` for tests that patch the HTTP client instead.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+Reply = Tuple[int, Dict[str, str], Any, float]
+
+
+def json_response(body: Any, status_code: int = 200, reason: Optional[str] = None) -> httpx.Response:
+    """
+    Return a real response carrying ``body`` as JSON, optionally with a custom reason phrase.
+    """
+    extensions = {"reason_phrase": reason.encode()} if reason else {}
+    request = httpx.Request("GET", "https://api.nebulablock.test")
+    return httpx.Response(status_code, json=body, extensions=extensions, request=request)
+
+
+class FakeNebulaBlockServer:
+    def __init__(self) -> None:
+        self.scripts: Dict[str, Deque[Reply]] = defaultdict(deque)
+        self.defaults: Dict[str, Reply] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reply(
+        self,
+        path: str,
+        status: int = 200,
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        delay: float = 0.0,
+        times: int = 1,
+    ) -> None:
+        """
+        Queue ``times`` replies for ``path`` (relative to /api/v1/).
+        """
+        for _ in range(times):
+            self.scripts[path].append((status, headers or {}, body, delay))
+
+    def default(self, path: str, status: int = 200, body: Any = None, headers: Optional[Dict[str, str]] = None, delay: float = 0.0) -> None:
+        self.defaults[path] = (status, headers or {}, body, delay)
+
+    def count(self, path: str) -> int:
+        return sum(1 for _, request_path, _ in self.requests if request_path == path)
+
+    def _next(self, path: str) -> Reply:
+        with self._lock:
+            if self.scripts[path]:
+                return self.scripts[path].popleft()
+        return self.defaults.get(path, (404, {}, {"message": "Not Found"}, 0.0))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                path = self.path.split("?", 1)[0].removeprefix("/api/v1/")
+                with server._lock:
+                    server.requests.append((self.command, path, dict(self.headers)))
+                status, headers, body, delay = server._next(path)
+                if delay:
+                    time.sleep(delay)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+        return Handler
+
+    def __enter__(self) -> "FakeNebulaBlockServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
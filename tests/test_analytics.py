@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastmcp import Client
+
+from src.analytics import Ledger, parse_balance, parse_time
+from src.config import settings
+from src.main import mcp
+
+
+def days_ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def test_ledger_aggregates_by_product_instance_and_day() -> None:
+    ledger = Ledger()
+    records = [
+        {"id": 1, "created_at": "2026-10-01T10:00:00Z", "amount": "2.5", "product_name": "H100", "instance_id": "a"},
+        {"id": 2, "created_at": "2026-10-01T20:00:00Z", "amount": 1, "product_name": "RTX 4090", "instance_id": "b"},
+        {"id": 3, "created_at": 1790935200000, "amount": 4, "product_name": "H100", "instance_id": "a"},
+        {"id": 4, "created_at": "not a date", "amount": 9},
+    ]
+    assert [ledger.add(record) for record in records] == [True, True, True, True]
+    assert ledger.add(records[0]) is False
+    assert (len(ledger), ledger.skipped) == (3, 1)
+
+    start = parse_time("2026-09-01T00:00:00Z")
+    assert ledger.aggregate("product", start) == [
+        {"key": "H100", "amount": 6.5, "count": 2},
+        {"key": "RTX 4090", "amount": 1.0, "count": 1},
+    ]
+    assert [row["key"] for row in ledger.aggregate("instance", start)] == ["a", "b"]
+    assert ledger.aggregate("day", start) == [
+        {"key": "2026-10-01", "amount": 3.5, "count": 2},
+        {"key": "2026-10-02", "amount": 4.0, "count": 1},
+    ]
+    assert ledger.total(parse_time("2026-10-02T00:00:00Z")) == (4.0, 1)
+
+
+def test_balance_is_read_from_common_shapes() -> None:
+    assert parse_balance({"credit": 100}) == 100.0
+    assert parse_balance({"data": {"balance": "12.5"}}) == 12.5
+    assert parse_balance({"message": "?"}) is None
+
+
+@pytest.mark.asyncio
+async def test_later_calls_fetch_only_new_records(fake_api, monkeypatch) -> None:
+    """
+    Test that the first call ingests the whole history and a refresh stops at known records.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_PAGE_SIZE", 2)
+    r1, r2, r3, r4 = (
+        {"id": index, "created_at": days_ago(index), "amount": 10, "product_name": f"p{index % 2}"}
+        for index in (4, 3, 2, 1)
+    )
+    fake_api.default("users/credits", body={"credit": 300})
+    fake_api.reply("users/credits/history", body={"data": [r3, r2]})
+    fake_api.reply("users/credits/history", body={"data": [r1]})
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("analyze_spend", {"days": 10})
+        first = json.loads(result[0].text)
+        assert fake_api.count("users/credits/history") == 2
+
+        fake_api.reply("users/credits/history", body={"data": [r4, r3]})
+        fake_api.reply("users/credits/history", body={"data": [r2, r1]})
+        fake_api.reply("users/credits/history", body={"data": []})
+        result = await client.call_tool("analyze_spend", {"days": 10, "group_by": "product", "refresh": True})
+        second = json.loads(result[0].text)
+
+    assert (first["total"], first["records"]) == (30.0, 3)
+    assert fake_api.count("users/credits/history") == 5
+    assert second["total"] == 40.0
+    assert second["groups"] == [{"key": "p0", "amount": 20.0, "count": 2}, {"key": "p1", "amount": 20.0, "count": 2}]
+    assert second["burn_rate_per_day"] == 4.0
+    assert second["runway_days"] == 75.0
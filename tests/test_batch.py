@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from fastmcp import Client
+
+from src.main import mcp
+
+
+@pytest.mark.asyncio
+async def test_multi_call_returns_results_in_order_and_dedupes_reads(fake_api) -> None:
+    """
+    Test that repeated reads in one batch reach the upstream once, even when they cannot overlap.
+    """
+    fake_api.default("computing/instance/1", body={"data": {"id": 1}}, delay=0.05)
+    fake_api.default("computing/instance/2", body={"data": {"id": 2}})
+    calls = [
+        {"tool": "get_user_instance_detail", "arguments": {"id": "1"}},
+        {"tool": "get_user_instance_detail", "arguments": {"id": "2"}},
+        {"tool": "get_user_instance_detail", "arguments": {"id": "1"}},
+    ]
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("multi_call", {"calls": calls, "concurrency": 1})
+
+    batch = json.loads(result[0].text)
+    assert [entry["result"] for entry in batch["results"]] == [{"data": {"id": 1}}, {"data": {"id": 2}}, {"data": {"id": 1}}]
+    assert batch["succeeded"] == 3
+    assert fake_api.count("computing/instance/1") == 1
+
+    async with Client(mcp) as client:
+        await client.call_tool("get_user_instance_detail", {"id": "1"})
+    assert fake_api.count("computing/instance/1") == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_per_call_and_writes_forget_shared_reads(fake_api) -> None:
+    fake_api.default("computing/instance/1", body={"data": {"id": 1}})
+    fake_api.default("computing/instance/1/stop", body={"message": "ok"})
+    calls = [
+        {"tool": "get_user_instance_detail", "arguments": {"id": "1"}},
+        {"tool": "stop_gpu_instance", "arguments": {"id": "1"}},
+        {"tool": "get_user_instance_detail", "arguments": {"id": "1"}},
+        {"tool": "no_such_tool"},
+        {"tool": "multi_call", "arguments": {"calls": []}},
+    ]
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("multi_call", {"calls": calls, "concurrency": 1})
+
+    batch = json.loads(result[0].text)
+    assert [entry["ok"] for entry in batch["results"]] == [True, True, True, False, False]
+    assert "no_such_tool" in batch["results"][3]["error"]
+    assert fake_api.count("computing/instance/1") == 2
@@ -0,0 +1,46 @@
+import json
+
+import httpx
+
+from benchmarks.stats import percentile, regressions, summarize
+from benchmarks.upstream import Profile, SyntheticNebulaBlock
+
+
+def test_percentile_interpolates() -> None:
+    samples = [0.001 * value for value in range(1, 101)]
+    assert percentile(samples, 0.5) == 0.0505
+    assert round(percentile(samples, 0.99), 5) == 0.09901
+    assert percentile([], 0.95) == 0.0
+
+
+def test_upstream_paginates_and_injects_errors() -> None:
+    with SyntheticNebulaBlock(Profile(latency=0, records=7, record_bytes=300)) as upstream:
+        page = httpx.get(f"{upstream.url}/api/v1/users/invoices", params={"limit": 5, "offset": 5}).json()
+        detail = httpx.get(f"{upstream.url}/api/v1/computing/instance/instances-1").json()
+    assert [record["id"] for record in page["data"]] == ["invoices-5", "invoices-6"]
+    assert page["total"] == 7
+    assert len(json.dumps(page["data"][0])) >= 280
+    assert detail == {"data": {"id": "instances-1", "status": "Running"}}
+
+    with SyntheticNebulaBlock(Profile(latency=0, error_rate=1.0)) as upstream:
+        assert httpx.get(f"{upstream.url}/api/v1/users/credits").status_code == 503
+        assert upstream.errors == 1
+
+
+def test_regressions_compare_p95_throughput_and_errors() -> None:
+    baseline = {"tools": {"a": summarize([0.010] * 10, 0, 0.1), "b": summarize([0.010] * 10, 0, 0.1)}}
+    report = {"tools": {"a": summarize([0.011] * 10, 0, 0.11), "b": summarize([0.030] * 9, 1, 0.5)}}
+
+    found = regressions(report, baseline, tolerance=0.25, slack_ms=1.0)
+
+    assert not any(line.startswith("a:") for line in found)
+    assert [line.split(":")[0] for line in found] == ["b", "b", "b"]
+
+
+def test_regressions_flag_tools_missing_from_the_baseline() -> None:
+    baseline = {"tools": {"a": summarize([0.010] * 10, 0, 0.1)}}
+    report = {"tools": {"a": summarize([0.010] * 10, 0, 0.1), "new_tool": summarize([0.010] * 10, 0, 0.1)}}
+
+    assert regressions(report, baseline, tolerance=0.25, slack_ms=1.0) == [
+        "new_tool: no baseline; run with --save-baseline"
+    ]
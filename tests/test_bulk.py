@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from fastmcp.client import Client
+from unittest import mock
+from src.bulk import run_bulk
+from src.config import settings
+from src.tools import mcp
+from tests.fake_server import json_response
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_limits_concurrency_and_collects_errors() -> None:
+    """
+    Test that run_bulk caps in-flight calls and reports per-ID failures in order.
+    """
+    active = 0
+    max_active = 0
+
+    async def action(id: str):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.005)
+        active -= 1
+        if id == "bad":
+            raise RuntimeError("Instance not found")
+        return {"message": f"{id} done"}
+
+    ids = [str(i) for i in range(10)] + ["bad", "3"]
+    results = await run_bulk(action, ids, concurrency=3)
+
+    assert max_active == 3
+    assert [result["id"] for result in results] == ids[:-1]
+    assert results[0] == {"id": "0", "ok": True, "result": {"message": "0 done"}}
+    assert results[-1] == {"id": "bad", "ok": False, "error": "Instance not found"}
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_bulk_stop_gpu_instances_by_ids(mock_request: mock.MagicMock) -> None:
+    """
+    Test that bulk_stop_gpu_instances stops every listed instance.
+    """
+    mock_response = json_response({"message": "Instance stopped successfully"})
+    mock_request.return_value = mock_response
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("bulk_stop_gpu_instances", {"ids": ["1", "2"]})
+
+    urls = sorted(call.args[1] for call in mock_request.call_args_list)
+    assert urls == [
+        f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/1/stop",
+        f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/2/stop",
+    ]
+    data = json.loads(result[0].text)
+    assert data["succeeded"] == 2
+    assert data["failed"] == 0
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_bulk_delete_gpu_instances_by_match(mock_request: mock.MagicMock) -> None:
+    """
+    Test that bulk_delete_gpu_instances selects targets with a field filter.
+    """
+    instances = [
+        {"id": "1", "status": "Stopped"},
+        {"id": "2", "status": "Running"},
+        {"id": "3", "status": "Stopped"},
+    ]
+
+    async def _request(method, url, headers=None, params=None):
+        if method == "GET":
+            return json_response({"data": instances[params["offset"]:][:params["limit"]]})
+        return json_response({"message": "Instance deleted successfully"})
+
+    mock_request.side_effect = _request
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("bulk_delete_gpu_instances", {"match": {"status": "Stopped"}})
+
+    deleted = sorted(call.args[1] for call in mock_request.call_args_list if call.args[0] == "DELETE")
+    assert deleted == [
+        f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/1",
+        f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/3",
+    ]
+    assert json.loads(result[0].text)["succeeded"] == 2
+
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_bulk_match_requires_the_field_and_guards_deletes(mock_request: mock.MagicMock) -> None:
+    """
+    Test that instances missing a matched field are never selected and wide deletes need confirmation.
+    """
+    instances = [{"id": "1", "status": "Stopped", "region": "us-east"}, {"id": "2", "status": "Running", "region": "us-east"}]
+
+    actions = []
+
+    async def _request(method, url, headers=None, params=None):
+        if url.endswith("computing/instances"):
+            return json_response({"data": instances[params["offset"]:][:params["limit"]]})
+        actions.append((method, url.split("/computing/instance/")[1]))
+        return json_response({"message": "ok"})
+
+    mock_request.side_effect = _request
+
+    async with Client(mcp) as client:
+        stopped = await client.call_tool("bulk_stop_gpu_instances", {"match": {"typo": "None"}})
+        await client.call_tool("bulk_start_gpu_instances", {"match": {"status": "stopped"}})
+        for match, which in [({"typo": "None"}, "none"), ({"region": "US-EAST"}, "all")]:
+            with pytest.raises(Exception, match=f"selects {which} of your 2 instances"):
+                await client.call_tool("bulk_delete_gpu_instances", {"match": match})
+        assert actions == [("GET", "1/start")]
+        await client.call_tool("bulk_delete_gpu_instances", {"match": {"region": "us-east"}, "confirm": True})
+
+    assert json.loads(stopped[0].text)["results"] == []
+    assert sorted(actions[1:]) == [("DELETE", "1"), ("DELETE", "2")]
@@ -0,0 +1,96 @@
+import pytest
+
+from fastmcp.client import Client
+from unittest import mock
+from src.cache import TTLCache, make_key
+from src.tools import mcp
+from tests.fake_server import json_response
+
+
+def test_ttl_cache_expires_entries(clock) -> None:
+    """
+    Test that entries are dropped once their TTL has elapsed.
+    """
+    cache = TTLCache(max_entries=4, clock=clock)
+    cache.set(make_key("computing/products"), ["p1"], ttl=10)
+
+    clock.now = 9.9
+    assert cache.get(make_key("computing/products")) == ["p1"]
+    clock.now = 10.0
+    assert cache.get(make_key("computing/products")) is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = TTLCache(max_entries=2)
+    cache.set(make_key("a"), 1, ttl=60)
+    cache.set(make_key("b"), 2, ttl=60)
+    cache.get(make_key("a"))
+    cache.set(make_key("c"), 3, ttl=60)
+
+    assert make_key("a") in cache
+    assert make_key("b") not in cache
+    assert make_key("c") in cache
+
+
+def test_ttl_cache_keys_include_params() -> None:
+    """
+    Test that the same endpoint with different params is cached separately.
+    """
+    cache = TTLCache(max_entries=4)
+    cache.set(make_key("users/invoices", {"limit": 10, "offset": 0}), "page1", ttl=60)
+
+    assert cache.get(make_key("users/invoices", {"offset": 0, "limit": 10})) == "page1"
+    assert cache.get(make_key("users/invoices", {"limit": 10, "offset": 10})) is None
+
+
+def test_ttl_cache_invalidate_drops_collection_and_items() -> None:
+    """
+    Test that a write invalidates the item, its children and parent collections only.
+    """
+    cache = TTLCache(max_entries=8)
+    cache.set(make_key("ssh-keys"), "list", ttl=60)
+    cache.set(make_key("ssh-keys/42"), "item", ttl=60)
+    cache.set(make_key("computing/products"), "products", ttl=60)
+
+    assert cache.invalidate("ssh-keys/42") == 2
+    assert make_key("computing/products") in cache
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_list_ssh_keys_is_cached(mock_request: mock.MagicMock) -> None:
+    """
+    Test that repeated list_ssh_keys reads are served from the cache.
+    """
+    mock_response = json_response([{"id": "123", "name": "test-key"}])
+    mock_request.return_value = mock_response
+
+    async with Client(mcp) as client:
+        await client.call_tool("list_ssh_keys", {})
+        await client.read_resource("mcp://ssh_keys")
+
+    assert mock_request.call_count == 1
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_create_ssh_key_invalidates_cached_list(mock_request: mock.MagicMock) -> None:
+    """
+    Test that create_ssh_key and delete_ssh_key invalidate the cached ssh-keys list.
+    """
+    mock_response = json_response([{"id": "123", "name": "test-key"}])
+    mock_request.return_value = mock_response
+
+    async with Client(mcp) as client:
+        await client.call_tool("list_ssh_keys", {})
+        await client.call_tool("create_ssh_key", {"key_name": "k", "key_data": "d"})
+        await client.call_tool("list_ssh_keys", {})
+        await client.call_tool("delete_ssh_key", {"id": "123"})
+        await client.call_tool("list_ssh_keys", {})
+
+    methods = [call.args[0] for call in mock_request.call_args_list]
+    assert methods == ["GET", "POST", "GET", "DELETE", "GET"]
@@ -0,0 +1,88 @@
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from src.cassette import Cassette, CassetteMiss, ReplayTransport
+from src.config import settings
+from src.main import mcp
+from src.tenancy import tenants
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["upstream.jsonl", "upstream.jsonl.gz"])
+async def test_recorded_session_replays_without_the_upstream(fake_api, monkeypatch, tmp_path, name) -> None:
+    """
+    Test that a recorded session replays identically without any network access.
+    """
+    path = str(tmp_path / name)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_API_KEY", "secret-key")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CASSETTE", path)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CASSETTE_MODE", "record")
+    fake_api.default("computing/instances", body={"data": [{"id": 1, "status": "Running"}]})
+    fake_api.default("ssh-keys", body={"data": [{"id": 7}]})
+    fake_api.default("computing/instance/1/stop", body={"message": "stopping"})
+
+    async def session():
+        async with Client(mcp) as client:
+            return [
+                json.loads((await client.call_tool(name, arguments))[0].text)
+                for name, arguments in [
+                    ("get_user_instances", {"limit": 10}),
+                    ("list_ssh_keys", {}),
+                    ("stop_gpu_instance", {"id": "1"}),
+                ]
+            ]
+
+    recorded = await session()
+    assert len(fake_api.requests) == 3
+    assert len(Cassette(path)) == 3
+
+    tenants.clear()
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CASSETTE_MODE", "replay")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_API_URL", "http://127.0.0.1:9")
+    assert await session() == recorded
+    assert len(fake_api.requests) == 3
+
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt") as file:
+        assert "secret-key" not in file.read()
+
+
+def test_cassette_answers_repeats_in_order_and_reports_misses(tmp_path) -> None:
+    path = tmp_path / "upstream.jsonl"
+    entries = [
+        {"method": "GET", "path": "/api/v1/computing/instance/1", "status": 200, "body": '{"status":"Starting"}'},
+        {"method": "GET", "path": "/api/v1/computing/instance/1", "status": 200, "body": '{"status":"Running"}'},
+    ]
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+    cassette = Cassette(str(path))
+    request = httpx.Request("GET", "https://api.example/api/v1/computing/instance/1")
+
+    statuses = [json.loads(cassette.next(request)["body"])["status"] for _ in range(3)]
+    assert statuses == ["Starting", "Running", "Running"]
+
+    with pytest.raises(CassetteMiss):
+        cassette.next(httpx.Request("GET", "https://api.example/api/v1/computing/instance/2"))
+
+
+@pytest.mark.asyncio
+async def test_replay_injects_latency(tmp_path) -> None:
+    path = tmp_path / "upstream.jsonl"
+    entry = {"method": "GET", "path": "/keys", "query": "b=2&a=1", "status": 200, "body": "[]", "elapsed": 0.05}
+    path.write_text(json.dumps(entry) + "\n")
+    cassette = Cassette(str(path))
+
+    for transport, minimum, maximum in [
+        (ReplayTransport(cassette), 0.05, 1.0),
+        (ReplayTransport(cassette, latency=0), 0.0, 0.04),
+    ]:
+        async with httpx.AsyncClient(transport=transport) as client:
+            started = time.perf_counter()
+            response = await client.get("http://upstream/keys", params={"a": 1, "b": 2})
+            elapsed = time.perf_counter() - started
+        assert response.json() == []
+        assert minimum <= elapsed < maximum
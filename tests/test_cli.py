@@ -0,0 +1,77 @@
+import mcp.types as types
+import pytest
+
+from click.testing import CliRunner
+from fastmcp.exceptions import ResourceError
+from mcp.server.lowlevel import NotificationOptions
+from unittest import mock
+from src import main as main_module
+from src.config import settings
+from src.tools import mcp
+
+
+def test_sse_rejects_multiple_workers() -> None:
+    """
+    Test that SSE refuses to start more than one worker.
+    """
+    result = CliRunner().invoke(main_module.main, ["--transport", "sse", "--workers", "2"])
+    assert result.exit_code != 0
+    assert "streamable-http" in result.output
+
+
+@mock.patch("uvicorn.run")
+def test_streamable_http_runs_uvicorn_with_workers(mock_run: mock.MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that network transports are served by uvicorn with the requested workers.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "stdio")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_WORKERS", 1)
+    monkeypatch.setenv("NEBULA_BLOCK_TRANSPORT", "stdio")
+    monkeypatch.setenv("NEBULA_BLOCK_WORKERS", "1")
+
+    result = CliRunner().invoke(
+        main_module.main,
+        ["--transport", "streamable-http", "--host", "0.0.0.0", "--port", "9000", "--workers", "3"],
+    )
+
+    assert result.exit_code == 0, result.output
+    mock_run.assert_called_once()
+    args, kwargs = mock_run.call_args
+    assert args == ("src.main:create_app",)
+    assert kwargs["factory"] is True
+    assert (kwargs["host"], kwargs["port"], kwargs["workers"]) == ("0.0.0.0", 9000, 3)
+
+
+def test_create_app_is_stateless_with_multiple_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that multi-worker Streamable HTTP apps do not depend on session affinity.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "streamable-http")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_WORKERS", 4)
+    monkeypatch.setattr(mcp.settings, "stateless_http", False)
+
+    app = main_module.create_app()
+
+    assert mcp.settings.stateless_http is True
+    assert app.state.path == "/mcp"
+
+
+@pytest.mark.asyncio
+async def test_stateless_app_does_not_offer_subscriptions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that stateless sessions neither advertise nor accept resource subscriptions.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "streamable-http")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_WORKERS", 2)
+    monkeypatch.setattr(mcp.settings, "stateless_http", mcp.settings.stateless_http)
+    main_module.create_app()
+
+    capabilities = mcp._mcp_server.get_capabilities(NotificationOptions(), {})
+    assert capabilities.resources.subscribe is False
+    handler = mcp._mcp_server.request_handlers[types.SubscribeRequest]
+    request = types.SubscribeRequest(
+        method="resources/subscribe", params=types.SubscribeRequestParams(uri="mcp://billing_user_credit_balance")
+    )
+    with pytest.raises(ResourceError, match="single worker"):
+        await handler(request)
+    assert mcp.subscriptions.active() == 0
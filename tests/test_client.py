@@ -0,0 +1,38 @@
+import pytest
+
+from src.client import PooledClient
+from src.config import settings
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_shared_within_event_loop() -> None:
+    """
+    Test that repeated calls on one event loop reuse the same client.
+    """
+    pool = PooledClient()
+    first = pool.get()
+    assert pool.get() is first
+    await pool.aclose()
+    assert first.is_closed
+    assert pool.get() is not first
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_uses_pool_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the pool limits and timeouts are taken from Settings.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_POOL_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_POOL_MAX_KEEPALIVE", 3)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_HTTP2", False)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_READ_TIMEOUT", 12.0)
+
+    pool = PooledClient()
+    client = pool.get()
+    transport_pool = client._transport._pool
+    assert transport_pool._max_connections == 7
+    assert transport_pool._max_keepalive_connections == 3
+    assert transport_pool._http2 is False
+    assert client.timeout.read == 12.0
+    await pool.aclose()
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from unittest import mock
+from src import tools
+from src.coalesce import Coalescer
+from src.config import settings
+from src.serialization import decode
+from src.tenancy import tenants
+from tests.fake_server import json_response
+
+
+def _slow_response(payloads: list):
+    async def _request(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        mock_response = json_response(payloads.pop(0))
+        return mock_response
+    return _request
+
+
+@pytest.mark.asyncio
+async def test_coalescer_shares_one_future() -> None:
+    """
+    Test that concurrent runs for the same key await a single factory call.
+    """
+    coalescer = Coalescer()
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(coalescer.run("k", factory) for _ in range(5)))
+    assert results == [1, 1, 1, 1, 1]
+    assert calls == 1
+    assert len(coalescer) == 0
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_concurrent_identical_gets_are_coalesced(mock_request: mock.MagicMock) -> None:
+    """
+    Test that parallel get_user_instances calls send one upstream request.
+    """
+    mock_request.side_effect = _slow_response([{"data": [{"id": "1"}]}])
+
+    results = await asyncio.gather(*(tools.TOOLS["get_user_instances"]() for _ in range(10)))
+
+    assert mock_request.call_count == 1
+    assert all(decode(result) == {"data": [{"id": "1"}]} for result in results)
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_stale_while_revalidate_serves_stale_and_refreshes(
+    mock_request: mock.MagicMock, monkeypatch: pytest.MonkeyPatch, clock
+) -> None:
+    """
+    Test that an expired users/credits entry is returned at once and refreshed in the background.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_SWR_ENABLED", True)
+    monkeypatch.setattr(tenants.get(settings.NEBULA_BLOCK_API_KEY).cache, "_clock", clock)
+    mock_request.side_effect = _slow_response([{"credit": 100}, {"credit": 90}])
+
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 100}
+    clock.now = settings.NEBULA_BLOCK_SWR_TTLS["users/credits"] + 1
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 100}
+
+    await asyncio.sleep(0.05)
+    assert mock_request.call_count == 2
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 90}
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_foreground_miss_joins_background_refresh(
+    mock_request: mock.MagicMock, monkeypatch: pytest.MonkeyPatch, clock
+) -> None:
+    """
+    Test that a cache miss during a background refresh waits for it instead of sending its own request.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_SWR_ENABLED", True)
+    monkeypatch.setattr(tenants.get(settings.NEBULA_BLOCK_API_KEY).cache, "_clock", clock)
+    mock_request.side_effect = _slow_response([{"credit": 100}, {"credit": 90}])
+
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 100}
+    clock.now = settings.NEBULA_BLOCK_SWR_TTLS["users/credits"] + 1
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 100}
+    clock.now += settings.NEBULA_BLOCK_SWR_MAX_STALE + 1
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 90}
+
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_instance_action_invalidates_instance_list(
+    mock_request: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that stop_gpu_instance drops the cached computing/instances listing.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_SWR_ENABLED", True)
+    mock_request.side_effect = _slow_response([{"data": []}, {"message": "ok"}, {"data": []}])
+
+    await tools.TOOLS["get_user_instances"]()
+    await tools.TOOLS["stop_gpu_instance"]("123")
+    await tools.TOOLS["get_user_instances"]()
+
+    assert mock_request.call_count == 3
@@ -0,0 +1,106 @@
+import gzip
+import json
+
+import pytest
+
+from src import tools
+from src.cache import make_key
+from src.config import settings
+from src.tenancy import tenants
+
+
+def sent_headers(fake_api, path: str, index: int = -1) -> dict:
+    requests = [headers for _, request_path, headers in fake_api.requests if request_path == path]
+    return {name.lower(): value for name, value in requests[index].items()}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_reuses_the_parsed_body(fake_api) -> None:
+    """
+    Test that a 304 answer to If-None-Match returns the object parsed the first time.
+    """
+    fake_api.reply("computing/instances", body={"data": [{"id": 1}]}, headers={"ETag": '"v1"'})
+    fake_api.reply("computing/instances", status=304, body=b"", headers={"ETag": '"v1"'})
+
+    first = await tools._make_api_request("computing/instances")
+    second = await tools._make_api_request("computing/instances")
+
+    assert second is first
+    assert "if-none-match" not in sent_headers(fake_api, "computing/instances", 0)
+    assert sent_headers(fake_api, "computing/instances")["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_last_modified_is_sent_back_and_changes_replace_it(fake_api) -> None:
+    stamp = "Mon, 05 Oct 2026 10:00:00 GMT"
+    fake_api.reply("users/credits", body={"data": 1}, headers={"Last-Modified": stamp})
+    fake_api.reply("users/credits", body={"data": 2}, headers={"ETag": '"v2"'})
+    fake_api.reply("users/credits", status=304, body=b"")
+
+    assert await tools._make_api_request("users/credits") == {"data": 1}
+    assert await tools._make_api_request("users/credits") == {"data": 2}
+    assert sent_headers(fake_api, "users/credits", 1)["if-modified-since"] == stamp
+    assert await tools._make_api_request("users/credits") == {"data": 2}
+    headers = sent_headers(fake_api, "users/credits")
+    assert headers["if-none-match"] == '"v2"' and "if-modified-since" not in headers
+
+
+@pytest.mark.asyncio
+async def test_raw_passthrough_reuses_the_raw_body(fake_api) -> None:
+    fake_api.reply("users/payments", body={"data": []}, headers={"ETag": '"p"'})
+    fake_api.reply("users/payments", status=304, body=b"")
+
+    first = await tools._make_api_request("users/payments", raw=True)
+    assert await tools._make_api_request("users/payments", raw=True) is first
+
+
+@pytest.mark.asyncio
+async def test_writes_drop_validators(fake_api) -> None:
+    fake_api.default("ssh-keys", body={"data": []}, headers={"ETag": '"k"'})
+
+    await tools.TOOLS["list_ssh_keys"]()
+    await tools.TOOLS["create_ssh_key"]("key", "ssh-ed25519 AAAA")
+    await tools.TOOLS["list_ssh_keys"]()
+
+    assert "if-none-match" not in sent_headers(fake_api, "ssh-keys")
+
+
+@pytest.mark.asyncio
+async def test_expired_disk_entry_is_revalidated(fake_api, tmp_path, monkeypatch) -> None:
+    """
+    Test that a new process revalidates an expired on-disk entry instead of refetching it.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setitem(settings.NEBULA_BLOCK_CACHE_TTLS, "computing/images", 300.0)
+    fake_api.reply("computing/images", body={"data": [{"id": "img-1"}]}, headers={"ETag": '"abc"'})
+    fake_api.reply("computing/images", status=304, body=b"")
+
+    await tools.TOOLS["list_available_os_images"]()
+    tenant = tenants.get(settings.NEBULA_BLOCK_API_KEY)
+    tenant.disk_cache.touch(tenant.scope, make_key("computing/images"), -1)
+    tenants.clear()
+
+    assert await tools.TOOLS["list_available_os_images"]() == {"data": [{"id": "img-1"}]}
+    assert sent_headers(fake_api, "computing/images")["if-none-match"] == '"abc"'
+    tenant = tenants.get(settings.NEBULA_BLOCK_API_KEY)
+    assert tenant.disk_cache.remaining(tenant.disk_cache.get(tenant.scope, make_key("computing/images"))) > 0
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_can_be_disabled(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CONDITIONAL_REQUESTS", False)
+    fake_api.default("computing/instances", body={"data": []}, headers={"ETag": '"v1"'})
+
+    await tools._make_api_request("computing/instances")
+    await tools._make_api_request("computing/instances")
+
+    assert "if-none-match" not in sent_headers(fake_api, "computing/instances")
+
+
+@pytest.mark.asyncio
+async def test_compressed_responses_are_negotiated_and_decoded(fake_api) -> None:
+    body = gzip.compress(json.dumps({"data": [{"id": 1}]}).encode())
+    fake_api.reply("computing/instances", body=body, headers={"Content-Encoding": "gzip"})
+
+    assert await tools._make_api_request("computing/instances") == {"data": [{"id": 1}]}
+    assert "gzip" in sent_headers(fake_api, "computing/instances")["accept-encoding"]
@@ -0,0 +1,71 @@
+import pytest
+
+from src import tools
+from src.cache import make_key
+from src.config import settings
+from src.disk_cache import DiskCache
+from src.tenancy import tenants
+
+
+def test_entries_expire_but_keep_validators(tmp_path, clock) -> None:
+    cache = DiskCache(str(tmp_path), clock=clock)
+    key = make_key("computing/products", {"region": "us"})
+    cache.set("tenant", key, b'{"data": []}', ttl=60, etag='"v1"', last_modified="Mon, 05 Oct 2026 10:00:00 GMT")
+
+    entry = cache.get("tenant", key)
+    assert entry.body == b'{"data": []}'
+    assert cache.remaining(entry) == 60
+    assert cache.get("other-tenant", key) is None
+
+    clock.now += 61
+    entry = cache.get("tenant", key)
+    assert cache.remaining(entry) < 0
+    assert (entry.etag, entry.last_modified) == ('"v1"', "Mon, 05 Oct 2026 10:00:00 GMT")
+
+    cache.touch("tenant", key, ttl=30)
+    assert cache.remaining(cache.get("tenant", key)) == 30
+
+
+def test_processes_share_entries_and_invalidations(tmp_path) -> None:
+    first = DiskCache(str(tmp_path))
+    second = DiskCache(str(tmp_path))
+    first.set("tenant", make_key("ssh-keys"), b"[1]", ttl=60)
+    first.set("tenant", make_key("computing/instances"), b"[2]", ttl=60)
+    first.set("tenant", make_key("computing/products"), b"[3]", ttl=60)
+
+    assert second.get("tenant", make_key("ssh-keys")).body == b"[1]"
+    assert second.invalidate("tenant", "ssh-keys/42") == 1
+    assert second.invalidate("tenant", "computing/instance/7/start") == 1
+    assert first.get("tenant", make_key("ssh-keys")) is None
+    assert first.get("tenant", make_key("computing/instances")) is None
+    assert first.get("tenant", make_key("computing/products")) is not None
+
+
+@pytest.mark.asyncio
+async def test_warm_start_serves_catalog_without_network(fake_api, tmp_path, monkeypatch) -> None:
+    """
+    Test that a new process (empty in-memory state) reads catalog data from disk.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CACHE_DIR", str(tmp_path))
+    fake_api.default("computing/images", body={"data": [{"id": "img-1"}]}, headers={"ETag": '"abc"'})
+
+    assert await tools.TOOLS["list_available_os_images"]() == {"data": [{"id": "img-1"}]}
+    tenants.clear()
+    assert await tools.TOOLS["list_available_os_images"]() == {"data": [{"id": "img-1"}]}
+
+    assert fake_api.count("computing/images") == 1
+    tenant = tenants.get(settings.NEBULA_BLOCK_API_KEY)
+    assert tenant.disk_cache.get(tenant.scope, make_key("computing/images")).etag == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_the_disk_cache(fake_api, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CACHE_DIR", str(tmp_path))
+    fake_api.default("ssh-keys", body={"data": []})
+
+    await tools.TOOLS["list_ssh_keys"]()
+    await tools.TOOLS["create_ssh_key"]("key", "ssh-ed25519 AAAA")
+    tenants.clear()
+    await tools.TOOLS["list_ssh_keys"]()
+
+    assert fake_api.count("ssh-keys") == 3
@@ -0,0 +1,120 @@
+import json
+import os
+
+import pytest
+from fastmcp import Client
+
+from src import docs, tools
+from src.docs import DocsIndex
+from src.main import mcp
+
+
+def write(directory, path: str, text: str, mtime: int = None) -> None:
+    full = os.path.join(directory, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "w") as handle:
+        handle.write(text)
+    if mtime is not None:
+        os.utime(full, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def pages(tmp_path):
+    directory = tmp_path / "docs"
+    write(directory, "instances.md", "# GPU Instances\n\nCreate, start, stop and reboot GPU instances.")
+    write(directory, "billing/credits.md", "# Credits\n\nYour credit balance pays for instances.")
+    write(
+        directory,
+        "keys.html",
+        "<html><head><title>SSH Keys</title><style>.x{}</style></head><body><h1>Keys</h1><p>Upload an SSH key.</p></body></html>",
+    )
+    write(directory, "notes.txt", "instances instances instances")
+    return directory
+
+
+def test_search_ranks_pages_with_bm25(pages, tmp_path) -> None:
+    index = DocsIndex(str(pages), str(tmp_path / "index" / "docs.idx"))
+    assert index.refresh() is True
+
+    results = index.search("reboot gpu instances")
+    assert [result["path"] for result in results] == ["instances.md", "billing/credits.md"]
+    assert results[0]["title"] == "GPU Instances"
+    assert results[0]["uri"] == "mcp://docs/instances.md"
+    assert index.search("ssh")[0]["title"] == "SSH Keys"
+    assert index.search("style") == []
+    assert index.search("nothing-matches") == []
+
+
+def test_rebuild_rereads_only_changed_pages(pages, tmp_path, monkeypatch) -> None:
+    index_path = str(tmp_path / "docs.idx")
+    DocsIndex(str(pages), index_path).refresh()
+    read = []
+    extract_text = docs.extract_text
+    monkeypatch.setattr(docs, "extract_text", lambda path, source: read.append(path) or extract_text(path, source))
+
+    index = DocsIndex(str(pages), index_path)
+    assert index.refresh() is False
+    assert len(index.pages) == 3 and read == []
+
+    write(pages, "billing/credits.md", "# Credits\n\nTop up credits with a card.", mtime=1)
+    os.remove(pages / "keys.html")
+    write(pages, "images.md", "# OS Images\n\nUbuntu images with drivers.")
+    assert index.refresh(force=True) is True
+
+    assert sorted(read) == ["billing/credits.md", "images.md"]
+    assert index.search("card")[0]["path"] == "billing/credits.md"
+    assert index.search("reboot")[0]["path"] == "instances.md"
+    assert index.search("ssh") == []
+    assert index.search("ubuntu")[0]["path"] == "images.md"
+
+
+def test_only_indexed_pages_can_be_read(pages, tmp_path) -> None:
+    index = DocsIndex(str(pages), str(tmp_path / "docs.idx"))
+    index.refresh()
+
+    assert index.read("billing/credits.md").startswith("# Credits")
+    with pytest.raises(ValueError):
+        index.read("../docs.idx")
+
+
+def test_planted_index_cannot_serve_files_outside_the_docs(pages, tmp_path) -> None:
+    """
+    Test that an index listing pages outside the docs directory is discarded and rebuilt.
+    """
+    write(tmp_path, "secret.md", "# Secret")
+    index_path = str(tmp_path / "docs.idx")
+    planted = DocsIndex(str(pages), index_path)
+    page = {"path": "../secret.md", "title": "Secret", "mtime_ns": 0, "size": 8, "length": 1, "summary": "Secret"}
+    planted._write({"pages": [page], "lexicon": {}, "postings": 0}, ())
+
+    index = DocsIndex(str(pages), index_path)
+    index._load()
+    assert index.pages == []
+    with pytest.raises(ValueError):
+        index.read("../secret.md")
+
+    index.refresh()
+    assert sorted(page["path"] for page in index.pages) == ["billing/credits.md", "instances.md", "keys.html"]
+
+
+def test_index_defaults_to_a_private_user_directory(pages, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    index = DocsIndex(str(pages))
+    index.refresh()
+
+    directory = os.path.dirname(index.index_path)
+    assert directory == str(tmp_path / "home" / ".cache" / "nebulablock")
+    assert os.stat(directory).st_mode & 0o077 == 0
+
+
+@pytest.mark.asyncio
+async def test_search_docs_tool_and_page_resources(pages, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(tools, "docs_index", DocsIndex(str(pages), str(tmp_path / "docs.idx")))
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("search_docs", {"query": "credit balance", "limit": 1})
+        found = json.loads(result[0].text)["results"]
+        page = await client.read_resource(found[0]["uri"])
+
+    assert [hit["path"] for hit in found] == ["billing/credits.md"]
+    assert page[0].text.startswith("# Credits")
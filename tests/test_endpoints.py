@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from src import tools
+from src.endpoints import ENDPOINTS, Endpoint, Pagination, Param, register_endpoints
+
+
+def _server(*endpoints: Endpoint) -> FastMCP:
+    server = FastMCP("endpoints-test")
+    register_endpoints(server, endpoints, tools._call_endpoint, tools._paginate_endpoint, __name__)
+    return server
+
+
+def test_endpoint_builds_paths_queries_and_bodies() -> None:
+    endpoint = Endpoint(
+        "rename_ssh_key", "PUT", "ssh-keys/{id}", (Param("id", location="path"), Param("key_name", location="body"))
+    )
+    arguments = {"id": "a/b c", "key_name": "laptop"}
+
+    assert endpoint.url_path(arguments) == "ssh-keys/a%2Fb%20c"
+    assert endpoint.query(arguments) is None
+    assert endpoint.body(arguments) == {"key_name": "laptop"}
+
+    listing = Endpoint("list_things", "GET", "things", (Param("limit", int, None),))
+    assert listing.query({"limit": None}) == {}
+    assert listing.query({"limit": 5}) == {"limit": 5}
+
+
+def test_table_tool_names_are_unique() -> None:
+    names = [endpoint.name for endpoint in ENDPOINTS]
+    names += [endpoint.pagination.name for endpoint in ENDPOINTS if endpoint.pagination]
+    assert len(names) == len(set(names))
+
+
+@pytest.mark.asyncio
+async def test_one_table_entry_adds_a_tool_resource_and_pagination(fake_api) -> None:
+    """
+    Test that a new table entry is served through the shared request pipeline.
+    """
+    server = _server(
+        Endpoint(
+            "list_volumes",
+            "GET",
+            "computing/volumes",
+            (Param("limit", int, None), Param("offset", int, None)),
+            description="List the user's volumes.",
+            resources=("mcp://volumes",),
+            shaped=True,
+            pagination=Pagination("list_all_volumes", "List all volumes in one call."),
+        ),
+        Endpoint("delete_volume", "DELETE", "computing/volume/{id}", (Param("id", location="path"),)),
+    )
+    fake_api.default("computing/volumes", body={"data": [{"id": 1, "size": 10}, {"id": 2, "size": 20}]})
+    fake_api.default("computing/volume/1", body={"message": "deleted"})
+
+    async with Client(server) as client:
+        listed = {tool.name: tool for tool in await client.list_tools()}
+        shaped = await client.call_tool("list_volumes", {"fields": ["id"], "match": {"size": "20"}})
+        resource = await client.read_resource("mcp://volumes")
+        everything = await client.call_tool("list_all_volumes", {"page_size": 5})
+        deleted = await client.call_tool("delete_volume", {"id": "1"})
+
+    assert listed["list_volumes"].description == "List the user's volumes."
+    assert set(listed["list_volumes"].inputSchema["properties"]) == {"limit", "offset", "fields", "match"}
+    assert listed["delete_volume"].inputSchema["required"] == ["id"]
+    assert json.loads(shaped[0].text) == {"data": [{"id": 2}]}
+    assert json.loads(resource[0].text)["data"][0] == {"id": 1, "size": 10}
+    assert json.loads(everything[0].text)["count"] == 2
+    assert json.loads(deleted[0].text) == {"message": "deleted"}
+    assert ("DELETE", "computing/volume/1") in [(method, path) for method, path, _ in fake_api.requests]
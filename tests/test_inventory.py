@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from fastmcp.client import Client
+from unittest import mock
+from src.inventory import INSTANCE_FIELDS, Inventory, InventoryStore, Table
+from src.tools import mcp
+from tests.fake_server import json_response
+
+INSTANCES = [
+    {"id": "1", "instance_name": "train-a", "status": "Running", "product_id": "prod-7f3c2a", "region": "us-east"},
+    {"id": "2", "instance_name": "train-b", "status": "Stopped", "product_id": "prod-7f3c2a", "region": "us-east"},
+    {
+        "id": "3",
+        "instance_name": "infer-a",
+        "status": "Running",
+        "product_id": "prod-91be04",
+        "product_name": "H100",
+        "region": "eu-west",
+    },
+]
+PRODUCTS = [
+    {"id": "prod-7f3c2a", "name": "A100", "region": "us-east"},
+    {"id": "prod-91be04", "name": "H100", "region": "eu-west"},
+]
+
+
+def test_table_query_uses_every_filter() -> None:
+    """
+    Test that queries intersect the indexed filters case-insensitively.
+    """
+    table = Table(INSTANCE_FIELDS)
+    table.sync(INSTANCES)
+
+    rows = table.query({"status": "running", "product": "PROD-7F3C2A", "region": None})
+    assert [row["id"] for row in rows] == ["1"]
+    assert [row["id"] for row in table.query({"product": "h100"})] == ["3"]
+    assert [row["id"] for row in table.query({"product": "prod-91be04"})] == ["3"]
+    assert {row["id"] for row in table.query({}, name_contains="train")} == {"1", "2"}
+    assert table.query({"region": "ap-south"}) == []
+    with pytest.raises(ValueError):
+        table.query({"colour": "red"})
+
+
+def test_instances_are_found_by_product_name() -> None:
+    """
+    Test that an instance listing only a product ID is found by the product's name.
+    """
+    inventory = Inventory("key-a")
+    inventory.apply("instances", INSTANCES)
+    inventory.apply("products", PRODUCTS)
+
+    assert {row["id"] for row in inventory.query("instances", {"product": "A100"})} == {"1", "2"}
+    assert [row["id"] for row in inventory.query("instances", {"product": "a100", "status": "stopped"})] == ["2"]
+    assert [row["id"] for row in inventory.query("instances", {"product": "H100"})] == ["3"]
+    assert inventory.query("instances", {"product": "L40S"}) == []
+
+
+def test_table_sync_only_touches_changed_rows() -> None:
+    """
+    Test that a sync reports changed and removed rows and re-indexes updates.
+    """
+    table = Table(INSTANCE_FIELDS)
+    table.sync(INSTANCES)
+
+    updated = [dict(INSTANCES[0], status="Stopped"), INSTANCES[1]]
+    changed, removed = table.sync(updated)
+
+    assert changed == ["1"]
+    assert removed == ["3"]
+    assert {row["id"] for row in table.query({"status": "stopped"})} == {"1", "2"}
+    assert table.query({"status": "running"}) == []
+
+
+def test_inventory_persists_to_sqlite(tmp_path) -> None:
+    """
+    Test that an inventory backed by SQLite is reloaded by a new process.
+    """
+    store = InventoryStore(str(tmp_path / "inventory.db"))
+    inventory = Inventory("key-a", store)
+    inventory.apply("instances", INSTANCES, deleted_ids=["2"])
+    store.close()
+
+    reloaded = Inventory("key-a", InventoryStore(str(tmp_path / "inventory.db")))
+    assert set(reloaded.tables["instances"].rows) == {"1", "3"}
+    assert len(Inventory("key-b", InventoryStore(str(tmp_path / "inventory.db"))).tables["instances"]) == 0
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_query_inventory_syncs_once(mock_request: mock.MagicMock) -> None:
+    """
+    Test that query_inventory answers repeated queries from the local index.
+    """
+    payloads = {
+        "computing/instances": lambda params: {"data": INSTANCES[params["offset"]:][:params["limit"]]},
+        "computing/deleted-instances": lambda params: [{"id": "2"}],
+        "computing/products": lambda params: PRODUCTS,
+        "computing/images": lambda params: [{"id": "ubuntu", "name": "Ubuntu 22.04"}],
+    }
+
+    async def _request(method, url, headers=None, params=None, **kwargs):
+        mock_response = json_response(payloads[url.split("/api/v1/", 1)[1]](params))
+        return mock_response
+
+    mock_request.side_effect = _request
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("query_inventory", {"status": "Running", "product": "A100"})
+        calls_after_sync = mock_request.call_count
+        stopped = await client.call_tool("query_inventory", {"status": "Stopped"})
+        products = await client.call_tool("query_inventory", {"kind": "products", "region": "us-east"})
+
+    assert [row["id"] for row in json.loads(result[0].text)["data"]] == ["1"]
+    assert json.loads(stopped[0].text)["count"] == 0
+    assert [row["id"] for row in json.loads(products[0].text)["data"]] == ["prod-7f3c2a"]
+    assert mock_request.call_count == calls_after_sync
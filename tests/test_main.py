@@ -5,18 +5,17 @@ from fastmcp.client import Client
 from unittest import mock
 from src.tools import mcp
 from src.config import settings
+from tests.fake_server import json_response
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_computing_products(mock_get: mock.MagicMock) -> None:
     """
     Test that get_computing_products resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"products": ["product1", "product2"]}
+    mock_response = json_response({"products": ["product1", "product2"]})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -26,6 +25,7 @@ async def test_get_computing_products(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/products",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -36,15 +36,13 @@ async def test_get_computing_products(mock_get: mock.MagicMock) -> None:
     assert json.loads(result[0].text) == {"products": ["product1", "product2"]}
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_user_instances(mock_get: mock.MagicMock) -> None:
     """
     Test that get_user_instances resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"data": [{"id": "123", "host_name": "test-instance"}]}
+    mock_response = json_response({"data": [{"id": "123", "host_name": "test-instance"}]})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -54,6 +52,7 @@ async def test_get_user_instances(mock_get: mock.MagicMock) -> None:
 
     # Assertions for call without limit and offset
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instances",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -72,6 +71,7 @@ async def test_get_user_instances(mock_get: mock.MagicMock) -> None:
 
     # Assertions for call with limit and offset
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instances",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -82,15 +82,13 @@ async def test_get_user_instances(mock_get: mock.MagicMock) -> None:
     assert json.loads(result_with_params[0].text) == {"data": [{"id": "123", "host_name": "test-instance"}]}
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_computing_products_api_error(mock_get: mock.MagicMock) -> None:
     """
     Test get_computing_products when the API returns an error (e.g., 500).
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 500
-    mock_response.raise_for_status.side_effect = Exception("Internal Server Error")
+    mock_response = json_response({"message": "Internal Server Error"}, 500)
     mock_get.return_value = mock_response
 
     async with Client(mcp) as client:
@@ -99,15 +97,13 @@ async def test_get_computing_products_api_error(mock_get: mock.MagicMock) -> Non
     assert "Internal Server Error" in str(excinfo.value)
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_user_instances_api_unauthorized(mock_get: mock.MagicMock) -> None:
     """
     Test get_user_instances when the API returns a 401 Unauthorized error.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 401
-    mock_response.raise_for_status.side_effect = Exception("Unauthorized")
+    mock_response = json_response({"message": "Unauthorized"}, 401)
     mock_get.return_value = mock_response
 
     async with Client(mcp) as client:
@@ -125,15 +121,13 @@ async def test_get_user_instances_missing_params():
             await client.read_resource("mcp://user_instances?limit=abc&offset=None")
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_user_instances_invalid_limit(mock_get: mock.MagicMock) -> None:
     """
     Test get_user_instances with a negative limit (abnormal input data).
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 400
-    mock_response.raise_for_status.side_effect = Exception("Invalid limit")
+    mock_response = json_response({"message": "Invalid limit"}, 400, reason="Invalid limit")
     mock_get.return_value = mock_response
 
     async with Client(mcp) as client:
@@ -143,15 +137,13 @@ async def test_get_user_instances_invalid_limit(mock_get: mock.MagicMock) -> Non
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_user_instance_detail(mock_get: mock.MagicMock) -> None:
     """
     Test that get_user_instance_detail resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"id": "123", "host_name": "test-instance"}
+    mock_response = json_response({"id": "123", "host_name": "test-instance"})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -161,6 +153,7 @@ async def test_get_user_instance_detail(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/123",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -172,15 +165,13 @@ async def test_get_user_instance_detail(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_list_deleted_user_instances(mock_get: mock.MagicMock) -> None:
     """
     Test that list_deleted_user_instances resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "host_name": "test-instance"}]
+    mock_response = json_response([{"id": "123", "host_name": "test-instance"}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -190,6 +181,7 @@ async def test_list_deleted_user_instances(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/deleted-instances",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -201,15 +193,13 @@ async def test_list_deleted_user_instances(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_user_credit_balance(mock_get: mock.MagicMock) -> None:
     """
     Test that get_user_credit_balance resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"credit": 100}
+    mock_response = json_response({"credit": 100})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -219,6 +209,7 @@ async def test_get_user_credit_balance(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/users/credits",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -230,15 +221,13 @@ async def test_get_user_credit_balance(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_list_user_invoices(mock_get: mock.MagicMock) -> None:
     """
     Test that list_user_invoices resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "amount": 100}]
+    mock_response = json_response([{"id": "123", "amount": 100}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -248,6 +237,7 @@ async def test_list_user_invoices(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/users/invoices",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -259,15 +249,13 @@ async def test_list_user_invoices(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_list_api_keys(mock_get: mock.MagicMock) -> None:
     """
     Test that list_api_keys resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "name": "test-key"}]
+    mock_response = json_response([{"id": "123", "name": "test-key"}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -277,6 +265,7 @@ async def test_list_api_keys(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/api_keys",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -288,15 +277,13 @@ async def test_list_api_keys(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_list_ssh_keys(mock_get: mock.MagicMock) -> None:
     """
     Test that list_ssh_keys resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "name": "test-key"}]
+    mock_response = json_response([{"id": "123", "name": "test-key"}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -306,6 +293,7 @@ async def test_list_ssh_keys(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/ssh-keys",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -317,15 +305,13 @@ async def test_list_ssh_keys(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.delete")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_delete_gpu_instance(mock_delete: mock.MagicMock) -> None:
     """
     Test that delete_gpu_instance tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "Instance deleted successfully"}
+    mock_response = json_response({"message": "Instance deleted successfully"})
     mock_delete.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -335,6 +321,7 @@ async def test_delete_gpu_instance(mock_delete: mock.MagicMock) -> None:
 
     # Assertions
     mock_delete.assert_called_once_with(
+        "DELETE",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/123",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -345,15 +332,13 @@ async def test_delete_gpu_instance(mock_delete: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_start_gpu_instance(mock_get: mock.MagicMock) -> None:
     """
     Test that start_gpu_instance tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "Instance started successfully"}
+    mock_response = json_response({"message": "Instance started successfully"})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -363,6 +348,7 @@ async def test_start_gpu_instance(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/123/start",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -374,15 +360,13 @@ async def test_start_gpu_instance(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_stop_gpu_instance(mock_get: mock.MagicMock) -> None:
     """
     Test that stop_gpu_instance tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "Instance stopped successfully"}
+    mock_response = json_response({"message": "Instance stopped successfully"})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -392,6 +376,7 @@ async def test_stop_gpu_instance(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/123/stop",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -403,15 +388,13 @@ async def test_stop_gpu_instance(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_reboot_gpu_instance(mock_get: mock.MagicMock) -> None:
     """
     Test that reboot_gpu_instance tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "Instance rebooted successfully"}
+    mock_response = json_response({"message": "Instance rebooted successfully"})
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -421,6 +404,7 @@ async def test_reboot_gpu_instance(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance/123/reboot",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -432,15 +416,13 @@ async def test_reboot_gpu_instance(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.post")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_create_gpu_instance(mock_post: mock.MagicMock) -> None:
     """
     Test that create_gpu_instance tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "Instance created successfully"}
+    mock_response = json_response({"message": "Instance created successfully"})
     mock_post.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -458,6 +440,7 @@ async def test_create_gpu_instance(mock_post: mock.MagicMock) -> None:
 
     # Assertions
     mock_post.assert_called_once_with(
+        "POST",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/instance",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -474,15 +457,13 @@ async def test_create_gpu_instance(mock_post: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.delete")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_delete_ssh_key(mock_delete: mock.MagicMock) -> None:
     """
     Test that delete_ssh_key tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "SSH key deleted successfully"}
+    mock_response = json_response({"message": "SSH key deleted successfully"})
     mock_delete.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -492,6 +473,7 @@ async def test_delete_ssh_key(mock_delete: mock.MagicMock) -> None:
 
     # Assertions
     mock_delete.assert_called_once_with(
+        "DELETE",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/ssh-keys/123",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -502,15 +484,13 @@ async def test_delete_ssh_key(mock_delete: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_list_available_os_images(mock_get: mock.MagicMock) -> None:
     """
     Test that list_available_os_images resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "name": "test-image"}]
+    mock_response = json_response([{"id": "123", "name": "test-image"}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -520,6 +500,7 @@ async def test_list_available_os_images(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/computing/images",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -531,15 +512,13 @@ async def test_list_available_os_images(mock_get: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.post")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_create_ssh_key(mock_post: mock.MagicMock) -> None:
     """
     Test that create_ssh_key tool calls the correct API endpoint.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"message": "SSH key created successfully"}
+    mock_response = json_response({"message": "SSH key created successfully"})
     mock_post.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -555,6 +534,7 @@ async def test_create_ssh_key(mock_post: mock.MagicMock) -> None:
 
     # Assertions
     mock_post.assert_called_once_with(
+        "POST",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/ssh-keys",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
@@ -569,15 +549,13 @@ async def test_create_ssh_key(mock_post: mock.MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-@mock.patch("requests.get")
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
 async def test_get_payment_history(mock_get: mock.MagicMock) -> None:
     """
     Test that get_payment_history resource returns expected data.
     """
     # Mock the response from the external API
-    mock_response = mock.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"id": "123", "amount": 100}]
+    mock_response = json_response([{"id": "123", "amount": 100}])
     mock_get.return_value = mock_response
 
     # Create a FastMCP Client instance
@@ -587,6 +565,7 @@ async def test_get_payment_history(mock_get: mock.MagicMock) -> None:
 
     # Assertions
     mock_get.assert_called_once_with(
+        "GET",
         f"{settings.NEBULA_BLOCK_API_URL}/api/v1/users/credits/history",
         headers={
             "Authorization": f"Bearer {settings.NEBULA_BLOCK_API_KEY}",
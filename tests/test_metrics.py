@@ -0,0 +1,94 @@
+import httpx
+import pytest
+from fastmcp.client import Client
+
+from src import main as main_module
+from src import metrics
+from src.config import settings
+from src.tools import mcp
+
+
+@pytest.fixture
+def metrics_enabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_endpoint_label_collapses_ids() -> None:
+    assert metrics.endpoint_label("computing/instance/8f3a-12/start") == "computing/instance/{id}/start"
+    assert metrics.endpoint_label("ssh-keys/42") == "ssh-keys/{id}"
+    assert metrics.endpoint_label("users/credits/history") == "users/credits/history"
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = metrics.Histogram("demo_seconds", "Demo.", ("tool",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{tool="a",le="0.1"} 1',
+        'demo_seconds_bucket{tool="a",le="1"} 2',
+        'demo_seconds_bucket{tool="a",le="+Inf"} 3',
+        'demo_seconds_sum{tool="a"} 5.55',
+        'demo_seconds_count{tool="a"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_record_latency_cache_and_retries(fake_api, metrics_enabled, monkeypatch) -> None:
+    """
+    Test that tool dispatch and the request layer feed the metrics.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRY_BACKOFF", 0.0)
+    fake_api.default("keys", body={"data": [{"id": "k1"}]})
+    fake_api.reply("users/credits", status=503, body={"message": "busy"})
+    fake_api.reply("users/credits", body={"credit": 7})
+
+    async with Client(mcp) as client:
+        await client.call_tool("list_api_keys", {})
+        await client.call_tool("list_api_keys", {})
+        await client.call_tool("get_user_credit_balance", {})
+
+    assert metrics.tool_duration.count("list_api_keys", "ok") == 2
+    assert metrics.cache_requests.value("keys", "miss") == 1
+    assert metrics.cache_requests.value("keys", "hit") == 1
+    assert metrics.upstream_duration.count("GET", "keys", "200") == 1
+    assert metrics.upstream_retries.value("GET", "users/credits") == 1
+    assert metrics.upstream_response_bytes.count("GET", "users/credits") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_route(fake_api, metrics_enabled, monkeypatch) -> None:
+    """
+    Test that the network app serves the Prometheus text format.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "streamable-http")
+    fake_api.default("users/credits", body={"credit": 7})
+    async with Client(mcp) as client:
+        await client.call_tool("get_user_credit_balance", {})
+
+    app = main_module.create_app()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'nebula_block_tool_duration_seconds_count{tool="get_user_credit_balance",status="ok"} 1' in response.text
+    assert 'nebula_block_upstream_duration_seconds_count{method="GET",endpoint="users/credits",status="200"} 1' in response.text
+    assert 'nebula_block_pool_connections{state="idle"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_is_off_by_default(monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "enabled", False)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "streamable-http")
+    app = main_module.create_app()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/metrics")
+
+    assert response.status_code == 404
@@ -0,0 +1,71 @@
+import json
+import time
+
+import pytest
+from fastmcp import Client
+
+from src.main import mcp
+from src.overview import build_overview
+
+PRODUCTS = {"data": [{"id": "p1", "name": "RTX 4090", "price": 0.5, "region": "us"}, {"id": "p2", "name": "H100", "price": 2}]}
+INSTANCES = {
+    "data": [
+        {"id": 1, "instance_name": "train", "status": "Running", "product_id": "p2", "ip": "10.0.0.1"},
+        {"id": 2, "instance_name": "dev", "status": "Stopped", "product_id": "p1"},
+        {"id": 3, "instance_name": "infer", "status": "Running", "product_id": "p1"},
+    ]
+}
+
+
+def test_instances_are_joined_with_product_pricing() -> None:
+    overview = build_overview({"instances": INSTANCES, "products": PRODUCTS}, {})
+
+    instances = overview["instances"]
+    assert instances["count"] == 3
+    assert instances["by_status"] == {"Running": 2, "Stopped": 1}
+    assert instances["running_hourly_cost"] == 2.5
+    assert instances["data"][0] == {
+        "id": 1, "name": "train", "status": "Running", "product_id": "p2", "product": {"name": "H100", "price": 2},
+    }
+    assert "credits" not in overview and overview["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_overview_fans_out_concurrently(fake_api) -> None:
+    """
+    Test that the overview takes about as long as the slowest upstream call, not their sum.
+    """
+    fake_api.default("users/credits", body={"credit": 100}, delay=0.2)
+    fake_api.default("computing/instances", body=INSTANCES, delay=0.2)
+    fake_api.default("ssh-keys", body={"data": [{"id": 7, "key_name": "laptop", "key_data": "ssh-ed25519 AAAA"}]}, delay=0.2)
+    fake_api.default("computing/products", body=PRODUCTS, delay=0.2)
+    fake_api.default("computing/images", body=[{"id": "img", "name": "Ubuntu", "version": "22.04", "driver": "x"}], delay=0.2)
+
+    async with Client(mcp) as client:
+        started = time.perf_counter()
+        result = await client.call_tool("get_account_overview", {})
+        elapsed = time.perf_counter() - started
+
+    overview = json.loads(result[0].text)
+    assert elapsed < 0.6
+    assert overview["credits"] == {"credit": 100}
+    assert overview["ssh_keys"] == [{"id": 7, "name": "laptop"}]
+    assert overview["images"] == [{"id": "img", "name": "Ubuntu", "version": "22.04"}]
+    assert overview["instances"]["running_hourly_cost"] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_failed_sections_are_reported(fake_api) -> None:
+    fake_api.default("users/credits", body={"credit": 100})
+    fake_api.default("computing/instances", body=INSTANCES)
+    fake_api.default("ssh-keys", status=403, body={"message": "Forbidden"})
+    fake_api.default("computing/products", body=PRODUCTS)
+    fake_api.default("computing/images", body=[])
+
+    async with Client(mcp) as client:
+        result = await client.read_resource("mcp://account_overview")
+
+    overview = json.loads(result[0].text)
+    assert "ssh_keys" not in overview
+    assert "403" in overview["errors"]["ssh_keys"]
+    assert overview["instances"]["count"] == 3
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from fastmcp.client import Client
+from unittest import mock
+from src.pagination import extract_records, iter_pages, iter_records
+from src.tools import mcp
+from tests.fake_server import json_response
+
+
+def _fake_pages(total: int, delay: float = 0.0):
+    state = {"calls": [], "active": 0, "max_active": 0}
+
+    async def fetch_page(offset: int, limit: int):
+        state["calls"].append(offset)
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+            return [{"id": i} for i in range(offset, min(offset + limit, total))]
+        finally:
+            state["active"] -= 1
+
+    return fetch_page, state
+
+
+def test_extract_records_accepts_list_and_data_object() -> None:
+    """
+    Test that both bare arrays and {"data": [...]} pages are understood.
+    """
+    assert extract_records([1, 2]) == [1, 2]
+    assert extract_records({"data": [3]}) == [3]
+    with pytest.raises(ValueError):
+        extract_records({"message": "nope"})
+
+
+@pytest.mark.asyncio
+async def test_iter_records_yields_every_record_in_order() -> None:
+    """
+    Test that records across all pages are streamed in order.
+    """
+    fetch_page, _ = _fake_pages(total=95)
+    records = [record["id"] async for record in iter_records(fetch_page, page_size=10, prefetch=3)]
+    assert records == list(range(95))
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_bounds_concurrent_requests() -> None:
+    """
+    Test that no more than `prefetch` pages are requested at once.
+    """
+    fetch_page, state = _fake_pages(total=200, delay=0.005)
+    pages = [page async for page in iter_pages(fetch_page, page_size=10, prefetch=4)]
+    assert len(pages) == 20
+    assert state["max_active"] == 4
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_stops_after_short_page() -> None:
+    """
+    Test that an exactly full final page ends the listing with one empty page probe.
+    """
+    fetch_page, _ = _fake_pages(total=20)
+    pages = [page async for page in iter_pages(fetch_page, page_size=10, prefetch=1)]
+    assert [len(page) for page in pages] == [10, 10]
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_list_all_user_invoices(mock_request: mock.MagicMock) -> None:
+    """
+    Test that list_all_user_invoices follows pages and returns a resume offset.
+    """
+    async def _request(method, url, headers=None, params=None):
+        start = params["offset"]
+        return json_response([{"id": i} for i in range(start, min(start + params["limit"], 25))])
+
+    mock_request.side_effect = _request
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("list_all_user_invoices", {"page_size": 10})
+        partial = await client.call_tool(
+            "list_all_user_invoices", {"page_size": 10, "max_records": 15}
+        )
+
+    data = json.loads(result[0].text)
+    assert data["count"] == 25
+    assert [row["id"] for row in data["data"]] == list(range(25))
+    assert data["next_offset"] is None
+
+    data = json.loads(partial[0].text)
+    assert data["count"] == 15
+    assert data["next_offset"] == 15
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from fastmcp.client import Client
+from unittest import mock
+
+from src.projection import parse_fields, shape
+from src.tools import TOOLS, mcp
+from tests.fake_server import json_response
+
+INSTANCES = {
+    "data": [
+        {"id": "1", "status": "Running", "billing": {"amount": 1.5, "currency": "USD"}, "gpus": [{"model": "H100", "vram": 80}]},
+        {"id": "2", "status": "Stopped", "billing": {"amount": 0.5, "currency": "USD"}, "gpus": []},
+    ],
+    "total": 2,
+}
+
+
+def test_parse_fields_accepts_strings_and_lists() -> None:
+    assert parse_fields("id, billing.amount") == [["id"], ["billing", "amount"]]
+    assert parse_fields(["id"]) == [["id"]]
+    assert parse_fields("") is None
+    assert parse_fields(None) is None
+
+
+def test_shape_projects_nested_fields_and_keeps_envelope() -> None:
+    result = shape(INSTANCES, ["id", "billing.amount", "gpus.model"])
+    assert result == {
+        "data": [
+            {"id": "1", "billing": {"amount": 1.5}, "gpus": [{"model": "H100"}]},
+            {"id": "2", "billing": {"amount": 0.5}, "gpus": []},
+        ],
+        "total": 2,
+    }
+
+
+def test_shape_filters_records() -> None:
+    assert shape(INSTANCES["data"], "id", {"status": "running"}) == [{"id": "1"}]
+    assert shape(INSTANCES, match={"billing.currency": "EUR"})["data"] == []
+    assert shape(INSTANCES) is INSTANCES
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_get_user_instances_with_fields(mock_request: mock.MagicMock) -> None:
+    """
+    Test that the tool only returns the requested fields of matching records.
+    """
+    mock_response = json_response(INSTANCES)
+    mock_request.return_value = mock_response
+
+    result = await TOOLS["get_user_instances"](fields=["id", "status"], match={"status": "Stopped"})
+
+    assert result == {"data": [{"id": "2", "status": "Stopped"}], "total": 2}
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_computing_products_fields_resource(mock_request: mock.MagicMock) -> None:
+    """
+    Test that the projected products resource reads comma-separated fields from the URI.
+    """
+    mock_response = json_response([{"id": "p1", "price": 2.0, "specs": {"gpu": "H100"}}])
+    mock_request.return_value = mock_response
+
+    async with Client(mcp) as client:
+        result = await client.read_resource("mcp://computing_products?fields=id,specs.gpu")
+
+    assert json.loads(result[0].text) == [{"id": "p1", "specs": {"gpu": "H100"}}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "uri, path",
+    [
+        ("mcp://user_instances?limit=10&offset=0&fields=id,status", "computing/instances"),
+        ("mcp://billing_user_invoices?limit=10&offset=0&fields=id,status", "users/invoices"),
+    ],
+)
+async def test_list_fields_resources(fake_api, uri: str, path: str) -> None:
+    """
+    Test that the `&fields=` resource templates are not shadowed by the shorter limit/offset ones.
+    """
+    fake_api.default(path, body=INSTANCES)
+
+    async with Client(mcp) as client:
+        result = await client.read_resource(uri)
+
+    expected = {"data": [{"id": "1", "status": "Running"}, {"id": "2", "status": "Stopped"}], "total": 2}
+    assert json.loads(result[0].text) == expected
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from src import tools
+from src.config import settings
+from src.ratelimit import Governor, Priority, TokenBucket
+from src.tenancy import tenants
+
+
+def test_token_bucket_refills_at_rate(clock) -> None:
+    """
+    Test that the bucket allows a burst, then one token per 1/rate seconds.
+    """
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    for _ in range(2):
+        assert bucket.wait_time() == 0
+        bucket.take()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.wait_time() == 0
+
+
+def test_token_bucket_pause_holds_tokens(clock) -> None:
+    """
+    Test that pausing after a 429 delays the next token even if one is available.
+    """
+    bucket = TokenBucket(rate=10, burst=5, clock=clock)
+    bucket.pause(3)
+    assert bucket.wait_time() == pytest.approx(3)
+
+
+@pytest.mark.asyncio
+async def test_governor_caps_concurrency() -> None:
+    """
+    Test that no more than `concurrency` requests are admitted at once.
+    """
+    governor = Governor(rate=0, burst=1, concurrency=2)
+    active = 0
+    max_active = 0
+
+    async def request():
+        nonlocal active, max_active
+        async with governor.admit():
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(8)))
+    assert max_active == 2
+    assert governor.active == 0
+
+
+@pytest.mark.asyncio
+async def test_governor_admits_reads_before_bulk() -> None:
+    """
+    Test that a queued read is admitted ahead of earlier queued bulk requests.
+    """
+    governor = Governor(rate=0, burst=1, concurrency=1)
+    order = []
+
+    async def request(name: str, priority: Priority):
+        async with governor.admit(priority):
+            order.append(name)
+            await asyncio.sleep(0.001)
+
+    await governor.acquire(Priority.READ)
+    tasks = [asyncio.create_task(request(f"bulk{i}", Priority.BULK)) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("read", Priority.READ)))
+    await asyncio.sleep(0)
+    governor.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["read", "bulk0", "bulk1", "bulk2"]
+
+
+@pytest.mark.asyncio
+async def test_governor_cancelled_waiter_does_not_leak_slot() -> None:
+    """
+    Test that cancelling a queued request leaves the slot count intact.
+    """
+    governor = Governor(rate=0, burst=1, concurrency=1)
+    await governor.acquire()
+    waiter = asyncio.create_task(governor.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    governor.release()
+    assert governor.active == 0
+    assert governor.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_429_throttles_the_key(fake_api) -> None:
+    """
+    Test that a 429 with Retry-After pauses further admissions for that key.
+    """
+    fake_api.reply("users/credits", status=429, headers={"Retry-After": "0.05"})
+    fake_api.reply("users/credits", body={"credit": 1})
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 1}
+    assert loop.time() - started >= 0.05
+    assert tenants.get(settings.NEBULA_BLOCK_API_KEY).governor.bucket.wait_time() == 0
@@ -0,0 +1,32 @@
+import inspect
+
+import pytest
+
+from src import registry
+from src.tools import mcp
+
+
+def test_manifest_is_up_to_date() -> None:
+    """
+    Test that src/registry.json matches the registered tools; run `python -m src.registry` if this fails.
+    """
+    assert registry._load() == registry.build(mcp)
+
+
+@pytest.mark.asyncio
+async def test_tools_are_registered_from_the_manifest() -> None:
+    tools = await mcp.get_tools()
+    manifest = registry._load()
+
+    assert set(tools) == set(manifest["tools"])
+    for name, tool in tools.items():
+        assert tool.parameters == manifest["tools"][name]["parameters"]
+
+
+def test_changed_function_falls_back_to_generated_schema() -> None:
+    async def get_user_credit_balance(extra: int = 0):
+        return extra
+
+    assert registry.cached_parameters("tools", "get_user_credit_balance", get_user_credit_balance) is None
+    original = inspect.unwrap(mcp._tool_manager.get_tools()["get_user_credit_balance"].fn)
+    assert registry.cached_parameters("tools", "get_user_credit_balance", original) is not None
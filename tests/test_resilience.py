@@ -0,0 +1,160 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src import tools
+from src.config import settings
+from src.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    retry_after_seconds,
+    send_with_retries,
+    timeout_for,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRY_BACKOFF", 0.001)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRY_MAX_BACKOFF", 0.01)
+
+
+def test_circuit_breaker_opens_and_half_opens(clock) -> None:
+    """
+    Test that the breaker opens after the threshold and lets one trial through after the reset timeout.
+    """
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 10
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_after_seconds_parses_seconds_and_dates() -> None:
+    """
+    Test that Retry-After is understood in both delta-seconds and HTTP-date form.
+    """
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(httpx.Response(429)) is None
+
+
+def test_timeout_for_uses_longest_matching_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that per-endpoint timeout overrides match by path prefix.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_ENDPOINT_TIMEOUTS", {
+        "users": {"read": 20},
+        "users/invoices": {"read": 60, "connect": 2},
+    })
+    timeout = timeout_for("users/invoices")
+    assert timeout.read == 60
+    assert timeout.connect == 2
+    assert timeout_for("users/credits").read == 20
+    assert timeout_for("computing/products") is None
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_503(fake_api) -> None:
+    """
+    Test that an idempotent GET is retried until upstream recovers.
+    """
+    fake_api.reply("users/credits", status=503, body={"message": "unavailable"}, times=2)
+    fake_api.reply("users/credits", body={"credit": 100})
+
+    assert await tools.TOOLS["get_user_credit_balance"]() == {"credit": 100}
+    assert fake_api.count("users/credits") == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured(fake_api) -> None:
+    """
+    Test that a 429 with Retry-After is retried, even for POST.
+    """
+    fake_api.reply("ssh-keys", status=429, headers={"Retry-After": "0"})
+    fake_api.reply("ssh-keys", body={"message": "SSH key created successfully"})
+
+    result = await tools.TOOLS["create_ssh_key"]("test-key", "test-data")
+    assert result == {"message": "SSH key created successfully"}
+    assert fake_api.count("ssh-keys") == 2
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_on_503(fake_api) -> None:
+    """
+    Test that a non-idempotent POST is not replayed after a server error.
+    """
+    fake_api.reply("computing/instance", status=503, times=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await tools.TOOLS["create_gpu_instance"]("test-instance", "product", "image", "123")
+    assert fake_api.count("computing/instance") == 1
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_is_retried_then_raised(fake_api, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that a hung upstream call times out instead of blocking forever.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRIES", 1)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_ENDPOINT_TIMEOUTS", {"users/credits": {"read": 0.05}})
+    fake_api.default("users/credits", body={"credit": 1}, delay=0.5)
+
+    with pytest.raises(httpx.ReadTimeout):
+        await tools.TOOLS["get_user_credit_balance"]()
+    assert fake_api.count("users/credits") == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast(fake_api, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that repeated 5xx responses open the circuit so later calls skip upstream.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRIES", 0)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CIRCUIT_FAILURE_THRESHOLD", 2)
+    fake_api.default("users/credits", status=500)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await tools.TOOLS["get_user_credit_balance"]()
+    with pytest.raises(CircuitOpenError):
+        await tools.TOOLS["get_user_credit_balance"]()
+    assert fake_api.count("users/credits") == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_request_frees_the_circuit() -> None:
+    """
+    Test that a cancelled half-open trial does not leave the circuit refusing every request.
+    """
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    circuit_breaker.record_failure()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    trial = asyncio.create_task(send_with_retries(hang, "GET", circuit_breaker))
+    await started.wait()
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    async def succeed():
+        return httpx.Response(200)
+
+    assert (await send_with_retries(succeed, "GET", circuit_breaker)).status_code == 200
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from fastmcp.client import Client
+
+from src import serialization, tools
+from src.config import settings
+from src.serialization import RawJSON, decode, dumps, loads
+from src.tools import mcp
+
+INVOICES = b'{"data": [{"id": "inv-1", "amount": 12.5, "status": "paid"}, {"id": "inv-2", "amount": 3, "status": "due"}]}'
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_round_trip(monkeypatch: pytest.MonkeyPatch, backend: str) -> None:
+    if backend == "orjson" and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialization, "backend", backend)
+    value = {"name": "π", "items": [1, 2.5, None, True], "tags": ("a", "b")}
+    text = dumps(value)
+    assert " " not in text
+    assert loads(text.encode()) == dict(value, tags=["a", "b"])
+
+
+def test_raw_json_is_passed_through_and_decodes_on_demand() -> None:
+    raw = RawJSON(INVOICES.decode())
+    assert dumps(raw) is raw
+    assert decode(raw) == json.loads(INVOICES)
+    assert decode({"a": 1}) == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_list_tools_pass_upstream_bytes_through(fake_api) -> None:
+    """
+    Test that an unshaped list result reaches the client byte-for-byte.
+    """
+    fake_api.default("users/invoices", body=INVOICES)
+
+    result = await tools.TOOLS["list_user_invoices"]()
+    assert isinstance(result, RawJSON)
+    assert result == INVOICES.decode()
+
+    async with Client(mcp) as client:
+        content = await client.call_tool("list_user_invoices", {})
+    assert content[0].text == INVOICES.decode()
+
+
+@pytest.mark.asyncio
+async def test_projection_decodes_raw_bodies(fake_api) -> None:
+    """
+    Test that fields/match still apply to passed-through bodies.
+    """
+    fake_api.default("users/invoices", body=INVOICES)
+
+    result = await tools.TOOLS["list_user_invoices"](fields=["id"], match={"status": "due"})
+
+    assert result == {"data": [{"id": "inv-2"}]}
+
+
+@pytest.mark.asyncio
+async def test_passthrough_can_be_disabled(fake_api, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that NEBULA_BLOCK_RAW_PASSTHROUGH=false always returns decoded data.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RAW_PASSTHROUGH", False)
+    fake_api.default("users/invoices", body=INVOICES)
+
+    assert await tools.TOOLS["list_user_invoices"]() == json.loads(INVOICES)
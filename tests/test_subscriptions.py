@@ -0,0 +1,97 @@
+import asyncio
+
+import mcp.types as types
+import pytest
+from fastmcp import Client
+from mcp.server.lowlevel import NotificationOptions
+from pydantic import AnyUrl
+
+from src.config import settings
+from src.main import mcp
+from src.subscriptions import Subscriptions
+
+
+def test_interval_adapts_to_volatility_and_subscribers() -> None:
+    subscriptions = Subscriptions(read=None, min_interval=1.0, max_interval=41.0)
+
+    assert subscriptions.interval(0.0, 1) == 41.0
+    assert subscriptions.interval(0.5, 1) == 21.0
+    assert subscriptions.interval(0.5, 4) == 10.5
+    assert subscriptions.interval(1.0, 100) == 1.0
+
+
+def test_subscribe_capability_is_advertised() -> None:
+    capabilities = mcp._mcp_server.get_capabilities(NotificationOptions(), {})
+    assert capabilities.resources.subscribe is True
+
+
+@pytest.mark.asyncio
+async def test_subscribers_are_notified_only_on_changes(fake_api, monkeypatch) -> None:
+    """
+    Test that one shared poller notifies every subscribed session once per real change.
+    """
+    monkeypatch.setattr(mcp.subscriptions, "min_interval", 0.01)
+    monkeypatch.setattr(mcp.subscriptions, "max_interval", 0.02)
+    fake_api.reply("users/credits", body={"credit": 1}, times=3)
+    fake_api.default("users/credits", body={"credit": 2})
+    uri = "mcp://billing_user_credit_balance"
+    updates = {"first": [], "second": []}
+
+    def handler(name):
+        async def _handle(message) -> None:
+            if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ResourceUpdatedNotification):
+                updates[name].append(str(message.root.params.uri))
+        return _handle
+
+    async with Client(mcp, message_handler=handler("first")) as first, Client(mcp, message_handler=handler("second")) as second:
+        await first.session.subscribe_resource(AnyUrl(uri))
+        await second.session.subscribe_resource(AnyUrl(uri))
+        assert mcp.subscriptions.active() == 1
+        assert mcp.subscriptions.subscribers(uri, scope=settings.NEBULA_BLOCK_API_KEY) == 2
+
+        for _ in range(200):
+            if updates["first"] and updates["second"] and fake_api.count("users/credits") > 6:
+                break
+            await asyncio.sleep(0.01)
+
+        await first.session.unsubscribe_resource(AnyUrl(uri))
+        await second.session.unsubscribe_resource(AnyUrl(uri))
+        assert mcp.subscriptions.active() == 0
+
+    assert updates == {"first": [uri], "second": [uri]}
+
+
+@pytest.mark.asyncio
+async def test_poller_stops_after_the_client_disconnects(fake_api, monkeypatch) -> None:
+    """
+    Test that a session closing without unsubscribing stops its poller.
+    """
+    monkeypatch.setattr(mcp.subscriptions, "min_interval", 0.01)
+    monkeypatch.setattr(mcp.subscriptions, "max_interval", 0.02)
+    fake_api.default("users/credits", body={"credit": 1})
+    uri = "mcp://billing_user_credit_balance"
+
+    async with Client(mcp) as client:
+        await client.session.subscribe_resource(AnyUrl(uri))
+        assert mcp.subscriptions.active() == 1
+        for _ in range(200):
+            if fake_api.count("users/credits") > 2:
+                break
+            await asyncio.sleep(0.01)
+
+    for _ in range(100):
+        if not mcp.subscriptions.active():
+            break
+        await asyncio.sleep(0.01)
+    assert mcp.subscriptions.active() == 0
+    polled = fake_api.count("users/credits")
+    await asyncio.sleep(0.1)
+    assert fake_api.count("users/credits") == polled
+
+
+@pytest.mark.asyncio
+async def test_unknown_resources_cannot_be_subscribed() -> None:
+    async with Client(mcp) as client:
+        with pytest.raises(Exception):
+            await client.session.subscribe_resource(AnyUrl("mcp://nothing_here"))
+    assert mcp.subscriptions.active() == 0
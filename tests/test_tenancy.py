@@ -0,0 +1,144 @@
+import httpx
+import pytest
+
+from unittest import mock
+from src import main as main_module
+from src import tenancy, tools
+from src.config import settings
+from src.resilience import CircuitOpenError
+from src.tenancy import TenantRegistry, request_api_key, tenants
+from src.tools import mcp
+from tests.fake_server import json_response
+
+
+def test_registry_evicts_least_recently_used_tenant() -> None:
+    """
+    Test that the registry stays within max_tenants by evicting the LRU tenant.
+    """
+    registry = TenantRegistry(max_tenants=2, idle_timeout=600)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    assert "a" in registry
+    assert "b" not in registry
+    assert "c" in registry
+
+
+def test_registry_evicts_idle_tenants(clock) -> None:
+    """
+    Test that tenants unused for longer than the idle timeout are dropped.
+    """
+    registry = TenantRegistry(max_tenants=10, idle_timeout=60, clock=clock)
+    registry.get("a")
+    clock.now = 30
+    registry.get("b")
+    clock.now = 61
+    registry.get("c")
+
+    assert "a" not in registry
+    assert "b" in registry
+    assert len(registry) == 2
+
+
+def test_registry_keeps_busy_tenants() -> None:
+    """
+    Test that a tenant with requests in flight is not evicted.
+    """
+    registry = TenantRegistry(max_tenants=1, idle_timeout=600)
+    registry.get("a").governor.active = 1
+    registry.get("b")
+
+    assert "a" in registry
+    assert "b" in registry
+
+
+def test_request_api_key_prefers_request_headers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the API key is read from the request, falling back to Settings.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_API_KEY", "server-key")
+
+    monkeypatch.setattr(tenancy, "get_http_headers", lambda: {})
+    assert request_api_key() == "server-key"
+
+    monkeypatch.setattr(tenancy, "get_http_headers", lambda: {"authorization": "Bearer tenant-a"})
+    assert request_api_key() == "tenant-a"
+
+    monkeypatch.setattr(tenancy, "get_http_headers", lambda: {
+        "authorization": "Bearer tenant-a",
+        "x-nebulablock-api-key": "tenant-b",
+    })
+    assert request_api_key() == "tenant-b"
+
+
+@pytest.mark.asyncio
+@mock.patch("httpx.AsyncClient.request", new_callable=mock.AsyncMock)
+async def test_tenants_have_isolated_caches(mock_request: mock.MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that cached responses are never shared between API keys.
+    """
+    async def _request(method, url, headers=None, params=None):
+        mock_response = json_response([{"owner": headers["Authorization"]}])
+        return mock_response
+
+    mock_request.side_effect = _request
+
+    for api_key in ("tenant-a", "tenant-b", "tenant-a"):
+        monkeypatch.setattr(tenancy, "get_http_headers", lambda api_key=api_key: {"x-nebulablock-api-key": api_key})
+        result = await tools.TOOLS["list_ssh_keys"]()
+        assert result == [{"owner": f"Bearer {api_key}"}]
+
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tenants_have_isolated_circuits(fake_api, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that one API key's upstream failures do not open the circuit for another.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_RETRIES", 0)
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_CIRCUIT_FAILURE_THRESHOLD", 1)
+    fake_api.reply("ssh-keys", status=500)
+    fake_api.default("ssh-keys", body=[{"id": 7}])
+
+    monkeypatch.setattr(tenancy, "get_http_headers", lambda: {"x-nebulablock-api-key": "tenant-a"})
+    with pytest.raises(httpx.HTTPStatusError):
+        await tools.TOOLS["list_ssh_keys"]()
+    with pytest.raises(CircuitOpenError):
+        await tools.TOOLS["list_ssh_keys"]()
+
+    monkeypatch.setattr(tenancy, "get_http_headers", lambda: {"x-nebulablock-api-key": "tenant-b"})
+    assert await tools.TOOLS["list_ssh_keys"]() == [{"id": 7}]
+
+
+@pytest.mark.asyncio
+async def test_documented_header_selects_tenant_over_http(fake_api, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the X-NebulaBlock-Api-Key header sent over Streamable HTTP picks its own tenant.
+    """
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_API_KEY", "server-key")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_TRANSPORT", "streamable-http")
+    monkeypatch.setattr(settings, "NEBULA_BLOCK_WORKERS", 2)
+    monkeypatch.setattr(mcp.settings, "stateless_http", mcp.settings.stateless_http)
+    fake_api.default("ssh-keys", body={"data": []})
+
+    app = main_module.create_app()
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            response = await http.post(
+                "/mcp/",
+                headers={"X-NebulaBlock-Api-Key": "tenant-a", "Accept": "application/json, text/event-stream"},
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "tools/call",
+                    "params": {"name": "list_ssh_keys", "arguments": {}},
+                },
+            )
+
+    assert response.status_code == 200
+    assert "tenant-a" in tenants
+    assert "server-key" not in tenants
+    assert [headers["Authorization"] for _, _, headers in fake_api.requests] == ["Bearer tenant-a"]
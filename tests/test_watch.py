@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from fastmcp.client import Client
+from unittest import mock
+from src import tools
+from src.tools import mcp
+from src.watch import InstanceWatcher, WatchTimeout, instance_status
+
+
+def _status_sequence(*statuses: str):
+    calls = {"count": 0}
+
+    async def fetch(id: str):
+        index = min(calls["count"], len(statuses) - 1)
+        calls["count"] += 1
+        return {"data": {"id": id, "status": statuses[index]}}
+
+    return fetch, calls
+
+
+def test_instance_status_unwraps_data() -> None:
+    """
+    Test that the status is read from both wrapped and bare detail payloads.
+    """
+    assert instance_status({"data": {"status": "Running"}}) == "Running"
+    assert instance_status({"status": "Stopped"}) == "Stopped"
+    assert instance_status({"message": "nope"}) is None
+
+
+@pytest.mark.asyncio
+async def test_waiters_on_same_instance_share_one_poller() -> None:
+    """
+    Test that concurrent waiters for one instance are served by a single poll loop.
+    """
+    fetch, calls = _status_sequence("Creating", "Creating", "Running")
+    watcher = InstanceWatcher(fetch, min_interval=0.001, max_interval=0.002, jitter=0)
+
+    results = await asyncio.gather(*(watcher.wait_for("1", ["running"]) for _ in range(5)))
+
+    assert calls["count"] == 3
+    assert all(result["data"]["status"] == "Running" for result in results)
+    assert watcher.active() == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_reports_changes_and_times_out() -> None:
+    """
+    Test that status changes reach the listener and a timeout keeps the last payload.
+    """
+    fetch, _ = _status_sequence("Creating", "Starting")
+    watcher = InstanceWatcher(fetch, min_interval=0.001, max_interval=0.002, jitter=0)
+    seen = []
+
+    async def on_change(status, payload):
+        seen.append(status)
+
+    with pytest.raises(WatchTimeout) as excinfo:
+        await watcher.wait_for("1", ["Running"], timeout=0.05, on_change=on_change)
+
+    assert seen == ["Creating", "Starting"]
+    assert excinfo.value.payload["data"]["status"] == "Starting"
+    assert watcher.active() == 0
+
+
+def test_poll_interval_backs_off_and_resets() -> None:
+    """
+    Test that the interval grows while the status is unchanged and resets on change.
+    """
+    watcher = InstanceWatcher(mock.AsyncMock(), min_interval=1, max_interval=4, backoff=2)
+    assert watcher._next_interval(1, changed=False) == 2
+    assert watcher._next_interval(4, changed=False) == 4
+    assert watcher._next_interval(4, changed=True) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_instance_status_tool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the wait_for_instance_status tool returns once the instance is running.
+    """
+    fetch, _ = _status_sequence("Starting", "Running")
+    monkeypatch.setattr(
+        tools, "instance_watcher", InstanceWatcher(fetch, min_interval=0.001, jitter=0)
+    )
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("wait_for_instance_status", {"id": "123"})
+
+    data = json.loads(result[0].text)
+    assert data["reached"] is True
+    assert data["instance"]["data"]["status"] == "Running"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_instance_status_inside_multi_call_polls_upstream(fake_api, monkeypatch) -> None:
+    """
+    Test that a watcher started from a batch does not keep reusing the batch's first read.
+    """
+    monkeypatch.setattr(
+        tools, "instance_watcher", InstanceWatcher(tools._fetch_instance_detail, min_interval=0.001, jitter=0)
+    )
+    fake_api.reply("computing/instance/123", body={"data": {"id": "123", "status": "Starting"}})
+    fake_api.reply("computing/instance/123", body={"data": {"id": "123", "status": "Starting"}})
+    fake_api.default("computing/instance/123", body={"data": {"id": "123", "status": "Running"}})
+    calls = [{"tool": "wait_for_instance_status", "arguments": {"id": "123", "timeout": 5}}]
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("multi_call", {"calls": calls})
+
+    entry = json.loads(result[0].text)["results"][0]
+    assert entry["result"]["reached"] is True
+    assert fake_api.count("computing/instance/123") == 3